@@ -9,6 +9,14 @@ from .blockchain import Block, Blockchain
 from .wallet import Wallet
 from .transaction import Transaction
 from .miner import Miner
-from .node import Node
 
 __all__ = ['Block', 'Blockchain', 'Wallet', 'Transaction', 'Miner', 'Node']
+
+
+def __getattr__(name):
+    # The networking modules are only needed by the node/server commands,
+    # so they are imported on first use rather than with the package
+    if name == 'Node':
+        from .node import Node
+        return Node
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
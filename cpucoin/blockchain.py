@@ -8,15 +8,109 @@ Block Shares System:
 - Block finder gets all remaining unclaimed shares as bonus
 """
 
+import os
 import json
+import math
 import time
-from typing import List, Optional, Dict, Any, Set
-from dataclasses import dataclass, field, asdict
-from . import config
-from .crypto_utils import sha256, merkle_root, mining_hash, check_difficulty
+import functools
+import threading
+from array import array
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterable, Iterator
+from dataclasses import dataclass, field
+from json.encoder import encode_basestring_ascii as _json_str
+from . import config, json_utils
+from .compat import DATACLASS_SLOTS
+from .crypto_utils import (
+    sha256, sha256_cached, merkle_root, mining_hash, mining_digest, mining_salt,
+    scan_nonces, check_difficulty_digest, default_mining_workers
+)
+
+# Default location of the local chain file used by the CLI and miner
+DEFAULT_BLOCKCHAIN_PATH = os.path.expanduser("~/.cpucoin/blockchain.json")
+
+# Appended to a snapshot's path to name its journal (see save_incremental())
+JOURNAL_SUFFIX = ".journal"
+
+
+class ShareClaims:
+    """
+    Share claim records stored column-wise.
+
+    Behaves like a list of claim dicts (len, iteration, indexing, append)
+    but keeps each field in its own list or array, so a block holding
+    thousands of claims does not hold thousands of small dicts. Dicts are
+    only built when a record is read or the block is serialized.
+    """
+
+    __slots__ = ('share_indices', 'miners', 'nonces', 'hashes', 'timestamps')
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()):
+        self.share_indices = array('l')
+        self.miners: List[str] = []
+        self.nonces: List[int] = []  # Unbounded ints, may exceed 64 bits
+        self.hashes: List[str] = []
+        self.timestamps = array('d')
+        for record in records:
+            self.append(record)
+
+    def add(self, share_index: int, miner: str, nonce: int, hash_value: str,
+            timestamp: float):
+        """Append a claim record."""
+        self.share_indices.append(share_index)
+        self.miners.append(miner)
+        self.nonces.append(nonce)
+        self.hashes.append(hash_value)
+        self.timestamps.append(timestamp)
+
+    def append(self, record: Dict[str, Any]):
+        """Append a claim record given as a dict."""
+        self.add(record['share_index'], record.get('miner', ''),
+                 record.get('nonce', 0), record.get('hash', ''),
+                 record.get('timestamp') or 0.0)
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        return {
+            'share_index': self.share_indices[i],
+            'miner': self.miners[i],
+            'nonce': self.nonces[i],
+            'hash': self.hashes[i],
+            'timestamp': self.timestamps[i]
+        }
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialize the records as a list of dicts."""
+        return [self._record(i) for i in range(len(self.share_indices))]
+
+    def __len__(self) -> int:
+        return len(self.share_indices)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self.share_indices)):
+            yield self._record(i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._record(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("share claim index out of range")
+        return self._record(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ShareClaims):
+            other = other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ShareClaims({len(self)} claims)"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Block:
     """
     A block in the blockchain.
@@ -32,7 +126,7 @@ class Block:
         hash: Hash of this block
         miner: Address of the miner who found this block (block finder)
         claimed_shares: Set of share indices that have been claimed
-        share_claims: List of share claim records
+        share_claims: Share claim records (ShareClaims)
         is_closed: Whether the block has been closed (full block found)
     """
     index: int
@@ -48,11 +142,25 @@ class Block:
 
     # Block shares system
     claimed_shares: List[int] = field(default_factory=list)  # Indices of claimed shares
-    share_claims: List[Dict[str, Any]] = field(default_factory=list)  # Claim records
+    share_claims: ShareClaims = field(default_factory=ShareClaims)  # Claim records
     is_closed: bool = False  # True when full block found
     block_finder_hash: str = ""  # Hash that closed the block
     opened_at: float = 0.0  # When the block was opened for mining
 
+    # Derived state, declared as fields so slotted instances have room for it
+    _header_cache: Optional[str] = field(init=False, repr=False, compare=False)
+    _hdr_bytes: bytes = field(init=False, repr=False, compare=False)
+    _salt_bytes: bytes = field(init=False, repr=False, compare=False)
+    _claimed_mask: int = field(init=False, repr=False, compare=False)
+    _next_free: int = field(init=False, repr=False, compare=False)
+    _verified_proof: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    # Fields serialized by compute_header()
+    _HEADER_FIELDS = frozenset({
+        'index', 'timestamp', 'merkle_root', 'previous_hash',
+        'share_difficulty', 'block_difficulty', 'miner'
+    })
+
     # Legacy compatibility
     @property
     def difficulty(self) -> int:
@@ -67,39 +175,127 @@ class Block:
     def __post_init__(self):
         """Calculate merkle root if not set."""
         if not self.merkle_root and self.transactions:
-            tx_hashes = [tx.get('txid', sha256(json.dumps(tx, sort_keys=True)))
-                        for tx in self.transactions]
+            # Only hash the canonical JSON for transactions lacking a txid
+            tx_hashes = [tx['txid'] if 'txid' in tx
+                         else sha256_cached(json.dumps(tx, sort_keys=True))
+                         for tx in self.transactions]
             self.merkle_root = merkle_root(tx_hashes)
         if not self.opened_at:
             self.opened_at = time.time()
+        if not isinstance(self.share_claims, ShareClaims):
+            self.share_claims = ShareClaims(self.share_claims)
+        self._rebuild_claimed_mask()
+
+    def _rebuild_claimed_mask(self):
+        """
+        Rebuild the claimed-share bitmap from claimed_shares.
+
+        The bitmap is the cached membership set used by claim_share() and
+        the unclaimed-share queries. It is kept in sync by claim_share()
+        and by assigning a new claimed_shares list; mutating the list in
+        place bypasses it.
+        """
+        mask = 0
+        for share_index in self.claimed_shares:
+            if 0 <= share_index < config.SHARES_PER_BLOCK:
+                mask |= 1 << share_index
+        self._claimed_mask = mask
+        # Lowest clear bit = first unclaimed share
+        self._next_free = (~mask & (mask + 1)).bit_length() - 1
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name in Block._HEADER_FIELDS:
+            # Header changed - the cached serialization is stale
+            object.__setattr__(self, '_header_cache', None)
+        elif name == 'claimed_shares' and hasattr(self, '_claimed_mask'):
+            # Claim list replaced wholesale (e.g. by sync code)
+            self._rebuild_claimed_mask()
 
     def compute_header(self) -> str:
-        """Compute the block header for hashing."""
-        header_data = {
-            'index': self.index,
-            'timestamp': self.timestamp,
-            'merkle_root': self.merkle_root,
-            'previous_hash': self.previous_hash,
-            'share_difficulty': self.share_difficulty,
-            'block_difficulty': self.block_difficulty,
-            'miner': self.miner
-        }
-        return json.dumps(header_data, sort_keys=True)
+        """
+        Compute the block header for hashing.
+
+        The header is the sort_keys JSON of the header fields. It is part
+        of consensus (every block hash commits to these exact bytes) and
+        is served verbatim to pool miners, so it cannot be swapped for a
+        packed binary layout without a hard fork. The nonce is appended
+        per attempt instead, leaving the header constant while mining.
+
+        The serialized header is cached (along with its encoded bytes and
+        the salt) until one of the header fields is assigned again.
+        """
+        header = getattr(self, '_header_cache', None)
+        if header is None:
+            if self._has_plain_header_values():
+                # Same bytes as json.dumps(header_data, sort_keys=True),
+                # without building and sorting a dict
+                header = (
+                    f'{{"block_difficulty": {self.block_difficulty!r}, '
+                    f'"index": {self.index!r}, '
+                    f'"merkle_root": {_json_str(self.merkle_root)}, '
+                    f'"miner": {_json_str(self.miner)}, '
+                    f'"previous_hash": {_json_str(self.previous_hash)}, '
+                    f'"share_difficulty": {self.share_difficulty!r}, '
+                    f'"timestamp": {self.timestamp!r}}}'
+                )
+            else:
+                header_data = {
+                    'index': self.index,
+                    'timestamp': self.timestamp,
+                    'merkle_root': self.merkle_root,
+                    'previous_hash': self.previous_hash,
+                    'share_difficulty': self.share_difficulty,
+                    'block_difficulty': self.block_difficulty,
+                    'miner': self.miner
+                }
+                header = json.dumps(header_data, sort_keys=True)
+            self._hdr_bytes = header.encode('utf-8')
+            self._salt_bytes = mining_salt(self.previous_hash or "genesis")
+            self._header_cache = header
+        return header
+
+    def _has_plain_header_values(self) -> bool:
+        """Check the header fields format identically via repr() and json."""
+        ts = self.timestamp
+        return (type(self.index) is int
+                and type(self.share_difficulty) is int
+                and type(self.block_difficulty) is int
+                and (type(ts) is int or (type(ts) is float and math.isfinite(ts)))
+                and type(self.merkle_root) is str
+                and type(self.previous_hash) is str
+                and type(self.miner) is str)
 
     def compute_hash(self) -> str:
         """Compute the hash of this block using CPU-friendly algorithm."""
-        header = self.compute_header()
-        return mining_hash(header, self.nonce, self.previous_hash)
+        self.compute_header()
+        return mining_digest(self._hdr_bytes, self.nonce, self._salt_bytes).hex()
+
+    def mining_template(self) -> Tuple[bytes, bytes]:
+        """
+        Get the encoded header and salt to feed the mining kernel.
+
+        Returns:
+            Tuple of (header_bytes, salt_bytes)
+        """
+        self.compute_header()
+        return self._hdr_bytes, self._salt_bytes
 
     def get_unclaimed_shares(self) -> List[int]:
         """Get list of share indices that haven't been claimed yet."""
-        claimed_set = set(self.claimed_shares)
-        return [i for i in range(config.SHARES_PER_BLOCK) if i not in claimed_set]
+        free = ~self._claimed_mask & ((1 << config.SHARES_PER_BLOCK) - 1)
+        unclaimed = []
+        while free:
+            lowest = free & -free
+            unclaimed.append(lowest.bit_length() - 1)
+            free ^= lowest
+        return unclaimed
 
     def get_next_share_index(self) -> Optional[int]:
         """Get the next available share index, or None if all claimed."""
-        unclaimed = self.get_unclaimed_shares()
-        return unclaimed[0] if unclaimed else None
+        if self._next_free < config.SHARES_PER_BLOCK:
+            return self._next_free
+        return None
 
     def claim_share(self, share_index: int, miner: str, nonce: int, hash_value: str) -> bool:
         """
@@ -114,33 +310,77 @@ class Block:
         Returns:
             True if share was claimed successfully
         """
-        if share_index in self.claimed_shares:
-            return False  # Already claimed
-
         if share_index < 0 or share_index >= config.SHARES_PER_BLOCK:
             return False  # Invalid index
 
+        bit = 1 << share_index
+        if self._claimed_mask & bit:
+            return False  # Already claimed
+
+        mask = self._claimed_mask | bit
+        self._claimed_mask = mask
+        if share_index == self._next_free:
+            self._next_free = (~mask & (mask + 1)).bit_length() - 1
+
         self.claimed_shares.append(share_index)
-        self.share_claims.append({
-            'share_index': share_index,
-            'miner': miner,
-            'nonce': nonce,
-            'hash': hash_value,
-            'timestamp': time.time()
-        })
+        self.share_claims.add(share_index, miner, nonce, hash_value, time.time())
         return True
 
+    def claim_shares_bulk(self, claims: Iterable[Tuple[int, str, int, str]]) -> List[int]:
+        """
+        Claim several share slots at once.
+
+        Equivalent to calling claim_share() for each entry, but the claim
+        bitmap is updated once and every record shares one timestamp.
+
+        Args:
+            claims: (share_index, miner, nonce, hash_value) tuples
+
+        Returns:
+            Share indices that were claimed (invalid or taken ones are skipped)
+        """
+        mask = self._claimed_mask
+        claimed = []
+        records = []
+        for share_index, miner, nonce, hash_value in claims:
+            if share_index < 0 or share_index >= config.SHARES_PER_BLOCK:
+                continue
+            bit = 1 << share_index
+            if mask & bit:
+                continue
+            mask |= bit
+            claimed.append(share_index)
+            records.append((share_index, miner, nonce, hash_value))
+
+        if not claimed:
+            return claimed
+
+        self._claimed_mask = mask
+        self._next_free = (~mask & (mask + 1)).bit_length() - 1
+        self.claimed_shares.extend(claimed)
+
+        now = time.time()
+        add = self.share_claims.add
+        for share_index, miner, nonce, hash_value in records:
+            add(share_index, miner, nonce, hash_value, now)
+        return claimed
+
     def close_block(self, miner: str, nonce: int, hash_value: str):
         """
         Close this block (full block was found).
 
+        The header (including `miner`) is left as it was mined: the
+        winning hash commits to it, so changing a header field here would
+        make the block fail validation. The finder is the miner of the
+        share claim whose hash is block_finder_hash.
+
         Args:
-            miner: Public key of the miner who found the block
+            miner: Public key of the miner who found the block (already
+                recorded by their share claim)
             nonce: The winning nonce
             hash_value: The hash that met block difficulty
         """
         self.is_closed = True
-        self.miner = miner
         self.nonce = nonce
         self.hash = hash_value
         self.block_finder_hash = hash_value
@@ -153,56 +393,225 @@ class Block:
         """Check if all shares have been claimed."""
         return len(self.claimed_shares) >= config.SHARES_PER_BLOCK
 
-    def mine(self, verbose: bool = False) -> bool:
+    def mine(self, verbose: bool = False, num_workers: Optional[int] = 1) -> bool:
         """
         Mine this block by finding a valid nonce (legacy single-block mining).
 
         Args:
             verbose: Print mining progress
+            num_workers: Worker threads to search with; None picks a
+                default for this machine (see mine_parallel())
 
         Returns:
             True when block is successfully mined
         """
-        start_time = time.time()
-        attempts = 0
+        if num_workers != 1:
+            return self.mine_parallel(num_workers, verbose)
+
+        start_time = time.perf_counter()
+        first_nonce = self.nonce
+
+        header, salt = self.mining_template()
+        batch = config.MINING_BATCH_SIZE
+
+        # Progress is printed from a separate thread so the loop below
+        # never has to look at the clock or at verbose
+        done = threading.Event()
+        if verbose:
+            def report():
+                shown = 0
+                while not done.wait(1.0):
+                    # self.nonce advances once per batch
+                    attempts = self.nonce - first_nonce
+                    if attempts == shown:
+                        continue
+                    shown = attempts
+                    elapsed = time.perf_counter() - start_time
+                    print(f"\rMining... Attempts: {attempts}, "
+                          f"Rate: {attempts/elapsed:.2f} H/s, "
+                          f"Nonce: {self.nonce}", end="", flush=True)
+
+            threading.Thread(target=report, daemon=True).start()
+
+        try:
+            while True:
+                hit = scan_nonces(header, salt, self.nonce, batch, self.share_difficulty)
+                if hit is not None:
+                    break
+                self.nonce += batch
+        finally:
+            done.set()
+
+        self.nonce, self.hash = hit
+        if verbose:
+            attempts = self.nonce - first_nonce + 1
+            elapsed = time.perf_counter() - start_time
+            print(f"\n✓ Block mined!")
+            print(f"  Nonce: {self.nonce}")
+            print(f"  Hash: {self.hash}")
+            print(f"  Attempts: {attempts}")
+            print(f"  Time: {elapsed:.2f}s")
+            print(f"  Hash rate: {attempts/elapsed:.2f} H/s")
+        return True
 
-        while True:
-            self.hash = self.compute_hash()
-            attempts += 1
+    def mine_parallel(self, num_workers: Optional[int] = None, verbose: bool = False) -> bool:
+        """
+        Mine this block with several worker threads.
 
-            if check_difficulty(self.hash, self.share_difficulty):
-                elapsed = time.time() - start_time
-                if verbose:
-                    print(f"\n✓ Block mined!")
-                    print(f"  Nonce: {self.nonce}")
-                    print(f"  Hash: {self.hash}")
-                    print(f"  Attempts: {attempts}")
-                    print(f"  Time: {elapsed:.2f}s")
-                    print(f"  Hash rate: {attempts/elapsed:.2f} H/s")
-                return True
+        The nonce space is split into disjoint stripes: worker k tries
+        start + k, start + k + N, ... so no nonce is hashed twice. The
+        memory-hard hash releases the GIL, so the workers run in parallel.
+        The first worker to find a valid nonce stops the others.
 
-            self.nonce += 1
+        Args:
+            num_workers: Number of worker threads (default: one per core,
+                less the lanes Argon2id uses per hash)
+            verbose: Print mining progress
 
-            if verbose and attempts % 100 == 0:
-                elapsed = time.time() - start_time
-                print(f"\rMining... Attempts: {attempts}, "
-                      f"Rate: {attempts/elapsed:.2f} H/s, "
-                      f"Nonce: {self.nonce}", end="", flush=True)
+        Returns:
+            True when block is successfully mined
+        """
+        if num_workers is None:
+            num_workers = default_mining_workers()
+        if num_workers <= 1:
+            return self.mine(verbose)
+
+        start_time = time.perf_counter()
+        header, salt = self.mining_template()
+        batch = config.MINING_BATCH_SIZE
+        difficulty = self.share_difficulty
+        start_nonce = self.nonce
+
+        stop_event = threading.Event()
+        lock = threading.Lock()
+        attempts = [0] * num_workers
+        found: List[Tuple[int, str, int]] = []  # (nonce, hash, worker)
+
+        def worker(worker_id: int):
+            nonce = start_nonce + worker_id
+            try:
+                while not stop_event.is_set():
+                    hit = scan_nonces(header, salt, nonce, batch, difficulty,
+                                      stride=num_workers, stop_event=stop_event)
+                    if hit is not None:
+                        attempts[worker_id] += (hit[0] - nonce) // num_workers + 1
+                        with lock:
+                            if not found:
+                                found.append((hit[0], hit[1], worker_id))
+                        return
+                    attempts[worker_id] += batch
+                    nonce += batch * num_workers
+            finally:
+                # A hit or an error ends the whole round
+                stop_event.set()
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [executor.submit(worker, worker_id)
+                       for worker_id in range(num_workers)]
+
+            # Stop the workers however the wait ends (Ctrl+C included);
+            # leaving the block joins them
+            try:
+                while not stop_event.wait(0.5):
+                    if verbose:
+                        total = sum(attempts)
+                        elapsed = time.perf_counter() - start_time
+                        print(f"\rMining... Attempts: {total}, "
+                              f"Rate: {total/elapsed:.2f} H/s, "
+                              f"Workers: {num_workers}", end="", flush=True)
+            finally:
+                stop_event.set()
+
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                raise error
+
+        self.nonce, self.hash, winner = found[0]
+        if verbose:
+            total = sum(attempts)
+            elapsed = time.perf_counter() - start_time
+            print(f"\n✓ Block mined!")
+            print(f"  Nonce: {self.nonce} (worker {winner})")
+            print(f"  Hash: {self.hash}")
+            print(f"  Attempts: {total}")
+            print(f"  Time: {elapsed:.2f}s")
+            print(f"  Hash rate: {total/elapsed:.2f} H/s")
+        return True
 
     def is_valid(self) -> bool:
-        """Validate this block's proof-of-work."""
-        computed_hash = self.compute_hash()
+        """
+        Validate this block's proof-of-work.
+
+        A passing result is remembered together with the header, nonce,
+        hash and closed flag it was computed for, so re-validating an
+        unchanged block skips the memory-hard hash. Changing any of them
+        forces a full check.
+        """
+        if self.has_verified_proof():
+            return True
+
+        header = self.compute_header()
+        digest = mining_digest(self._hdr_bytes, self.nonce, self._salt_bytes)
         # For closed blocks, check block difficulty; otherwise share difficulty
         if self.is_closed:
-            return (computed_hash == self.hash and
-                    check_difficulty(self.hash, self.block_difficulty))
+            difficulty = self.block_difficulty
         else:
-            return (computed_hash == self.hash and
-                    check_difficulty(self.hash, self.share_difficulty))
+            difficulty = self.share_difficulty
+        valid = (digest.hex() == self.hash and
+                 check_difficulty_digest(digest, difficulty))
+        if valid:
+            self._verified_proof = (header, self.nonce, self.hash, self.is_closed)
+        return valid
+
+    def has_verified_proof(self) -> bool:
+        """Check whether is_valid() already passed for the block as it is now."""
+        proof = self._verified_proof
+        # The header string is compared by identity: any header field
+        # assignment drops the cached header, so a new object means a change
+        return (proof is not None
+                and proof[0] is self.compute_header()
+                and proof[1] == self.nonce
+                and proof[2] == self.hash
+                and proof[3] == self.is_closed)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert block to dictionary."""
-        return asdict(self)
+        """
+        Convert block to dictionary.
+
+        The dict is built shallowly: transaction dicts are shared with the
+        block rather than deep-copied, since callers serialize it straight
+        away. Treat the result as read-only.
+        """
+        return {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'transactions': self.transactions,
+            'previous_hash': self.previous_hash,
+            'nonce': self.nonce,
+            'share_difficulty': self.share_difficulty,
+            'block_difficulty': self.block_difficulty,
+            'hash': self.hash,
+            'miner': self.miner,
+            'merkle_root': self.merkle_root,
+            'claimed_shares': list(self.claimed_shares),
+            'share_claims': self.share_claims.to_list(),
+            'is_closed': self.is_closed,
+            'block_finder_hash': self.block_finder_hash,
+            'opened_at': self.opened_at
+        }
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Summarize the block for API listings (transaction count only)."""
+        return {
+            'index': self.index,
+            'hash': self.hash,
+            'previous_hash': self.previous_hash,
+            'timestamp': self.timestamp,
+            'transactions': len(self.transactions),
+            'miner': self.miner,
+            'nonce': self.nonce
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Block':
@@ -227,6 +636,17 @@ class Block:
                 f"txs={len(self.transactions)}, nonce={self.nonce})")
 
 
+@functools.lru_cache(maxsize=4)
+def _genesis_hash(header: str, previous_hash: str) -> str:
+    """
+    Proof-of-work hash of the genesis block.
+
+    The genesis block is built from constants, so its (memory-hard) hash
+    is the same for every Blockchain instance in the process.
+    """
+    return mining_hash(header, 0, previous_hash)
+
+
 class Blockchain:
     """
     The blockchain - a linked list of blocks.
@@ -241,10 +661,15 @@ class Blockchain:
 
     def __init__(self):
         self.chain: List[Block] = []
-        self.pending_transactions: List[Dict[str, Any]] = []
+        self._pending_by_txid: Dict[str, Dict[str, Any]] = {}  # Mempool, in arrival order
         self.share_difficulty = config.INITIAL_SHARE_DIFFICULTY
         self.block_difficulty = config.INITIAL_BLOCK_DIFFICULTY
         self.current_open_block: Optional[Block] = None  # Block accepting shares
+        self._persisted: Optional[Tuple[str, int, str]] = None  # (path, height, tip hash)
+        self.journal_torn = False  # load() dropped a torn journal record
+        # Guards the UTXO index: API threads read balances while blocks are indexed
+        self._utxo_lock = threading.RLock()
+        self._reset_utxo_index()
         self._create_genesis_block()
 
     # Legacy compatibility
@@ -256,10 +681,19 @@ class Blockchain:
     def difficulty(self, value: int):
         self.share_difficulty = value
 
+    @property
+    def pending_transactions(self) -> List[Dict[str, Any]]:
+        """Pending transactions in arrival order (a fresh list each call)."""
+        return list(self._pending_by_txid.values())
+
+    @pending_transactions.setter
+    def pending_transactions(self, transactions: List[Dict[str, Any]]):
+        self._pending_by_txid = {tx['txid']: tx for tx in transactions}
+
     def _create_genesis_block(self) -> Block:
         """Create the genesis (first) block."""
         genesis_tx = {
-            'txid': sha256(config.GENESIS_MESSAGE),
+            'txid': sha256_cached(config.GENESIS_MESSAGE),
             'type': 'coinbase',
             'inputs': [],
             'outputs': [{'address': 'genesis', 'amount': 0}],
@@ -280,11 +714,77 @@ class Blockchain:
 
         # Genesis block has a fixed nonce for reproducibility
         genesis.nonce = 0
-        genesis.hash = genesis.compute_hash()
+        genesis.hash = _genesis_hash(genesis.compute_header(), genesis.previous_hash)
 
         self.chain.append(genesis)
+        self._index_block(genesis)
         return genesis
 
+    def _reset_utxo_index(self):
+        """Clear the UTXO index (and the block hash index kept with it)."""
+        # Block hash -> chain position, for get_block_by_hash()
+        self._height_by_hash: Dict[str, int] = {}
+        self._spent_outputs: Set[tuple] = set()
+        self._utxos: Dict[tuple, Dict[str, Any]] = {}
+        # Address -> ordered set (dict keys) of outpoints, in chain order
+        self._utxos_by_address: Dict[str, Dict[tuple, None]] = {}
+        # Address -> get_balance() result, dropped whenever a block adds
+        # or spends one of the address's outputs
+        self._balances: Dict[str, float] = {}
+
+    def _rebuild_utxo_index(self):
+        """Rebuild the UTXO index from the full chain."""
+        with self._utxo_lock:
+            self._reset_utxo_index()
+            for block in self.chain:
+                self._index_block(block)
+
+    def _index_block(self, block: Block):
+        """
+        Apply a block's inputs and outputs to the UTXO index, and record
+        its hash in the block hash index.
+
+        An output counts as unspent only if no input anywhere in the chain
+        references it, so spends are recorded even when the output they
+        reference has not been indexed (yet).
+        """
+        with self._utxo_lock:
+            spent = self._spent_outputs
+            utxos = self._utxos
+            by_address = self._utxos_by_address
+            balances = self._balances
+            self._height_by_hash[block.hash] = block.index
+
+            for tx in block.transactions:
+                for inp in tx.get('inputs', []):
+                    outpoint = (inp.get('txid'), inp.get('vout', 0))
+                    spent.add(outpoint)
+                    utxo = utxos.pop(outpoint, None)
+                    if utxo is not None:
+                        balances.pop(utxo['address'], None)
+                        owned = by_address[utxo['address']]
+                        del owned[outpoint]
+                        if not owned:
+                            # Drop emptied addresses so the index tracks only
+                            # current holders
+                            del by_address[utxo['address']]
+
+            for tx in block.transactions:
+                txid = tx.get('txid')
+                for i, out in enumerate(tx.get('outputs', [])):
+                    outpoint = (txid, i)
+                    if outpoint in spent:
+                        continue
+                    address = out.get('address')
+                    utxos[outpoint] = {
+                        'txid': txid,
+                        'vout': i,
+                        'amount': out.get('amount', 0),
+                        'address': address
+                    }
+                    by_address.setdefault(address, {})[outpoint] = None
+                    balances.pop(address, None)
+
     @property
     def last_block(self) -> Block:
         """Get the last block in the chain."""
@@ -409,11 +909,10 @@ class Blockchain:
             return False
 
         # Check for duplicates
-        for tx in self.pending_transactions:
-            if tx['txid'] == transaction['txid']:
-                return False
+        if transaction['txid'] in self._pending_by_txid:
+            return False
 
-        self.pending_transactions.append(transaction)
+        self._pending_by_txid[transaction['txid']] = transaction
         return True
 
     def create_block(self, miner_address: str = "") -> Block:
@@ -429,31 +928,35 @@ class Blockchain:
         # Adjust difficulties
         self.share_difficulty, self.block_difficulty = self.calculate_difficulty()
 
+        now = time.time()
+
         # Create coinbase transaction (total block reward - will be distributed as shares)
         reward = self.get_block_reward()
-        fees = sum(tx.get('fee', 0) for tx in self.pending_transactions)
+        pending = self._pending_by_txid.values()
+        fees = sum(tx.get('fee', 0) for tx in pending)
 
         coinbase = {
-            'txid': sha256(f"coinbase-{self.height + 1}-{time.time()}"),
+            'txid': sha256(f"coinbase-{self.height + 1}-{now}"),
             'type': 'coinbase',
             'inputs': [],
             'outputs': [{'address': 'shares', 'amount': reward + fees}],
-            'timestamp': time.time(),
+            'timestamp': now,
             'note': f'Block reward distributed as {config.SHARES_PER_BLOCK} shares'
         }
 
         # Select transactions for block
-        transactions = [coinbase] + self.pending_transactions[:config.MAX_TRANSACTIONS_PER_BLOCK - 1]
+        transactions = [coinbase]
+        transactions.extend(islice(pending, config.MAX_TRANSACTIONS_PER_BLOCK - 1))
 
         block = Block(
             index=self.height + 1,
-            timestamp=time.time(),
+            timestamp=now,
             transactions=transactions,
             previous_hash=self.last_block.hash,
             share_difficulty=self.share_difficulty,
             block_difficulty=self.block_difficulty,
             miner=miner_address,
-            opened_at=time.time()
+            opened_at=now
         )
 
         return block
@@ -510,13 +1013,13 @@ class Blockchain:
             return False
 
         # Remove included transactions from pending pool
-        included_txids = {tx['txid'] for tx in block.transactions}
-        self.pending_transactions = [
-            tx for tx in self.pending_transactions
-            if tx['txid'] not in included_txids
-        ]
+        pending = self._pending_by_txid
+        if pending:
+            for tx in block.transactions:
+                pending.pop(tx['txid'], None)
 
         self.chain.append(block)
+        self._index_block(block)
         return True
 
     def validate_block(self, block: Block, previous_block: Optional[Block] = None) -> bool:
@@ -533,6 +1036,15 @@ class Blockchain:
         if previous_block is None:
             previous_block = self.last_block
 
+        if not self._validate_link(block, previous_block):
+            return False
+
+        # Check proof-of-work
+        return block.is_valid()
+
+    @staticmethod
+    def _validate_link(block: Block, previous_block: Block) -> bool:
+        """Cheap structural checks of a block against its predecessor."""
         # Check index
         if block.index != previous_block.index + 1:
             return False
@@ -541,10 +1053,6 @@ class Blockchain:
         if block.previous_hash != previous_block.hash:
             return False
 
-        # Check proof-of-work
-        if not block.is_valid():
-            return False
-
         # Check timestamp (not too far in future)
         if block.timestamp > time.time() + 7200:  # 2 hour tolerance
             return False
@@ -552,11 +1060,44 @@ class Blockchain:
         return True
 
     def validate_chain(self) -> bool:
-        """Validate the entire blockchain."""
-        for i in range(1, len(self.chain)):
-            if not self.validate_block(self.chain[i], self.chain[i - 1]):
+        """
+        Validate the entire blockchain.
+
+        Linkage is checked sequentially first since it is just field
+        comparisons. Blocks whose proof-of-work was already verified
+        unchanged (e.g. by add_block()) are not hashed again, so repeated
+        validation only pays for new or modified blocks. The remaining
+        proof-of-work checks are independent of each other, so they run
+        on a thread pool sized like the miners' (default_mining_workers()),
+        since each Argon2id hash already uses several lanes and tens of MB.
+        """
+        chain = self.chain
+        for i in range(1, len(chain)):
+            if not self._validate_link(chain[i], chain[i - 1]):
                 return False
-        return True
+
+        blocks = [block for block in chain[1:] if not block.has_verified_proof()]
+        workers = min(len(blocks), default_mining_workers())
+        if workers <= 1:
+            return all(block.is_valid() for block in blocks)
+
+        # One contiguous range of blocks per worker; the first invalid
+        # block found tells the other ranges to stop early
+        size = -(-len(blocks) // workers)
+        failed = threading.Event()
+
+        def check_range(start: int) -> bool:
+            for block in blocks[start:start + size]:
+                if failed.is_set():
+                    return False
+                if not block.is_valid():
+                    failed.set()
+                    return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(check_range, range(0, len(blocks), size)))
+        return all(results) and not failed.is_set()
 
     def replace_chain(self, new_chain: List[Block]) -> bool:
         """
@@ -580,36 +1121,52 @@ class Blockchain:
             return False
 
         self.chain = new_chain
+        self._rebuild_utxo_index()
         self.difficulty = self.calculate_difficulty()
         return True
 
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        """
+        Look up a block in the chain by its hash.
+
+        Args:
+            block_hash: Hex hash of the block
+
+        Returns:
+            The block, or None if it is not in the chain
+        """
+        height = self._height_by_hash.get(block_hash)
+        if height is None or height >= len(self.chain):
+            return None
+        block = self.chain[height]
+        return block if block.hash == block_hash else None
+
     def get_balance(self, address: str) -> float:
         """
         Calculate the balance of an address.
 
+        The sum is cached per address until a block touches one of its
+        outputs, so repeated queries (e.g. API polling) are a dict lookup.
+
         Args:
             address: The address to check
 
         Returns:
             Balance amount
         """
-        balance = 0.0
-        spent_outputs = set()
-
-        # First pass: collect spent outputs
-        for block in self.chain:
-            for tx in block.transactions:
-                for inp in tx.get('inputs', []):
-                    spent_outputs.add((inp.get('txid'), inp.get('vout', 0)))
-
-        # Second pass: sum unspent outputs
-        for block in self.chain:
-            for tx in block.transactions:
-                for i, out in enumerate(tx.get('outputs', [])):
-                    if out.get('address') == address:
-                        if (tx['txid'], i) not in spent_outputs:
-                            balance += out.get('amount', 0)
-
+        balances = self._balances
+        balance = balances.get(address)
+        if balance is not None:
+            return balance
+
+        # Sum and cache under the index lock, so a block being indexed
+        # can neither change the outputs mid-sum nor be missed by the cache
+        with self._utxo_lock:
+            balance = 0.0
+            utxos = self._utxos
+            for outpoint in self._utxos_by_address.get(address, ()):
+                balance += utxos[outpoint]['amount']
+            balances[address] = balance
         return balance
 
     def get_utxos(self, address: str) -> List[Dict[str, Any]]:
@@ -622,34 +1179,37 @@ class Blockchain:
         Returns:
             List of UTXOs
         """
-        utxos = []
-        spent_outputs = set()
+        with self._utxo_lock:
+            utxos = self._utxos
+            return [dict(utxos[outpoint])
+                    for outpoint in self._utxos_by_address.get(address, ())]
 
-        # Collect spent outputs
-        for block in self.chain:
-            for tx in block.transactions:
-                for inp in tx.get('inputs', []):
-                    spent_outputs.add((inp.get('txid'), inp.get('vout', 0)))
+    def iter_block_dicts(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the dict form of each block in the chain, one at a time.
 
-        # Collect unspent outputs
-        for block in self.chain:
-            for tx in block.transactions:
-                for i, out in enumerate(tx.get('outputs', [])):
-                    if out.get('address') == address:
-                        if (tx['txid'], i) not in spent_outputs:
-                            utxos.append({
-                                'txid': tx['txid'],
-                                'vout': i,
-                                'amount': out.get('amount', 0),
-                                'address': address
-                            })
+        Args:
+            start: Height of the first block to yield
+            stop: Height to stop before (None for the chain tip)
 
-        return utxos
+        Yields:
+            Block dicts, as produced by Block.to_dict()
+        """
+        chain = self.chain
+        # Same bounds handling as chain[start:stop]
+        start, stop, _ = slice(start, stop).indices(len(chain))
+        for i in range(start, stop):
+            yield chain[i].to_dict()
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert blockchain to dictionary."""
+        """
+        Convert blockchain to dictionary.
+
+        This materializes every block, so it is O(chain) in memory; use
+        iter_block_dicts() or save() for large chains.
+        """
         return {
-            'chain': [block.to_dict() for block in self.chain],
+            'chain': list(self.iter_block_dicts()),
             'share_difficulty': self.share_difficulty,
             'block_difficulty': self.block_difficulty,
             'pending_transactions': self.pending_transactions,
@@ -661,6 +1221,8 @@ class Blockchain:
         """Create a Blockchain from dictionary."""
         blockchain = cls.__new__(cls)
         blockchain.chain = [Block.from_dict(b) for b in data['chain']]
+        blockchain._persisted = None
+        blockchain._utxo_lock = threading.RLock()
 
         # Handle legacy format (single 'difficulty' field)
         if 'difficulty' in data and 'share_difficulty' not in data:
@@ -683,19 +1245,138 @@ class Blockchain:
         else:
             blockchain.current_open_block = None
 
+        blockchain._rebuild_utxo_index()
         return blockchain
 
+    def _state_dict(self) -> Dict[str, Any]:
+        """Get the top-level fields other than the chain itself."""
+        return {
+            'share_difficulty': self.share_difficulty,
+            'block_difficulty': self.block_difficulty,
+            'pending_transactions': self.pending_transactions,
+            'current_open_block': self.current_open_block.to_dict() if self.current_open_block else None
+        }
+
     def save(self, filepath: str):
-        """Save blockchain to file."""
-        with open(filepath, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        """
+        Save blockchain to file.
+
+        Blocks are serialized and written one at a time rather than first
+        building a dict of the whole chain, so peak memory stays at about
+        one block. The file is compact JSON of the same document as
+        to_dict(), written with orjson when it is installed. Any journal
+        left by save_incremental() is folded in and removed.
+
+        The snapshot is written to a temporary file and moved over the old
+        one before the journal is removed, so a crash leaves either the old
+        snapshot and journal or the new snapshot (load() skips the journal
+        blocks it already holds), never a half-written file.
+        """
+        tmp_path = f"{filepath}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(b'{"chain":[')
+                for i, block_dict in enumerate(self.iter_block_dicts()):
+                    if i:
+                        f.write(b',')
+                    f.write(json_utils.dumps(block_dict))
+                f.write(b'],')
+
+                # Remaining top-level fields, continuing the outer object
+                f.write(json_utils.dumps(self._state_dict())[1:])
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        journal_path = filepath + JOURNAL_SUFFIX
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        self._persisted = (filepath, self.height, self.last_block.hash)
+
+    def save_incremental(self, filepath: str):
+        """
+        Save only what changed since this chain was last saved to or loaded from filepath.
+
+        New blocks are appended to a JSON-lines journal next to the
+        snapshot (filepath + JOURNAL_SUFFIX), one line each, followed by a
+        line holding the current difficulties, mempool and open block;
+        load() replays the journal. A full save() is done instead when
+        there is no snapshot to extend, the chain no longer extends the
+        saved tip, or the journal has outgrown the snapshot (compaction).
+
+        Args:
+            filepath: Snapshot path, as passed to save() / load()
+        """
+        journal_path = filepath + JOURNAL_SUFFIX
+        mark = self._persisted
+        if (mark is None or mark[0] != filepath or not os.path.exists(filepath)
+                or mark[1] >= len(self.chain) or self.chain[mark[1]].hash != mark[2]
+                or (os.path.exists(journal_path)
+                    and os.path.getsize(journal_path) > os.path.getsize(filepath))):
+            self.save(filepath)
+            return
+
+        with open(journal_path, 'ab') as f:
+            for block_dict in self.iter_block_dicts(mark[1] + 1):
+                f.write(b'{"block":' + json_utils.dumps(block_dict) + b'}\n')
+            f.write(b'{"state":' + json_utils.dumps(self._state_dict()) + b'}\n')
+        self._persisted = (filepath, self.height, self.last_block.hash)
 
     @classmethod
     def load(cls, filepath: str) -> 'Blockchain':
-        """Load blockchain from file."""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        """
+        Load blockchain from file, replaying its journal if there is one.
+
+        A torn record at the end of the journal (a write cut short by a
+        crash) is dropped and the journal truncated before it, so later
+        appends start on a fresh line. journal_torn is set on the result,
+        and its next save_incremental() does a full save().
+
+        Journal blocks the snapshot already holds (a save() that crashed
+        before removing the journal) are skipped, along with the state
+        records that follow them.
+        """
+        with open(filepath, 'rb') as f:
+            data = json_utils.loads(f.read())
+
+        journal_path = filepath + JOURNAL_SUFFIX
+        torn = False
+        if os.path.exists(journal_path):
+            good_size = 0
+            stale = False
+            with open(journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("unterminated journal record")
+                        entry = json_utils.loads(line)
+                    except ValueError:
+                        torn = True  # Everything before the torn record stands
+                        break
+                    good_size += len(line)
+                    if 'block' in entry:
+                        stale = entry['block']['index'] <= data['chain'][-1]['index']
+                        if not stale:
+                            data['chain'].append(entry['block'])
+                    elif not stale:
+                        data.update(entry['state'])
+            if torn:
+                try:
+                    os.truncate(journal_path, good_size)
+                except OSError:
+                    pass  # The full save on the next save_incremental() replaces it
+
+        blockchain = cls.from_dict(data)
+        blockchain.journal_torn = torn
+        if not torn:
+            blockchain._persisted = (filepath, blockchain.height, blockchain.last_block.hash)
+        return blockchain
 
     def __len__(self) -> int:
         return len(self.chain)
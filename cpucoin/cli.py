@@ -31,25 +31,44 @@ Server-based Mining (recommended for multi-user):
 import os
 import sys
 import argparse
+import functools
 import getpass
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from cpucoin.blockchain import Blockchain
+from cpucoin.blockchain import Blockchain, DEFAULT_BLOCKCHAIN_PATH
 from cpucoin.wallet import Wallet, list_wallets, DEFAULT_WALLET_DIR
 from cpucoin.coin import Coin, CoinStore, DEFAULT_COIN_DIR
 from cpucoin.miner import ShareMiner, MultiThreadedShareMiner, quick_mine
-from cpucoin.mining_client import MiningClient, ServerShareMiner
-from cpucoin.server import run_server
-from cpucoin.node import Node
 from cpucoin import config
+from cpucoin.crypto_utils import MEMORY_HARD_BACKEND, default_mining_workers
 
 
-def print_header():
-    """Print the CPUCoin header."""
-    print("""
+# Coin type label indexed by (is_bonus_share << 1 | is_block_finder); local
+# mining also flags bonus shares as block-finder coins, and both show BONUS
+_COIN_TYPE_LABELS = ("SHARE", "BLOCK", "BONUS", "BONUS")
+
+# Coin status label indexed by is_spent
+_COIN_STATUS_LABELS = ("VALID", "SPENT")
+
+
+@functools.lru_cache(maxsize=1)
+def _list_wallets_cached() -> tuple:
+    """
+    list_wallets() for the default directory, read once per process.
+
+    Cleared by the handlers that create a wallet.
+    """
+    return tuple(list_wallets())
+
+
+BANNER = """
 ╔═══════════════════════════════════════════════════════════╗
 ║                                                           ║
 ║     ██████╗██████╗ ██╗   ██╗ ██████╗ ██████╗ ██╗███╗   ██╗║
@@ -62,7 +81,13 @@ def print_header():
 ║           CPU-Minable Cryptocurrency v2.0.0               ║
 ║     Block Shares • Physical coins • Multi-user mining     ║
 ╚═══════════════════════════════════════════════════════════╝
-    """)
+    """
+
+
+def print_header():
+    """Print the CPUCoin header (skipped when stdout is not a terminal)."""
+    if sys.stdout.isatty():
+        print(BANNER)
 
 
 def cmd_mine(args):
@@ -72,11 +97,13 @@ def cmd_mine(args):
     wallet_name = args.wallet or "default"
     password = args.password or ""
     num_shares = args.shares or 0
-    num_threads = args.threads or 0
+    # 0 picks one worker per core (per Argon2 lane group); the hash runs
+    # in C with the GIL released, so threads scale across cores
+    num_threads = args.threads if args.threads > 0 else default_mining_workers()
     server_url = args.server
 
     # Load or create wallet
-    if wallet_name in list_wallets():
+    if wallet_name in _list_wallets_cached():
         if not password and args.password is None:
             password = getpass.getpass(f"Wallet password (or enter for none): ")
         try:
@@ -87,19 +114,23 @@ def cmd_mine(args):
     else:
         print(f"Creating new wallet: {wallet_name}")
         wallet = Wallet.create(wallet_name, password)
+        _list_wallets_cached.cache_clear()
 
     print(f"\n📁 Wallet: {wallet.name}")
     print(f"📍 Address: {wallet.address}")
-    print(f"💰 Current balance: {wallet.get_balance():.8f} CPU")
+    # Read the balance once; mining only adds coins, so the closing
+    # balance is this plus what the session earned (no second rescan)
+    initial_balance = wallet.get_balance()
+    print(f"💰 Current balance: {initial_balance:.8f} CPU")
 
     # Server-based mining
     if server_url:
-        return cmd_mine_server(wallet, server_url, num_shares)
+        return cmd_mine_server(wallet, server_url, num_shares, num_threads,
+                               initial_balance=initial_balance)
 
     # Local mining (legacy mode)
-    blockchain_path = os.path.expanduser("~/.cpucoin/blockchain.json")
-    if os.path.exists(blockchain_path):
-        blockchain = Blockchain.load(blockchain_path)
+    if os.path.exists(DEFAULT_BLOCKCHAIN_PATH):
+        blockchain = Blockchain.load(DEFAULT_BLOCKCHAIN_PATH)
         print(f"📦 Blockchain loaded: height {blockchain.height}")
     else:
         blockchain = Blockchain()
@@ -111,6 +142,10 @@ def cmd_mine(args):
     print(f"   Share value: {config.SHARE_VALUE:.8f} CPU")
     print(f"   Share difficulty: {blockchain.share_difficulty}")
     print(f"   Block difficulty: {blockchain.block_difficulty} (bonus shares!)")
+    print(f"   Hash backend: {MEMORY_HARD_BACKEND}")
+    print(f"   Mining threads: {num_threads}")
+    if MEMORY_HARD_BACKEND != "argon2id":
+        print("   ⚠️  argon2-cffi is not installed; hashing falls back to scrypt")
 
     # Create miner
     if num_threads > 1:
@@ -118,49 +153,65 @@ def cmd_mine(args):
     else:
         miner = ShareMiner(wallet, blockchain)
 
+    # Filled in as shares are found, so it survives a Ctrl+C
+    results = []
+
     try:
         if num_shares > 0:
             print(f"\n⛏️  Mining {num_shares} share(s)...\n")
         else:
             print(f"\n⛏️  Mining continuously (Ctrl+C to stop)...\n")
 
-        results = miner.mine_continuous(num_shares=num_shares, verbose=True)
+        miner.mine_continuous(num_shares=num_shares, verbose=True, out=results)
 
         # Save blockchain
-        blockchain.save(blockchain_path)
-        print(f"\n💾 Blockchain saved to {blockchain_path}")
+        blockchain.save_incremental(DEFAULT_BLOCKCHAIN_PATH)
+        print(f"\n💾 Blockchain saved to {DEFAULT_BLOCKCHAIN_PATH}")
 
         # Summary
-        successful = [r for r in results if r.success]
-        blocks_found = sum(1 for r in successful if r.is_block_find)
-        total_earned = sum(r.coin.value for r in successful if r.coin)
+        shares_mined = blocks_found = 0
+        for r in results:
+            if r.success:
+                shares_mined += 1
+                if r.is_block_find:
+                    blocks_found += 1
+        total_earned = sum(c.value for c in miner.coins_minted)  # incl. bonus shares
 
         print(f"\n📊 Session Summary:")
-        print(f"   Shares mined: {len(successful)}")
+        print(f"   Shares mined: {shares_mined}")
         print(f"   Blocks found: {blocks_found}")
         print(f"   Total earned: {total_earned:.8f} CPU")
-        print(f"   Wallet balance: {wallet.get_balance():.8f} CPU")
+        print(f"   Wallet balance: {initial_balance + total_earned:.8f} CPU")
 
     except KeyboardInterrupt:
         print("\n\n⏹️  Mining stopped by user")
+        print(f"   Shares mined: {sum(1 for r in results if r.success)}")
         miner.stop()
-        blockchain.save(blockchain_path)
+        blockchain.save_incremental(DEFAULT_BLOCKCHAIN_PATH)
+
+    finally:
+        miner.close()
 
     return 0
 
 
-def cmd_mine_server(wallet, server_url: str, num_shares: int):
+def cmd_mine_server(wallet, server_url: str, num_shares: int, num_threads: int = 1,
+                    initial_balance: Optional[float] = None):
     """Mine shares using a remote server."""
+    from cpucoin.mining_client import MiningClient, ServerShareMiner
+
     print(f"\n🌐 Connecting to server: {server_url}")
 
-    # Check server connection
+    # Check server connection; the same response carries the first job
     client = MiningClient(server_url)
-    info = client.get_server_info()
+    bootstrap = client.get_bootstrap()
 
-    if not info:
+    if not bootstrap:
         print(f"❌ Failed to connect to server: {client.last_error}")
         return 1
 
+    info = bootstrap['server_info']
+
     print(f"✅ Connected to {info.get('name', 'CPUCoin Server')}")
     print(f"   Blockchain height: {info.get('blockchain_height', 0)}")
     print(f"   Share difficulty: {info.get('share_difficulty', 0)}")
@@ -168,7 +219,11 @@ def cmd_mine_server(wallet, server_url: str, num_shares: int):
     print(f"   Share value: {info.get('share_value', 0):.8f} CPU")
 
     # Create server-connected miner
-    miner = ServerShareMiner(wallet, server_url)
+    miner = ServerShareMiner(wallet, server_url, num_lanes=max(1, num_threads),
+                             initial_job=bootstrap['initial_job'], client=client)
+
+    # Filled in as shares are found, so it survives a Ctrl+C
+    results = []
 
     try:
         if num_shares > 0:
@@ -176,22 +231,37 @@ def cmd_mine_server(wallet, server_url: str, num_shares: int):
         else:
             print(f"\n⛏️  Mining continuously (Ctrl+C to stop)...\n")
 
-        results = miner.mine_continuous(num_shares=num_shares, verbose=True)
-
-        # Summary
-        successful = [r for r in results if r.success]
-        blocks_found = sum(1 for r in successful if r.is_block_find)
-        bonus_shares = sum(r.bonus_shares for r in successful)
+        miner.mine_continuous(num_shares=num_shares, verbose=True, out=results)
+
+        # Summary, in a single pass over the results
+        shares_mined = blocks_found = bonus_shares = 0
+        total_earned = 0.0
+        for r in results:
+            if not r.success:
+                continue
+            shares_mined += 1
+            if r.is_block_find:
+                blocks_found += 1
+            bonus_shares += r.bonus_shares
+            if r.coin_data:
+                # Each accepted share (and each of its bonus shares) is one coin
+                total_earned += r.coin_data['value'] * (1 + r.bonus_shares)
 
         print(f"\n📊 Session Summary:")
-        print(f"   Shares mined: {len(successful)}")
+        print(f"   Shares mined: {shares_mined}")
         print(f"   Blocks found: {blocks_found}")
         print(f"   Bonus shares: {bonus_shares}")
-        print(f"   Wallet balance: {wallet.get_balance():.8f} CPU")
+        if initial_balance is None:
+            print(f"   Wallet balance: {wallet.get_balance():.8f} CPU")
+        else:
+            print(f"   Wallet balance: {initial_balance + total_earned:.8f} CPU")
 
     except KeyboardInterrupt:
         print("\n\n⏹️  Mining stopped by user")
+        print(f"   Shares mined: {sum(1 for r in results if r.success)}")
         miner.stop()
+    finally:
+        client.close()
 
     return 0
 
@@ -209,11 +279,12 @@ def cmd_wallet_create(args):
                 print("Passwords don't match!")
                 return 1
 
-    if name in list_wallets():
+    if name in _list_wallets_cached():
         print(f"Wallet '{name}' already exists!")
         return 1
 
     wallet = Wallet.create(name, password)
+    _list_wallets_cached.cache_clear()
 
     print(f"\n✅ Wallet created successfully!")
     print(f"\n📁 Name: {wallet.name}")
@@ -229,7 +300,7 @@ def cmd_wallet_info(args):
     name = args.name or "default"
     password = args.password or ""
 
-    if name not in list_wallets():
+    if name not in _list_wallets_cached():
         print(f"Wallet '{name}' not found!")
         return 1
 
@@ -249,30 +320,45 @@ def cmd_wallet_info(args):
     if coins:
         print(f"\n💰 Coins ({len(coins)}):")
         print("-" * 40)
-        for coin in coins[:10]:
-            print(f"  {coin.coin_id[:24]}... : {coin.value:.8f} CPU")
+        print("\n".join(f"  {coin.coin_id[:24]}... : {coin.value:.8f} CPU"
+                        for coin in coins[:10]))
         if len(coins) > 10:
             print(f"  ... and {len(coins) - 10} more")
 
     return 0
 
 
+def _wallet_balance_or_none(name: str):
+    """Load a wallet without a password and get its balance (None if encrypted)."""
+    try:
+        return Wallet.load(name, "").get_balance()
+    except Exception:
+        return None
+
+
 def cmd_wallet_list(args):
     """List all wallets."""
-    wallets = list_wallets()
+    wallets = _list_wallets_cached()
 
     if not wallets:
         print("No wallets found. Create one with: cpucoin wallet create <name>")
         return 0
 
+    # Loading a wallet and totting up its coins is file I/O, so read the
+    # wallets concurrently; results still come back in list order
+    if len(wallets) <= 2:
+        balances = [_wallet_balance_or_none(name) for name in wallets]
+    else:
+        with ThreadPoolExecutor(max_workers=min(32, len(wallets))) as executor:
+            balances = list(executor.map(_wallet_balance_or_none, wallets))
+
     print(f"\n📁 Wallets ({len(wallets)}):")
     print("-" * 40)
-    for name in wallets:
-        try:
-            wallet = Wallet.load(name, "")
-            print(f"  {name}: {wallet.get_balance():.8f} CPU")
-        except Exception:
+    for name, balance in zip(wallets, balances):
+        if balance is None:
             print(f"  {name}: (encrypted)")
+        else:
+            print(f"  {name}: {balance:.8f} CPU")
 
     return 0
 
@@ -282,7 +368,7 @@ def cmd_wallet_balance(args):
     name = args.name or "default"
     password = args.password or ""
 
-    if name not in list_wallets():
+    if name not in _list_wallets_cached():
         print(f"Wallet '{name}' not found!")
         return 1
 
@@ -338,29 +424,39 @@ def cmd_coins_list(args):
     coin_store = CoinStore()
     include_spent = args.all
 
-    coins = coin_store.list_coins(include_spent=include_spent)
-
-    if not coins:
+    # Stream the coins rather than building a list: a large store would
+    # otherwise be held in memory just to print it. Output is gathered and
+    # written in chunks rather than with several print() calls per coin
+    count = 0
+    total_value = 0.0
+    lines = []
+    for coin in coin_store.iter_coins(include_spent=include_spent):
+        if not count:
+            lines.append(f"\n💰 Coins/Shares:\n{'-' * 60}\n")
+        data = coin.data
+        count += 1
+        total_value += data.value
+
+        coin_type = _COIN_TYPE_LABELS[data.is_bonus_share << 1 | data.is_block_finder]
+        status = _COIN_STATUS_LABELS[data.is_spent]
+
+        lines.append(
+            f"  {coin.coin_id[:32]}...\n"
+            f"    Value: {data.value:.8f} CPU | Type: {coin_type} | Status: {status}\n"
+            f"    Block: #{data.block_height} | Share: #{data.share_index}\n\n"
+        )
+        if len(lines) >= 1024:
+            sys.stdout.write("".join(lines))
+            lines.clear()
+
+    sys.stdout.write("".join(lines))
+
+    if not count:
         print("No coins found. Mine some with: cpucoin mine")
         return 0
 
-    print(f"\n💰 Coins/Shares ({len(coins)}):")
-    print("-" * 60)
-    for coin in coins:
-        status = "SPENT" if coin.is_spent else "VALID"
-
-        # Determine coin type
-        if coin.data.is_bonus_share:
-            coin_type = "BONUS"
-        elif coin.data.is_block_finder:
-            coin_type = "BLOCK"
-        else:
-            coin_type = "SHARE"
-
-        print(f"  {coin.coin_id[:32]}...")
-        print(f"    Value: {coin.value:.8f} CPU | Type: {coin_type} | Status: {status}")
-        print(f"    Block: #{coin.data.block_height} | Share: #{coin.data.share_index}")
-        print()
+    print(f"Listed {count} coin(s) totalling {total_value:.8f} CPU")
+    print()
 
     stats = coin_store.stats()
     print(f"📊 Statistics:")
@@ -421,10 +517,8 @@ def cmd_coins_import(args):
 
 def cmd_blockchain_info(args):
     """Show blockchain information."""
-    blockchain_path = os.path.expanduser("~/.cpucoin/blockchain.json")
-
-    if os.path.exists(blockchain_path):
-        blockchain = Blockchain.load(blockchain_path)
+    if os.path.exists(DEFAULT_BLOCKCHAIN_PATH):
+        blockchain = Blockchain.load(DEFAULT_BLOCKCHAIN_PATH)
     else:
         blockchain = Blockchain()
 
@@ -445,17 +539,20 @@ def cmd_blockchain_info(args):
         print(f"  Shares claimed: {len(block.claimed_shares)}/{config.SHARES_PER_BLOCK}")
         print(f"  Shares remaining: {block.shares_remaining()}")
 
-    print(f"\n📋 Recent Blocks:")
+    lines = [f"\n📋 Recent Blocks:"]
     for block in blockchain.chain[-5:]:
         status = "CLOSED" if block.is_closed else "OPEN"
         shares = len(block.claimed_shares) if hasattr(block, 'claimed_shares') else "N/A"
-        print(f"  #{block.index}: {block.hash[:24]}... (shares: {shares}, {status})")
+        lines.append(f"  #{block.index}: {block.hash[:24]}... (shares: {shares}, {status})")
+    print("\n".join(lines))
 
     return 0
 
 
 def cmd_server_start(args):
     """Start the mining server."""
+    from cpucoin.server import run_server
+
     port = args.port or 8333
     host = args.host or "0.0.0.0"
 
@@ -466,6 +563,8 @@ def cmd_server_start(args):
 
 def cmd_server_info(args):
     """Show mining server information."""
+    from cpucoin.mining_client import MiningClient
+
     server_url = args.url
 
     client = MiningClient(server_url)
@@ -502,11 +601,12 @@ def cmd_server_info(args):
 
 def cmd_node_start(args):
     """Start a network node."""
+    from cpucoin.node import Node
+
     port = args.port or config.DEFAULT_PORT
 
-    blockchain_path = os.path.expanduser("~/.cpucoin/blockchain.json")
-    if os.path.exists(blockchain_path):
-        blockchain = Blockchain.load(blockchain_path)
+    if os.path.exists(DEFAULT_BLOCKCHAIN_PATH):
+        blockchain = Blockchain.load(DEFAULT_BLOCKCHAIN_PATH)
     else:
         blockchain = Blockchain()
 
@@ -515,19 +615,30 @@ def cmd_node_start(args):
     print(f"Starting node on port {port}...")
     node.start()
 
+    # Sleep until Ctrl+C (or SIGTERM) instead of polling. On Windows an
+    # untimed wait cannot be interrupted, so wake once a second there to
+    # let the main thread run the signal handler
+    stop = threading.Event()
+    handlers = {sig: signal.signal(sig, lambda *_: stop.set())
+                for sig in (signal.SIGINT, signal.SIGTERM)}
+    timeout = 1.0 if sys.platform == 'win32' else None
     try:
-        while True:
-            import time
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nStopping node...")
-        node.stop()
+        while not stop.wait(timeout):
+            pass
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+
+    print("\nStopping node...")
+    node.stop()
 
     return 0
 
 
 def cmd_node_connect(args):
     """Connect to a peer node."""
+    from cpucoin.node import Node
+
     host, port = args.address.split(':')
     port = int(port)
 
@@ -542,8 +653,25 @@ def cmd_node_connect(args):
     return 0
 
 
-def main():
-    """Main entry point."""
+def _print_help(parser: argparse.ArgumentParser):
+    """Handler for a command group invoked without a subcommand."""
+    def handler(args):
+        parser.print_help()
+        return 0
+    return handler
+
+
+@functools.lru_cache(maxsize=None)
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+
+    The parser is built once per process and reused, e.g. when main() is
+    called repeatedly from tests or another program.
+
+    Returns:
+        Parser whose (sub)commands carry their handler as the func default
+    """
     parser = argparse.ArgumentParser(
         description="CPUCoin - CPU-minable cryptocurrency with physical coin files",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -559,30 +687,35 @@ def main():
     mine_parser.add_argument('--password', '-p', type=str, default=None,
                             help='Wallet password')
     mine_parser.add_argument('--threads', '-t', type=int, default=1,
-                            help='Number of mining threads')
+                            help='Number of mining threads (0 = one per CPU core)')
     mine_parser.add_argument('--server', type=str, default=None,
                             help='Mining server URL (e.g., http://localhost:8333)')
+    mine_parser.set_defaults(func=cmd_mine)
 
     # Wallet commands
     wallet_parser = subparsers.add_parser('wallet', help='Wallet commands')
+    wallet_parser.set_defaults(func=_print_help(wallet_parser))
     wallet_sub = wallet_parser.add_subparsers(dest='wallet_cmd')
 
     create_parser = wallet_sub.add_parser('create', help='Create a new wallet')
     create_parser.add_argument('name', help='Wallet name')
     create_parser.add_argument('--password', '-p', type=str, default=None,
                               help='Wallet password')
+    create_parser.set_defaults(func=cmd_wallet_create)
 
     info_parser = wallet_sub.add_parser('info', help='Show wallet info')
     info_parser.add_argument('name', nargs='?', default='default', help='Wallet name')
     info_parser.add_argument('--password', '-p', type=str, default='',
                             help='Wallet password')
+    info_parser.set_defaults(func=cmd_wallet_info)
 
-    wallet_sub.add_parser('list', help='List all wallets')
+    wallet_sub.add_parser('list', help='List all wallets').set_defaults(func=cmd_wallet_list)
 
     balance_parser = wallet_sub.add_parser('balance', help='Show balance')
     balance_parser.add_argument('name', nargs='?', default='default', help='Wallet name')
     balance_parser.add_argument('--password', '-p', type=str, default='',
                                help='Wallet password')
+    balance_parser.set_defaults(func=cmd_wallet_balance)
 
     # Send command
     send_parser = subparsers.add_parser('send', help='Send coins')
@@ -592,32 +725,41 @@ def main():
                             help='Wallet name')
     send_parser.add_argument('--password', '-p', type=str, default='',
                             help='Wallet password')
+    send_parser.set_defaults(func=cmd_send)
 
     # Coins commands
     coins_parser = subparsers.add_parser('coins', help='Coin file commands')
+    coins_parser.set_defaults(func=_print_help(coins_parser))
     coins_sub = coins_parser.add_subparsers(dest='coins_cmd')
 
     list_parser = coins_sub.add_parser('list', help='List coins')
     list_parser.add_argument('--all', '-a', action='store_true',
                             help='Include spent coins')
+    list_parser.set_defaults(func=cmd_coins_list)
 
     info_parser = coins_sub.add_parser('info', help='Show coin info')
     info_parser.add_argument('coin_id', help='Coin ID')
+    info_parser.set_defaults(func=cmd_coins_info)
 
     export_parser = coins_sub.add_parser('export', help='Export coin to file')
     export_parser.add_argument('coin_id', help='Coin ID')
     export_parser.add_argument('filepath', help='Export path')
+    export_parser.set_defaults(func=cmd_coins_export)
 
     import_parser = coins_sub.add_parser('import', help='Import coin from file')
     import_parser.add_argument('filepath', help='Coin file path')
+    import_parser.set_defaults(func=cmd_coins_import)
 
     # Blockchain commands
     blockchain_parser = subparsers.add_parser('blockchain', help='Blockchain commands')
+    blockchain_parser.set_defaults(func=_print_help(blockchain_parser))
     blockchain_sub = blockchain_parser.add_subparsers(dest='blockchain_cmd')
-    blockchain_sub.add_parser('info', help='Show blockchain info')
+    blockchain_sub.add_parser('info', help='Show blockchain info').set_defaults(
+        func=cmd_blockchain_info)
 
     # Server commands
     server_parser = subparsers.add_parser('server', help='Mining server commands')
+    server_parser.set_defaults(func=_print_help(server_parser))
     server_sub = server_parser.add_subparsers(dest='server_cmd')
 
     server_start_parser = server_sub.add_parser('start', help='Start mining server')
@@ -625,73 +767,41 @@ def main():
                                      help='Port to listen on (default: 8333)')
     server_start_parser.add_argument('--host', type=str, default='0.0.0.0',
                                      help='Host to bind to (default: 0.0.0.0)')
+    server_start_parser.set_defaults(func=cmd_server_start)
 
     server_info_parser = server_sub.add_parser('info', help='Show server info')
     server_info_parser.add_argument('url', help='Server URL (e.g., http://localhost:8333)')
+    server_info_parser.set_defaults(func=cmd_server_info)
 
     # Node commands
     node_parser = subparsers.add_parser('node', help='Network node commands')
+    node_parser.set_defaults(func=_print_help(node_parser))
     node_sub = node_parser.add_subparsers(dest='node_cmd')
 
     start_parser = node_sub.add_parser('start', help='Start node')
     start_parser.add_argument('--port', '-p', type=int, default=config.DEFAULT_PORT,
                              help='Port to listen on')
+    start_parser.set_defaults(func=cmd_node_start)
 
     connect_parser = node_sub.add_parser('connect', help='Connect to peer')
     connect_parser.add_argument('address', help='Peer address (host:port)')
+    connect_parser.set_defaults(func=cmd_node_connect)
 
-    args = parser.parse_args()
-
-    if args.command == 'mine':
-        return cmd_mine(args)
-    elif args.command == 'wallet':
-        if args.wallet_cmd == 'create':
-            return cmd_wallet_create(args)
-        elif args.wallet_cmd == 'info':
-            return cmd_wallet_info(args)
-        elif args.wallet_cmd == 'list':
-            return cmd_wallet_list(args)
-        elif args.wallet_cmd == 'balance':
-            return cmd_wallet_balance(args)
-        else:
-            wallet_parser.print_help()
-    elif args.command == 'send':
-        return cmd_send(args)
-    elif args.command == 'coins':
-        if args.coins_cmd == 'list':
-            return cmd_coins_list(args)
-        elif args.coins_cmd == 'info':
-            return cmd_coins_info(args)
-        elif args.coins_cmd == 'export':
-            return cmd_coins_export(args)
-        elif args.coins_cmd == 'import':
-            return cmd_coins_import(args)
-        else:
-            coins_parser.print_help()
-    elif args.command == 'blockchain':
-        if args.blockchain_cmd == 'info':
-            return cmd_blockchain_info(args)
-        else:
-            blockchain_parser.print_help()
-    elif args.command == 'server':
-        if args.server_cmd == 'start':
-            return cmd_server_start(args)
-        elif args.server_cmd == 'info':
-            return cmd_server_info(args)
-        else:
-            server_parser.print_help()
-    elif args.command == 'node':
-        if args.node_cmd == 'start':
-            return cmd_node_start(args)
-        elif args.node_cmd == 'connect':
-            return cmd_node_connect(args)
-        else:
-            node_parser.print_help()
-    else:
+    return parser
+
+
+def main(argv=None):
+    """Main entry point."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # Each (sub)command parser carries its handler via set_defaults(func=...)
+    if not hasattr(args, 'func'):
         print_header()
         parser.print_help()
+        return 0
 
-    return 0
+    return args.func(args)
 
 
 if __name__ == '__main__':
@@ -12,19 +12,89 @@ Each coin is stored as a physical file on disk containing:
 
 import os
 import json
+import math
+import functools
 import time
-import uuid
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
-from .crypto_utils import sha256, double_sha256
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
+
+# sqlite3 is optional in some Python builds; without it CoinStore scans files
+try:
+    import sqlite3
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLITE_AVAILABLE = False
+
+from . import json_utils
+from .compat import DATACLASS_SLOTS
+from .crypto_utils import sha256, double_sha256, batch_double_sha256
 
 
 # Default directory for storing coins
 DEFAULT_COIN_DIR = os.path.expanduser("~/.cpucoin/coins")
 
+# Every coin ID starts with this
+COIN_ID_PREFIX = "COIN-"
+
+# Coin IDs hash a random per-process salt plus a counter, so minting many
+# IDs (e.g. a split into many parts) reads no entropy per ID. A forked
+# child gets a fresh salt so it cannot repeat its parent's IDs.
+_id_salt = os.urandom(16).hex()
+_id_counter = itertools.count()
+
+
+def _reseed_coin_ids() -> None:
+    """Pick a new coin ID salt (in a freshly forked child)."""
+    global _id_salt, _id_counter
+    _id_salt = os.urandom(16).hex()
+    _id_counter = itertools.count()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_coin_ids)
+
+# Batches smaller than this are loaded on the calling thread; below it the
+# pool costs more than the reads it overlaps
+PARALLEL_LOAD_MIN = 8
 
-@dataclass
+
+# Same output as json.dumps(value, sort_keys=True), without building a new
+# encoder on every call
+_json_sorted = json.JSONEncoder(sort_keys=True).encode
+_json_str = json.encoder.encode_basestring_ascii
+
+# Encoded forms of the constant values most coins hold (flags, empty
+# parent_coins), looked up instead of re-encoded per coin
+_JSON_CONSTANTS = {True: "true", False: "false"}
+_JSON_EMPTY = {list: "[]", dict: "{}"}
+
+
+def _json_value(value: Any) -> str:
+    """
+    Encode one value exactly as json.dumps(value, sort_keys=True) would.
+
+    Strings and plain numbers (the scalar coin fields) are written
+    directly; anything else goes through the sorted-keys encoder.
+    """
+    kind = type(value)
+    if kind is str:
+        return _json_str(value)
+    if kind is bool:
+        return _JSON_CONSTANTS[value]
+    if not value and kind in _JSON_EMPTY:
+        return _JSON_EMPTY[kind]
+    if kind is int:
+        return int.__repr__(value)
+    if kind is float and math.isfinite(value):
+        return float.__repr__(value)
+    return _json_sorted(value)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CoinData:
     """
     Data structure representing a coin (share) stored on disk.
@@ -50,27 +120,90 @@ class CoinData:
     is_block_finder: bool = False         # True if this miner found the full block
     is_bonus_share: bool = False          # True if this was a bonus share (block finder reward)
 
+    # Cached serialized history, as (the history list it was encoded from,
+    # records covered, their canonical JSON joined with ", "). Records are
+    # only ever appended, so only new ones need encoding; assigning a new
+    # list starts over. Coins derived by transfer/split inherit the prefix
+    # from the parent. Not part of the coin: never passed in, compared or saved.
+    _history_json: Optional[Tuple[List[Dict[str, Any]], int, str]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # Cached canonical JSON of mining_proof, as (the proof dict it was
+    # encoded from, text). Every coin descended from a mint shares the
+    # same proof dict, and proofs are never modified after minting.
+    _proof_json: Optional[Tuple[Dict[str, Any], str]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def _inherit_encodings(self, parent: 'CoinData') -> None:
+        """Reuse a parent coin's cached history and proof encodings."""
+        cached = parent._history_json
+        if cached is not None and cached[0] is parent.history:
+            _, done, text = cached
+            # The child's history is a new list; the cached text covers it
+            # only if it starts with the very same record objects
+            history = self.history
+            if (len(history) >= done
+                    and all(a is b for a, b in zip(history, parent.history[:done]))):
+                self._history_json = (history, done, text)
+        self._proof_json = parent._proof_json
+
+    def _proof_text(self) -> str:
+        """Get the canonical JSON of mining_proof."""
+        cached = self._proof_json
+        if cached is None or cached[0] is not self.mining_proof:
+            cached = self._proof_json = (self.mining_proof, _json_value(self.mining_proof))
+        return cached[1]
+
+    def _history_text(self) -> str:
+        """Get the canonical JSON of the history records (without brackets)."""
+        history = self.history
+        cached = self._history_json
+        if cached is None or cached[0] is not history or cached[1] > len(history):
+            cached = (history, 0, "")
+        _, done, text = cached
+        if done < len(history):
+            new_records = ", ".join(_json_sorted(record) for record in history[done:])
+            text = f"{text}, {new_records}" if text else new_records
+            self._history_json = (history, len(history), text)
+        return text
+
+    def canonical_json(self) -> str:
+        """
+        Get the canonical JSON form of this coin's data (what is hashed).
+
+        Stays byte-for-byte equal to json.dumps(sort_keys=True) over the
+        fields below: the hash covers the exact bytes, and existing coins
+        must keep verifying. The field set is fixed, so the keys are
+        written in sorted order directly, with no dict to build and sort,
+        around the cached history and proof text.
+        """
+        return (
+            f'{{"block_hash": {_json_value(self.block_hash)}, '
+            f'"block_height": {_json_value(self.block_height)}, '
+            f'"coin_id": {_json_value(self.coin_id)}, '
+            f'"created_at": {_json_value(self.created_at)}, '
+            f'"history": [{self._history_text()}], '
+            f'"is_block_finder": {_json_value(self.is_block_finder)}, '
+            f'"is_bonus_share": {_json_value(self.is_bonus_share)}, '
+            f'"mining_proof": {self._proof_text()}, '
+            f'"owner_pubkey": {_json_value(self.owner_pubkey)}, '
+            f'"parent_coins": {_json_value(self.parent_coins)}, '
+            f'"share_index": {_json_value(self.share_index)}, '
+            f'"value": {_json_value(self.value)}}}'
+        )
+
     def compute_hash(self) -> str:
         """Compute unique hash of this coin's data."""
-        data = {
-            'coin_id': self.coin_id,
-            'value': self.value,
-            'owner_pubkey': self.owner_pubkey,
-            'created_at': self.created_at,
-            'block_height': self.block_height,
-            'mining_proof': self.mining_proof,
-            'history': self.history,
-            'parent_coins': self.parent_coins,
-            'share_index': self.share_index,
-            'block_hash': self.block_hash,
-            'is_block_finder': self.is_block_finder,
-            'is_bonus_share': self.is_bonus_share
-        }
-        return double_sha256(json.dumps(data, sort_keys=True))
+        return double_sha256(self.canonical_json())
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+        """
+        Convert to dictionary for serialization.
+
+        Built shallowly (history, mining_proof and parent_coins are
+        shared, not deep-copied as asdict() would), since the result is
+        serialized straight away; copy it before modifying.
+        """
+        return {name: getattr(self, name) for name in _SAVED_FIELDS}
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CoinData':
@@ -78,6 +211,10 @@ class CoinData:
         return cls(**data)
 
 
+# Fields written to coin files (everything but the encoding caches)
+_SAVED_FIELDS = tuple(f.name for f in fields(CoinData) if f.init)
+
+
 class Coin:
     """
     A physical coin file on disk.
@@ -111,14 +248,16 @@ class Coin:
     @classmethod
     def generate_coin_id(cls, owner_pubkey: str, block_height: int, nonce: int) -> str:
         """Generate a unique coin ID."""
-        unique_data = f"{owner_pubkey}{block_height}{nonce}{time.time()}{uuid.uuid4()}"
-        return f"COIN-{sha256(unique_data)[:32]}"
+        unique_data = (f"{owner_pubkey}|{block_height}|{nonce}|{time.time_ns()}|"
+                       f"{_id_salt}|{next(_id_counter)}")
+        return f"{COIN_ID_PREFIX}{sha256(unique_data)[:32]}"
 
     @classmethod
     def mint(cls, owner_pubkey: str, value: float, block_height: int,
              mining_proof: Dict[str, Any], coin_dir: str = DEFAULT_COIN_DIR,
              share_index: int = 0, block_hash: str = "",
-             is_block_finder: bool = False, is_bonus_share: bool = False) -> 'Coin':
+             is_block_finder: bool = False, is_bonus_share: bool = False,
+             save: bool = True) -> 'Coin':
         """
         Mint a new coin/share (called when mining is successful).
 
@@ -132,6 +271,8 @@ class Coin:
             block_hash: Hash of the block this share belongs to
             is_block_finder: True if this miner found the full block
             is_bonus_share: True if this is a bonus share from block finding
+            save: Write the coin file now (pass False to write several
+                coins together with save_batch())
 
         Returns:
             The newly minted Coin
@@ -168,7 +309,8 @@ class Coin:
         )
 
         coin = cls(data)
-        coin.save(coin_dir)
+        if save:
+            coin.save(coin_dir)
         return coin
 
     def save(self, coin_dir: str = DEFAULT_COIN_DIR) -> str:
@@ -181,19 +323,66 @@ class Coin:
         Returns:
             Path to the saved coin file
         """
+        return self.save_batch([self], coin_dir)[0]
+
+    @classmethod
+    def save_batch(cls, coins: List['Coin'], coin_dir: str = DEFAULT_COIN_DIR,
+                   durable: bool = False) -> List[str]:
+        """
+        Save several coins to disk in one go.
+
+        The directory is created once and each coin is serialized to bytes
+        up front and written with a single write() call, rather than
+        json.dump() streaming small chunks through a text-mode file.
+
+        Each coin is written to a temporary file and renamed over its
+        coin file, so a crash leaves either the old or the new version of
+        a coin, never a torn file. With durable set, each file is also
+        fsync()ed before its rename and the directory afterwards: coins
+        reach the disk in the order given, so e.g. a transfer's spent flag
+        is stored before the recipient's coin exists.
+
+        Args:
+            coins: Coins to save, written in order
+            coin_dir: Directory to store the coins
+            durable: Flush each coin to disk before writing the next
+
+        Returns:
+            Paths to the saved coin files
+        """
         # Create directory if needed
         Path(coin_dir).mkdir(parents=True, exist_ok=True)
 
-        # Generate filename from coin ID
-        filename = f"{self.coin_id}{self.EXTENSION}"
-        filepath = os.path.join(coin_dir, filename)
-
-        # Write coin data as JSON
-        with open(filepath, 'w') as f:
-            json.dump(self.data.to_dict(), f, indent=2)
+        paths = []
+        for coin in coins:
+            # Generate filename from coin ID
+            filepath = os.path.join(coin_dir, f"{coin.coin_id}{cls.EXTENSION}")
+            # Not ending in EXTENSION, so never mistaken for a coin
+            tmp_path = f"{filepath}.{os.getpid()}-{threading.get_ident()}.tmp"
 
-        self.filepath = filepath
-        return filepath
+            # Write coin data as JSON
+            payload = json_utils.dumps(coin.data.to_dict(), indent=True)
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            coin.filepath = filepath
+            paths.append(filepath)
+
+        if durable:
+            _fsync_dir(coin_dir)
+
+        return paths
 
     @classmethod
     def load(cls, filepath: str) -> 'Coin':
@@ -206,8 +395,11 @@ class Coin:
         Returns:
             Loaded Coin object
         """
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        # Unbuffered binary read: the file is sized with fstat() and read in
+        # one call, skipping the buffer and text-decoding layers; the JSON
+        # parser decodes the UTF-8 bytes itself
+        with open(filepath, 'rb', buffering=0) as f:
+            data = json_utils.loads(f.read())
 
         return cls(CoinData.from_dict(data), filepath)
 
@@ -259,13 +451,11 @@ class Coin:
             history=self.data.history + [transfer_record],
             parent_coins=[self.coin_id]
         )
+        new_data._inherit_encodings(self.data)
 
-        # Save spent status to original file
-        self.save(coin_dir)
-
-        # Create and save new coin
+        # Save spent status to original file, then the new coin
         new_coin = Coin(new_data)
-        new_coin.save(coin_dir)
+        self.save_batch([self, new_coin], coin_dir, durable=True)
 
         return new_coin
 
@@ -312,11 +502,11 @@ class Coin:
                 history=self.data.history + [split_record],
                 parent_coins=[self.coin_id]
             )
-            new_coin = Coin(new_data)
-            new_coin.save(coin_dir)
-            new_coins.append(new_coin)
+            new_data._inherit_encodings(self.data)
+            new_coins.append(Coin(new_data))
 
-        self.save(coin_dir)
+        # Spent status of the original first, then the new coins
+        self.save_batch([self] + new_coins, coin_dir, durable=True)
         return new_coins
 
     @classmethod
@@ -357,7 +547,6 @@ class Coin:
         for coin in coins:
             coin.data.is_spent = True
             coin.data.history.append(combine_record)
-            coin.save(coin_dir)
 
         # Create new combined coin
         new_data = CoinData(
@@ -370,9 +559,11 @@ class Coin:
             history=[combine_record],
             parent_coins=parent_ids
         )
+        new_data._proof_json = coins[0].data._proof_json
 
+        # Spent sources first, then the combined coin
         new_coin = cls(new_data)
-        new_coin.save(coin_dir)
+        cls.save_batch(coins + [new_coin], coin_dir, durable=True)
         return new_coin
 
     def verify(self) -> bool:
@@ -383,7 +574,7 @@ class Coin:
             True if coin is valid
         """
         # Check coin ID format
-        if not self.coin_id.startswith("COIN-"):
+        if not self.coin_id.startswith(COIN_ID_PREFIX):
             return False
 
         # Check mining proof exists
@@ -405,12 +596,12 @@ class Coin:
         info = {
             'Coin ID': self.coin_id,
             'Value': f"{self.data.value:.8f} CPU",
-            'Owner': self.data.owner_pubkey[:16] + "..." if len(self.data.owner_pubkey) > 16 else self.data.owner_pubkey,
-            'Created': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.data.created_at)),
+            'Owner': _short_pubkey(self.data.owner_pubkey),
+            'Created': _format_created(self.data.created_at),
             'Block Height': self.data.block_height,
             'Share Index': self.data.share_index,
             'Status': 'SPENT' if self.data.is_spent else 'UNSPENT',
-            'Transfers': len([h for h in self.data.history if h.get('action') == 'transfer']),
+            'Transfers': sum(1 for h in self.data.history if h.get('action') == 'transfer'),
             'File': self.filepath
         }
 
@@ -432,6 +623,150 @@ class Coin:
         return f"Coin({self.coin_id[:20]}..., {self.data.value:.8f} CPU, {status})"
 
 
+# get_info() display strings. API listings and `coins list` show the same
+# few owners and the same coins again and again, so they are memoized
+@functools.lru_cache(maxsize=256)
+def _short_pubkey(pubkey: str) -> str:
+    """Shorten a public key for display."""
+    return pubkey[:16] + "..." if len(pubkey) > 16 else pubkey
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_created(timestamp: float) -> str:
+    """Format a coin's creation time for display (local time)."""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+def _fsync_dir(path: str) -> None:
+    """Flush a directory's entries (renames) to disk where the OS allows it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories cannot be opened
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _try_load(path: str) -> Optional['Coin']:
+    """Load a coin file, or None if it is missing or corrupt."""
+    try:
+        return Coin.load(path)
+    except Exception:
+        return None
+
+
+def load_coin_files(paths: List[str]) -> List[Optional['Coin']]:
+    """
+    Load many coin files, overlapping the reads on a thread pool.
+
+    File reads release the GIL, so a directory of coins loads in roughly
+    the time of its slowest reads rather than their sum. Batches under
+    PARALLEL_LOAD_MIN are loaded on the calling thread.
+
+    Args:
+        paths: Coin file paths
+
+    Returns:
+        Coin (or None for a missing or corrupt file) per path, in order
+    """
+    if len(paths) < PARALLEL_LOAD_MIN:
+        return [_try_load(path) for path in paths]
+    workers = min(32, len(paths), (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_try_load, paths))
+
+
+class CoinIndex:
+    """
+    SQLite index of the coin files in a directory.
+
+    Holds each file's owner, value and spent flag so balance and coin
+    selection queries do not have to open and parse every coin file.
+    The coin files stay the source of truth: sync() compares each file's
+    mtime and size against the index and re-reads only files that were
+    added or changed (including coins copied in or deleted by hand).
+    """
+
+    FILENAME = ".index.sqlite3"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS coins (
+            filename TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            coin_id TEXT,
+            owner_pubkey TEXT,
+            value REAL,
+            is_spent INTEGER,
+            block_height INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS coins_owner
+            ON coins (owner_pubkey, is_spent, value);
+    """
+
+    def __init__(self, coin_dir: str):
+        self.coin_dir = coin_dir
+        self.path = os.path.join(coin_dir, self.FILENAME)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self._SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> 'sqlite3.Connection':
+        # A connection per operation keeps the index usable from any thread
+        return sqlite3.connect(self.path, timeout=30)
+
+    def sync(self) -> 'sqlite3.Connection':
+        """
+        Bring the index up to date with the coin files on disk.
+
+        Returns:
+            Open connection to the synced index (caller closes it)
+        """
+        on_disk = {}
+        with os.scandir(self.coin_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(Coin.EXTENSION) and entry.is_file():
+                    st = entry.stat()
+                    on_disk[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        conn = self._connect()
+        indexed = {name: (mtime_ns, size) for name, mtime_ns, size
+                   in conn.execute("SELECT filename, mtime_ns, size FROM coins")}
+
+        changed = [name for name, signature in on_disk.items()
+                   if indexed.get(name) != signature]
+        loaded = load_coin_files([os.path.join(self.coin_dir, name) for name in changed])
+
+        rows = []
+        for name, coin in zip(changed, loaded):
+            signature = on_disk[name]
+            if coin is None:
+                # Corrupt file: remember it (coin_id NULL) so it is not
+                # re-parsed on every sync, and leave it out of queries
+                rows.append((name, *signature, None, None, None, None, None))
+                continue
+            data = coin.data
+            rows.append((name, *signature, data.coin_id, data.owner_pubkey,
+                         data.value, int(data.is_spent), data.block_height))
+
+        removed = [(name,) for name in indexed.keys() - on_disk.keys()]
+
+        if rows or removed:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO coins VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.executemany("DELETE FROM coins WHERE filename = ?", removed)
+
+        return conn
+
+
 class CoinStore:
     """
     Manages all coins on disk for a user.
@@ -443,42 +778,171 @@ class CoinStore:
         self.coin_dir = coin_dir
         Path(coin_dir).mkdir(parents=True, exist_ok=True)
 
+        self._index: Optional[CoinIndex] = None
+        if SQLITE_AVAILABLE:
+            try:
+                self._index = CoinIndex(coin_dir)
+            except sqlite3.Error:
+                pass  # e.g. read-only directory; fall back to scanning files
+
+    def _synced_index(self) -> Optional['sqlite3.Connection']:
+        """Sync the index and connect to it (None if there is no index)."""
+        if self._index is None:
+            return None
+        try:
+            return self._index.sync()
+        except (sqlite3.Error, OSError):
+            return None
+
+    def _query(self, sql: str, params: tuple = ()) -> Optional[list]:
+        """Run a query against the synced index (None if there is no index)."""
+        conn = self._synced_index()
+        if conn is None:
+            return None
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _filter_sql(owner_pubkey: Optional[str], include_spent: bool,
+                    columns: str = "filename", order: str = "",
+                    limit: Optional[int] = None) -> tuple:
+        """Build the (sql, params) selecting coins matching the list_coins() filters."""
+        where = ["coin_id IS NOT NULL"]
+        params = []
+        if owner_pubkey:
+            where.append("owner_pubkey = ?")
+            params.append(owner_pubkey)
+        if not include_spent:
+            where.append("is_spent = 0")
+        sql = f"SELECT {columns} FROM coins WHERE {' AND '.join(where)} {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, tuple(params)
+
+    def _select_files(self, owner_pubkey: Optional[str], include_spent: bool,
+                      columns: str = "filename", order: str = "",
+                      limit: Optional[int] = None) -> Optional[list]:
+        """Select index rows for coins matching the list_coins() filters."""
+        return self._query(*self._filter_sql(owner_pubkey, include_spent, columns, order, limit))
+
+    def _coin_filenames(self) -> List[str]:
+        """List the names of the coin files in the directory."""
+        try:
+            entries = os.scandir(self.coin_dir)
+        except FileNotFoundError:
+            return []
+
+        with entries:
+            return [entry.name for entry in entries
+                    if entry.name.endswith(Coin.EXTENSION) and entry.is_file()]
+
+    def _scan_coins(self) -> Iterator[Coin]:
+        """Load every readable coin file in the directory."""
+        return self._load_files(self._coin_filenames())
+
+    def _load_files(self, filenames: Iterable[str]) -> Iterator[Coin]:
+        """Load coin files by name, skipping any that vanished or broke."""
+        for filename in filenames:
+            coin = _try_load(os.path.join(self.coin_dir, filename))
+            if coin is not None:
+                yield coin
+
+    def _parallel_load(self, filenames: List[str]) -> List[Coin]:
+        """Load coin files by name on a thread pool (see load_coin_files())."""
+        paths = [os.path.join(self.coin_dir, filename) for filename in filenames]
+        return [coin for coin in load_coin_files(paths) if coin is not None]
+
+    @staticmethod
+    def _matches(coin: Coin, owner_pubkey: Optional[str], include_spent: bool) -> bool:
+        """Check a loaded coin against the list_coins() filters."""
+        if owner_pubkey and coin.data.owner_pubkey != owner_pubkey:
+            return False
+        return include_spent or not coin.data.is_spent
+
+    def iter_coins(self, owner_pubkey: Optional[str] = None,
+                   include_spent: bool = False,
+                   limit: Optional[int] = None) -> Iterator[Coin]:
+        """
+        Iterate over the coins in the store, loading one file at a time.
+
+        With the index, only the files matching the filters are opened;
+        without it, files are read only until `limit` coins matched.
+
+        Args:
+            owner_pubkey: Filter by owner (optional)
+            include_spent: Include spent coins
+            limit: Stop after this many coins (optional)
+
+        Yields:
+            Coin objects
+        """
+        rows = self._select_files(owner_pubkey, include_spent, limit=limit)
+        coins = (self._scan_coins() if rows is None
+                 else self._load_files(filename for filename, in rows))
+
+        # Filters are re-checked against the loaded data in case a file
+        # changed after the index was read
+        matching = (coin for coin in coins
+                    if self._matches(coin, owner_pubkey, include_spent))
+        yield from itertools.islice(matching, limit)
+
     def list_coins(self, owner_pubkey: Optional[str] = None,
-                   include_spent: bool = False) -> List[Coin]:
+                   include_spent: bool = False,
+                   limit: Optional[int] = None) -> List[Coin]:
         """
         List all coins in the store.
 
         Args:
             owner_pubkey: Filter by owner (optional)
             include_spent: Include spent coins
+            limit: Return at most this many coins (optional)
 
         Returns:
             List of Coin objects
         """
-        coins = []
-        coin_dir = Path(self.coin_dir)
-
-        if not coin_dir.exists():
-            return coins
-
-        for filepath in coin_dir.glob(f"*{Coin.EXTENSION}"):
-            try:
-                coin = Coin.load(str(filepath))
-                if owner_pubkey and coin.data.owner_pubkey != owner_pubkey:
-                    continue
-                if not include_spent and coin.data.is_spent:
-                    continue
-                coins.append(coin)
-            except Exception:
-                continue  # Skip corrupt files
-
-        return coins
+        rows = self._select_files(owner_pubkey, include_spent, limit=limit)
+        if rows is None and limit is not None:
+            # No index to cut the file list short; read lazily instead
+            return list(self.iter_coins(owner_pubkey, include_spent, limit))
+        filenames = (self._coin_filenames() if rows is None
+                     else [filename for filename, in rows])
+        return [coin for coin in self._parallel_load(filenames)
+                if self._matches(coin, owner_pubkey, include_spent)]
 
     def get_balance(self, owner_pubkey: str) -> float:
         """Get total balance for an owner."""
+        rows = self._query(
+            "SELECT TOTAL(value) FROM coins "
+            "WHERE owner_pubkey = ? AND is_spent = 0 AND coin_id IS NOT NULL",
+            (owner_pubkey,))
+        if rows is not None:
+            return rows[0][0]
         coins = self.list_coins(owner_pubkey=owner_pubkey, include_spent=False)
         return sum(c.data.value for c in coins)
 
+    def compute_all_hashes(self, coins: Optional[Iterable[Coin]] = None) -> Dict[str, str]:
+        """
+        Compute the data hash of many coins at once.
+
+        Args:
+            coins: Coins to hash (default: every coin in the store,
+                including spent ones)
+
+        Returns:
+            Dict mapping coin ID to CoinData.compute_hash() value
+        """
+        if coins is None:
+            coins = self.iter_coins(include_spent=True)
+        ids = []
+        payloads = []
+        for coin in coins:
+            ids.append(coin.coin_id)
+            payloads.append(coin.data.canonical_json())
+        return dict(zip(ids, batch_double_sha256(payloads)))
+
     def get_coin(self, coin_id: str) -> Optional[Coin]:
         """Get a specific coin by ID."""
         return Coin.load_by_id(coin_id, self.coin_dir)
@@ -494,6 +958,32 @@ class CoinStore:
         Returns:
             List of coins to use, or None if insufficient funds
         """
+        conn = self._synced_index()
+        if conn is not None:
+            # Walk the (owner, is_spent, value) index from the largest
+            # value down, stopping at the first rows that cover the amount,
+            # then load just the chosen files
+            sql, params = self._filter_sql(owner_pubkey, False, columns="filename, value",
+                                           order="ORDER BY value DESC")
+            chosen = []
+            total = 0.0
+            try:
+                for filename, value in conn.execute(sql, params):
+                    chosen.append(filename)
+                    total += value
+                    if total >= amount:
+                        break
+                else:
+                    return None  # Insufficient funds
+            finally:
+                conn.close()
+
+            selected = self._parallel_load(chosen)
+            if len(selected) == len(chosen):
+                return selected
+            # A chosen file vanished after the index was read; fall back
+            # to reading the files
+
         coins = self.list_coins(owner_pubkey=owner_pubkey, include_spent=False)
         coins.sort(key=lambda c: c.data.value, reverse=True)
 
@@ -557,16 +1047,59 @@ class CoinStore:
             pass
         return None
 
+    def export_pack(self, export_path: str, owner_pubkey: Optional[str] = None,
+                    include_spent: bool = False) -> int:
+        """
+        Export coins to a single coin pack file (see coin_pack.CoinPack).
+
+        Args:
+            export_path: Where to write the pack
+            owner_pubkey: Only export this owner's coins (optional)
+            include_spent: Include spent coins
+
+        Returns:
+            Number of coins exported
+        """
+        from .coin_pack import CoinPack
+        return CoinPack.write(export_path, self.iter_coins(owner_pubkey, include_spent))
+
+    def import_pack(self, pack_path: str) -> List[Coin]:
+        """
+        Import every valid coin from a coin pack file.
+
+        Args:
+            pack_path: Path to the pack
+
+        Returns:
+            Imported Coin objects (invalid coins are skipped)
+        """
+        from .coin_pack import CoinPack
+        coins = [coin for coin in CoinPack(pack_path) if coin.verify()]
+        Coin.save_batch(coins, self.coin_dir)
+        return coins
+
     def stats(self) -> Dict[str, Any]:
         """Get statistics about stored coins."""
-        all_coins = self.list_coins(include_spent=True)
-        unspent = [c for c in all_coins if not c.data.is_spent]
-        spent = [c for c in all_coins if c.data.is_spent]
+        rows = self._query(
+            "SELECT COUNT(*), TOTAL(is_spent), TOTAL(CASE WHEN is_spent THEN 0 ELSE value END) "
+            "FROM coins WHERE coin_id IS NOT NULL")
+        if rows is not None:
+            total, spent, unspent_value = rows[0]
+            spent = int(spent)
+        else:
+            total = spent = 0
+            unspent_value = 0.0
+            for coin in self._scan_coins():
+                total += 1
+                if coin.data.is_spent:
+                    spent += 1
+                else:
+                    unspent_value += coin.data.value
 
         return {
-            'total_files': len(all_coins),
-            'unspent_coins': len(unspent),
-            'spent_coins': len(spent),
-            'total_unspent_value': sum(c.data.value for c in unspent),
+            'total_files': total,
+            'unspent_coins': total - spent,
+            'spent_coins': spent,
+            'total_unspent_value': unspent_value,
             'coin_directory': self.coin_dir
         }
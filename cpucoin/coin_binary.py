@@ -0,0 +1,127 @@
+"""
+Compact binary encoding of coin data
+
+Fixed-width fields (value, timestamps, heights, flags) are packed with
+struct, strings are length-prefixed UTF-8, and the free-form fields
+(mining_proof, history, parent_coins) are embedded as one compact JSON
+array. Decoding is one struct.unpack_from() plus one JSON parse, and
+the record carries no key names or indentation for the fixed fields.
+
+Layout (little-endian):
+- magic b"CPCB", format version (uint8), flags (uint8: spent, block
+  finder, bonus share), coin format version (uint16)
+- value, created_at (float64), block_height (int64), share_index (int32)
+- lengths of coin_id, owner_pubkey, signature, block_hash (uint16 each)
+- the four strings, then JSON [mining_proof, history, parent_coins] to
+  the end of the record
+
+Used for coin pack payloads; loose .coin files stay JSON so they remain
+readable and editable by hand.
+"""
+
+import struct
+from typing import Union
+
+from . import json_utils
+from .coin import CoinData
+
+MAGIC = b"CPCB"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBBHddqiHHHH")
+
+_FLAG_SPENT = 0x01
+_FLAG_BLOCK_FINDER = 0x02
+_FLAG_BONUS_SHARE = 0x04
+
+
+def is_binary(buf: Union[bytes, memoryview]) -> bool:
+    """Check whether a buffer holds a binary-encoded coin (vs JSON)."""
+    return bytes(buf[:len(MAGIC)]) == MAGIC
+
+
+def encode(data: CoinData) -> bytes:
+    """
+    Encode coin data in the binary format.
+
+    Args:
+        data: Coin data to encode
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        ValueError: If a field cannot be stored exactly (e.g. an integer
+            value, which would come back as a float and change the
+            coin's hash); callers should fall back to JSON
+    """
+    if type(data.value) is not float or type(data.created_at) is not float:
+        raise ValueError("value and created_at must be floats")
+
+    strings = [s.encode('utf-8') for s in
+               (data.coin_id, data.owner_pubkey, data.signature, data.block_hash)]
+    blob = json_utils.dumps([data.mining_proof, data.history, data.parent_coins])
+    flags = ((_FLAG_SPENT if data.is_spent else 0)
+             | (_FLAG_BLOCK_FINDER if data.is_block_finder else 0)
+             | (_FLAG_BONUS_SHARE if data.is_bonus_share else 0))
+
+    try:
+        header = _HEADER.pack(
+            MAGIC, FORMAT_VERSION, flags, data.version,
+            data.value, data.created_at, data.block_height, data.share_index,
+            *(len(s) for s in strings))
+    except struct.error as e:
+        raise ValueError(f"Coin not representable in binary form: {e}") from None
+
+    return b"".join([header, *strings, blob])
+
+
+def decode(buf: Union[bytes, memoryview]) -> CoinData:
+    """
+    Decode coin data written by encode().
+
+    Args:
+        buf: Encoded coin (a memoryview is parsed without copying the
+            JSON part when orjson is installed)
+
+    Returns:
+        Decoded CoinData
+
+    Raises:
+        ValueError: If the buffer is not a binary coin
+    """
+    if len(buf) < _HEADER.size:
+        raise ValueError("Truncated binary coin")
+    (magic, fmt, flags, version, value, created_at, block_height, share_index,
+     *lengths) = _HEADER.unpack_from(buf)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        raise ValueError("Not a binary coin")
+
+    view = memoryview(buf)
+    pos = _HEADER.size
+    strings = []
+    for length in lengths:
+        strings.append(str(view[pos:pos + length], 'utf-8'))
+        pos += length
+    if pos > len(view):
+        raise ValueError("Truncated binary coin")
+    coin_id, owner_pubkey, signature, block_hash = strings
+    mining_proof, history, parent_coins = json_utils.loads(view[pos:])
+
+    return CoinData(
+        coin_id=coin_id,
+        value=value,
+        owner_pubkey=owner_pubkey,
+        created_at=created_at,
+        block_height=block_height,
+        mining_proof=mining_proof,
+        history=history,
+        signature=signature,
+        parent_coins=parent_coins,
+        is_spent=bool(flags & _FLAG_SPENT),
+        version=version,
+        share_index=share_index,
+        block_hash=block_hash,
+        is_block_finder=bool(flags & _FLAG_BLOCK_FINDER),
+        is_bonus_share=bool(flags & _FLAG_BONUS_SHARE),
+    )
@@ -20,27 +20,32 @@ Usage:
     --data-dir      Data directory (default: ~/.cpucoin-server)
     --log-file      Log file path (optional)
     --no-api        Disable REST API
+    --api-workers   REST API worker threads (default: 16)
 """
 
 import os
 import sys
-import json
 import time
+import queue
+import atexit
 import signal
 import socket
 import logging
+import logging.handlers
 import argparse
+import functools
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Import CPUCoin modules
-from . import config
+from . import config, json_utils
 from .blockchain import Block, Blockchain
 from .coin import Coin, CoinStore
 from .transaction import Transaction, TransactionPool
@@ -64,6 +69,7 @@ class ServerConfig:
     enable_mining: bool = False
     mining_threads: int = 4
     enable_api: bool = True
+    api_workers: int = 16
     log_file: Optional[str] = None
     max_peers: int = 100
     sync_interval: int = 5
@@ -76,9 +82,33 @@ class ServerConfig:
 # Statistics Tracking
 # =============================================================================
 
+@functools.lru_cache(maxsize=2)
+def _uptime_human(seconds: int) -> str:
+    """Format whole seconds of uptime; repeated polls within a second hit the cache."""
+    return str(timedelta(seconds=seconds))
+
+
+# /stats response body with the same keys and order as ServerStats.to_dict()
+_STATS_JSON = (
+    '{"uptime_seconds": %r, "uptime_human": "%s", "blocks_received": %d, '
+    '"blocks_mined": %d, "transactions_received": %d, "transactions_relayed": %d, '
+    '"peers_connected": %d, "peers_disconnected": %d, "total_connections": %d, '
+    '"bytes_sent": %d, "bytes_received": %d, "errors": %d, '
+    '"last_block_time": %r, "hash_rate": %r}'
+)
+
+
 @dataclass
 class ServerStats:
-    """Server statistics."""
+    """
+    Server statistics.
+
+    Updated from the P2P, mining and API threads at once, so writers go
+    through incr()/update(), which hold a lock: a bare `stats.x += 1` is
+    a read-modify-write that loses counts when two threads interleave.
+    Fields may still be read directly; to_dict() takes a consistent
+    snapshot.
+    """
     start_time: float = 0.0
     blocks_received: int = 0
     blocks_mined: int = 0
@@ -92,33 +122,139 @@ class ServerStats:
     errors: int = 0
     last_block_time: float = 0.0
     hash_rate: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        """
+        Atomically add to a counter.
+
+        Args:
+            counter: Field name (e.g. 'blocks_received')
+            amount: Amount to add
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def update(self, **values: Any) -> None:
+        """Atomically set one or more fields."""
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, value)
 
     def to_dict(self) -> Dict[str, Any]:
-        uptime = time.time() - self.start_time if self.start_time else 0
-        return {
-            'uptime_seconds': uptime,
-            'uptime_human': str(timedelta(seconds=int(uptime))),
-            'blocks_received': self.blocks_received,
-            'blocks_mined': self.blocks_mined,
-            'transactions_received': self.transactions_received,
-            'transactions_relayed': self.transactions_relayed,
-            'peers_connected': self.peers_connected,
-            'peers_disconnected': self.peers_disconnected,
-            'total_connections': self.total_connections,
-            'bytes_sent': self.bytes_sent,
-            'bytes_received': self.bytes_received,
-            'errors': self.errors,
-            'last_block_time': self.last_block_time,
-            'hash_rate': self.hash_rate
-        }
+        with self._lock:
+            uptime = time.time() - self.start_time if self.start_time else 0
+            return {
+                'uptime_seconds': uptime,
+                'uptime_human': _uptime_human(int(uptime)),
+                'blocks_received': self.blocks_received,
+                'blocks_mined': self.blocks_mined,
+                'transactions_received': self.transactions_received,
+                'transactions_relayed': self.transactions_relayed,
+                'peers_connected': self.peers_connected,
+                'peers_disconnected': self.peers_disconnected,
+                'total_connections': self.total_connections,
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'errors': self.errors,
+                'last_block_time': self.last_block_time,
+                'hash_rate': self.hash_rate
+            }
+
+    def to_json(self) -> bytes:
+        """
+        Encode the same snapshot as to_dict() straight to JSON bytes.
+
+        /stats is polled constantly, so this fills one string template
+        instead of building a dict for the JSON encoder to walk.
+        """
+        with self._lock:
+            uptime = time.time() - self.start_time if self.start_time else 0
+            return (_STATS_JSON % (
+                uptime, _uptime_human(int(uptime)), self.blocks_received,
+                self.blocks_mined, self.transactions_received, self.transactions_relayed,
+                self.peers_connected, self.peers_disconnected, self.total_connections,
+                self.bytes_sent, self.bytes_received, self.errors,
+                self.last_block_time, self.hash_rate
+            )).encode('ascii')
+
+
+# =============================================================================
+# Response Caching
+# =============================================================================
+
+class ResponseCache:
+    """
+    Encoded bodies of recent GET responses, kept for a short TTL.
+
+    Monitoring dashboards poll the same status endpoints every second or
+    so; within the TTL they get the stored bytes without the payload
+    being rebuilt or re-encoded. invalidate() drops everything when the
+    state behind the responses changes (new block, transaction, peer,
+    mining start/stop), so a TTL only bounds staleness of the counters.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+        self.epoch = 0
+
+    def get(self, key: str, ttl: float) -> Optional[bytes]:
+        """
+        Get a cached body if it is younger than ttl seconds.
+
+        Args:
+            key: Request path
+            ttl: Maximum age in seconds
+
+        Returns:
+            Encoded body, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    def put(self, key: str, body: bytes, epoch: int):
+        """
+        Store a body built while the cache was at the given epoch.
+
+        Bodies built before an invalidate() are dropped rather than
+        stored, so they cannot outlive the change that invalidated them.
+        """
+        with self._lock:
+            if epoch == self.epoch:
+                self._entries[key] = (time.monotonic(), body)
+
+    def invalidate(self):
+        """Drop every cached response."""
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
 
 
 # =============================================================================
 # Logging Setup
 # =============================================================================
 
+# Log records are handed to a queue and written by a listener thread, so
+# threads that log (P2P, mining, API) never wait on formatting or I/O
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
 def setup_logging(log_file: Optional[str] = None) -> logging.Logger:
-    """Setup logging configuration."""
+    """
+    Setup logging configuration.
+
+    The console and file handlers run on a background QueueListener; the
+    logger itself only gets a QueueHandler. Timestamps are formatted on
+    the listener thread. Calling this again replaces the previous setup.
+    """
+    global _log_listener, _log_queue_handler
+    stop_logging()
+
     logger = logging.getLogger('cpucoin-server')
     logger.setLevel(logging.INFO)
 
@@ -130,7 +266,7 @@ def setup_logging(log_file: Optional[str] = None) -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler (if specified)
     if log_file:
@@ -141,20 +277,132 @@ def setup_logging(log_file: Optional[str] = None) -> logging.Logger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    _log_queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(_log_queue_handler)
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
 
     return logger
 
 
+def stop_logging() -> None:
+    """Write out any queued log records and stop the listener thread."""
+    global _log_listener, _log_queue_handler
+    if _log_listener is None:
+        return
+    logging.getLogger('cpucoin-server').removeHandler(_log_queue_handler)
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = _log_queue_handler = None
+
+
+atexit.register(stop_logging)
+
+
 # =============================================================================
 # REST API Handler
 # =============================================================================
 
+class PooledHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that hands connections to a fixed-size worker pool.
+
+    Connections run in parallel, as with a thread per connection, but a
+    burst of clients queues up for a worker instead of spawning an
+    unbounded number of threads. While connections are queued, handlers
+    end keep-alive connections after the current response (see
+    has_queued()) so the workers go to the waiting clients.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, max_workers: int = 16):
+        super().__init__(server_address, handler_class)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                        thread_name_prefix='api-worker')
+        # Connections waiting for a worker: request socket -> its future
+        self._queued: Dict[Any, Future] = {}
+        self._queue_lock = threading.Lock()
+
+    def has_queued(self) -> bool:
+        """Check whether any connection is waiting for a worker."""
+        return bool(self._queued)
+
+    def process_request(self, request, client_address):
+        """Queue the connection for the next free worker."""
+        with self._queue_lock:
+            self._queued[request] = self._pool.submit(
+                self._process_queued, request, client_address)
+
+    def _process_queued(self, request, client_address):
+        """Worker entry point: the connection is no longer waiting."""
+        with self._queue_lock:
+            self._queued.pop(request, None)
+        self.process_request_thread(request, client_address)
+
+    def server_close(self):
+        """Close the listening socket and drop connections still queued."""
+        super().server_close()
+        with self._queue_lock:
+            queued, self._queued = self._queued, {}
+        # Cancelled one by one: shutdown(cancel_futures=True) needs 3.9+
+        for request, future in queued.items():
+            if future.cancel():
+                self.shutdown_request(request)
+        self._pool.shutdown(wait=False)
+
+
 class APIHandler(BaseHTTPRequestHandler):
     """HTTP request handler for REST API."""
 
     server_instance: 'CoinControlServer' = None
 
+    # Idle keep-alive connections are closed after this many seconds so
+    # they give their worker back to the pool
+    timeout = 5
+
+    # Keep-alive: monitoring clients poll several endpoints in a row over
+    # one connection, so every response must carry a Content-Length or
+    # be sent chunked
+    protocol_version = 'HTTP/1.1'
+
+    # Seconds a successful GET response may be served from the response
+    # cache, for the endpoints dashboards poll
+    CACHE_TTL = {
+        '/': 1.0,
+        '/status': 1.0,
+        '/stats': 1.0,
+        '/mining': 1.0,
+        '/peers': 1.0,
+        '/blockchain/info': 5.0,
+    }
+
+    # Streamed responses are sent in chunks of about this many bytes
+    STREAM_CHUNK_SIZE = 16 * 1024
+
+    # Error responses with fixed messages, encoded once; unknown paths
+    # (mostly scanners probing) are the most common requests to fail
+    _ERROR_BODIES = {
+        message: json_utils.dumps({'error': message}, indent=True)
+        for message in ('Not found', 'Block not found', 'Transaction rejected',
+                        'No wallet configured for mining', 'Host required')
+    }
+
+    # (cache key, cache epoch) of the response being built, if cacheable
+    _cache_slot: Optional[Tuple[str, int]] = None
+
+    def end_headers(self):
+        """Finish the headers, ending keep-alive if clients are waiting for a worker."""
+        has_queued = getattr(self.server, 'has_queued', None)
+        if not self.close_connection and has_queued is not None and has_queued():
+            self.send_header('Connection', 'close')
+        super().end_headers()
+
     def log_message(self, format, *args):
         """Override to use our logger."""
         if self.server_instance:
@@ -162,47 +410,113 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def _send_json(self, data: Dict[str, Any], status: int = 200):
         """Send JSON response."""
+        self._send_bytes(json_utils.dumps(data, indent=True), status)
+
+    def _send_bytes(self, body: bytes, status: int = 200):
+        """Send an already-encoded JSON response."""
+        if self._cache_slot is not None and status == 200:
+            key, epoch = self._cache_slot
+            self.server_instance.response_cache.put(key, body, epoch)
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        self.wfile.write(body)
+
+    def _send_json_stream(self, key: str, items: Iterable[Dict[str, Any]],
+                          fields: Optional[Dict[str, Any]] = None):
+        """
+        Send a JSON object holding a list, encoding the list as it goes.
+
+        The body is {**fields, key: [items...], "count": n}, sent with
+        chunked transfer encoding so the list is never built in full.
+        HTTP/1.0 clients cannot take chunked responses, so for them the
+        body is built first and sent with a Content-Length as usual.
+        Streamed responses are not cached.
+
+        Args:
+            key: Name of the list field
+            items: JSON-compatible dicts, consumed lazily
+            fields: Fields to send ahead of the list
+        """
+        chunked = self.request_version == 'HTTP/1.1'
+        if chunked:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+
+        head = json_utils.dumps(fields or {})[:-1]
+        buf = bytearray(head)
+        buf += b'%s"%s":[' % (b',' if len(head) > 1 else b'', key.encode('utf-8'))
+        count = 0
+        try:
+            for item in items:
+                if count:
+                    buf += b','
+                buf += json_utils.dumps(item)
+                count += 1
+                if chunked and len(buf) >= self.STREAM_CHUNK_SIZE:
+                    self._write_chunk(buf)
+                    buf.clear()
+        except Exception as e:
+            if not chunked:
+                raise
+            # The status line is already out; dropping the connection
+            # without the final chunk tells the client the body is cut short
+            self.server_instance.logger.error(f"API error while streaming: {e}")
+            self.close_connection = True
+            return
+        buf += b'],"count":%d}' % count
+        if not chunked:
+            self._send_bytes(bytes(buf))
+            return
+        self._write_chunk(buf)
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, data: bytes):
+        """Write one chunk of a chunked response body."""
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
 
     def _send_error(self, message: str, status: int = 400):
         """Send error response."""
-        self._send_json({'error': message}, status)
+        body = self._ERROR_BODIES.get(message)
+        if body is None:
+            body = json_utils.dumps({'error': message}, indent=True)
+        self._send_bytes(body, status)
 
     def do_GET(self):
         """Handle GET requests."""
+        self._cache_slot = None
         try:
             parsed = urlparse(self.path)
             path = parsed.path
-            query = parse_qs(parsed.query)
-
-            if path == '/' or path == '/status':
-                self._handle_status()
-            elif path == '/stats':
-                self._handle_stats()
-            elif path == '/blockchain':
-                self._handle_blockchain(query)
-            elif path == '/blockchain/info':
-                self._handle_blockchain_info()
-            elif path.startswith('/block/'):
-                self._handle_block(path.split('/')[-1])
-            elif path == '/peers':
-                self._handle_peers()
-            elif path == '/mempool':
-                self._handle_mempool()
-            elif path == '/coins':
-                self._handle_coins(query)
-            elif path.startswith('/balance/'):
-                self._handle_balance(path.split('/')[-1])
-            elif path == '/health':
-                self._handle_health()
-            elif path == '/mining':
-                self._handle_mining_status()
-            else:
-                self._send_error('Not found', 404)
+
+            ttl = self.CACHE_TTL.get(path)
+            if ttl is not None:
+                cache = self.server_instance.response_cache
+                epoch = cache.epoch
+                # Keyed on the path alone: the cached endpoints ignore the
+                # query, and distinct query strings must not grow the cache
+                body = cache.get(path, ttl)
+                if body is not None:
+                    self._send_bytes(body)
+                    return
+                self._cache_slot = (path, epoch)
+
+            route = self._GET_ROUTES.get(path)
+            if route is not None:
+                route(self, parse_qs(parsed.query))
+                return
+
+            for prefix, route in self._GET_PREFIX_ROUTES:
+                if path.startswith(prefix):
+                    route(self, path.rpartition('/')[2])
+                    return
+
+            self._send_error('Not found', 404)
 
         except Exception as e:
             self.server_instance.logger.error(f"API error: {e}")
@@ -210,31 +524,27 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def do_POST(self):
         """Handle POST requests."""
+        self._cache_slot = None
         try:
             parsed = urlparse(self.path)
             path = parsed.path
 
             # Read body
             content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode() if content_length > 0 else '{}'
-            data = json.loads(body) if body else {}
-
-            if path == '/transaction':
-                self._handle_submit_transaction(data)
-            elif path == '/mining/start':
-                self._handle_mining_start()
-            elif path == '/mining/stop':
-                self._handle_mining_stop()
-            elif path == '/peer/connect':
-                self._handle_peer_connect(data)
-            elif path == '/backup':
-                self._handle_backup()
+            data = json_utils.loads(self.rfile.read(content_length)) if content_length > 0 else {}
+
+            route = self._POST_ROUTES.get(path)
+            if route is not None:
+                route(self, data)
             else:
                 self._send_error('Not found', 404)
 
         except Exception as e:
             self.server_instance.logger.error(f"API error: {e}")
             self._send_error(str(e), 500)
+        finally:
+            # Every POST may change what the status endpoints report
+            self.server_instance.response_cache.invalidate()
 
     def _handle_status(self):
         """Return server status."""
@@ -253,7 +563,7 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def _handle_stats(self):
         """Return detailed statistics."""
-        self._send_json(self.server_instance.stats.to_dict())
+        self._send_bytes(self.server_instance.stats.to_json())
 
     def _handle_blockchain_info(self):
         """Return blockchain information."""
@@ -273,20 +583,9 @@ class APIHandler(BaseHTTPRequestHandler):
         limit = min(int(query.get('limit', [10])[0]), 100)
         bc = self.server_instance.blockchain
 
-        blocks = []
-        for block in bc.chain[start:start + limit]:
-            blocks.append({
-                'index': block.index,
-                'hash': block.hash,
-                'previous_hash': block.previous_hash,
-                'timestamp': block.timestamp,
-                'transactions': len(block.transactions),
-                'miner': block.miner,
-                'nonce': block.nonce
-            })
+        blocks = (block.to_api_dict() for block in bc.chain[start:start + limit])
 
-        self._send_json({
-            'blocks': blocks,
+        self._send_json_stream('blocks', blocks, {
             'total': len(bc.chain),
             'start': start,
             'limit': limit
@@ -302,11 +601,7 @@ class APIHandler(BaseHTTPRequestHandler):
             if 0 <= index < len(bc.chain):
                 block = bc.chain[index]
         else:
-            # Search by hash
-            for b in bc.chain:
-                if b.hash == identifier:
-                    block = b
-                    break
+            block = bc.get_block_by_hash(identifier)
 
         if block:
             self._send_json(block.to_dict())
@@ -315,47 +610,31 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def _handle_peers(self):
         """Return connected peers."""
-        peers = []
-        for addr, peer in self.server_instance.node.peers.items():
-            peers.append({
-                'address': addr,
-                'host': peer.host,
-                'port': peer.port,
-                'version': peer.version,
-                'height': peer.height,
-                'last_seen': peer.last_seen
-            })
+        # list() snapshots the dict, which the P2P threads keep updating
+        peers = [peer.to_api_dict() for peer in list(self.server_instance.node.peers.values())]
         self._send_json({'peers': peers, 'count': len(peers)})
 
     def _handle_mempool(self):
         """Return pending transactions."""
-        txs = []
-        for tx in self.server_instance.tx_pool.transactions:
-            txs.append({
-                'txid': tx.txid,
-                'type': tx.tx_type,
-                'fee': tx.fee,
-                'timestamp': tx.timestamp
-            })
+        txs = [tx.to_api_dict() for tx in list(self.server_instance.tx_pool.pending.values())]
         self._send_json({'transactions': txs, 'count': len(txs)})
 
     def _handle_coins(self, query: Dict):
-        """Return coin information."""
+        """Return coin information (`owner` filters by owner public key)."""
         owner = query.get('owner', [None])[0]
         limit = min(int(query.get('limit', [100])[0]), 1000)
 
-        coins = []
-        for coin in self.server_instance.coin_store.list_coins()[:limit]:
-            if owner is None or coin.owner_address == owner:
-                coins.append({
-                    'coin_id': coin.coin_id,
-                    'value': coin.value,
-                    'owner': coin.owner_address,
-                    'is_spent': coin.is_spent,
-                    'block_height': coin.block_height
-                })
+        # The store filters and limits through its index, so only the
+        # returned coins are read from disk
+        coins = ({
+            'coin_id': coin.coin_id,
+            'value': coin.value,
+            'owner': coin.owner,
+            'is_spent': coin.is_spent,
+            'block_height': coin.data.block_height
+        } for coin in self.server_instance.coin_store.iter_coins(owner, limit=limit))
 
-        self._send_json({'coins': coins, 'count': len(coins)})
+        self._send_json_stream('coins', coins)
 
     def _handle_balance(self, address: str):
         """Return balance for address."""
@@ -368,20 +647,8 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def _handle_health(self):
         """Health check endpoint."""
-        server = self.server_instance
-        healthy = (
-            server.is_running and
-            server.blockchain.height >= 0 and
-            (time.time() - server.stats.start_time) > 10
-        )
-        self._send_json({
-            'healthy': healthy,
-            'checks': {
-                'server_running': server.is_running,
-                'blockchain_valid': server.blockchain.height >= 0,
-                'node_active': server.node.is_running
-            }
-        }, 200 if healthy else 503)
+        health = self.server_instance.health_snapshot()
+        self._send_json(health, 200 if health['healthy'] else 503)
 
     def _handle_mining_status(self):
         """Return mining status."""
@@ -432,9 +699,39 @@ class APIHandler(BaseHTTPRequestHandler):
 
     def _handle_backup(self):
         """Trigger manual backup."""
-        self.server_instance.save_state()
+        self.server_instance.save_state(full=True)
         self._send_json({'success': True, 'message': 'Backup complete'})
 
+    # Route tables, built once with the class. Exact paths are a single
+    # dict lookup; GET routes are called with the parsed query string,
+    # POST routes with the decoded request body
+    _GET_ROUTES = {
+        '/': lambda self, query: self._handle_status(),
+        '/status': lambda self, query: self._handle_status(),
+        '/stats': lambda self, query: self._handle_stats(),
+        '/blockchain': lambda self, query: self._handle_blockchain(query),
+        '/blockchain/info': lambda self, query: self._handle_blockchain_info(),
+        '/peers': lambda self, query: self._handle_peers(),
+        '/mempool': lambda self, query: self._handle_mempool(),
+        '/coins': lambda self, query: self._handle_coins(query),
+        '/health': lambda self, query: self._handle_health(),
+        '/mining': lambda self, query: self._handle_mining_status(),
+    }
+
+    # Paths ending in an identifier; called with the last path segment
+    _GET_PREFIX_ROUTES = (
+        ('/block/', _handle_block),
+        ('/balance/', _handle_balance),
+    )
+
+    _POST_ROUTES = {
+        '/transaction': lambda self, data: self._handle_submit_transaction(data),
+        '/mining/start': lambda self, data: self._handle_mining_start(),
+        '/mining/stop': lambda self, data: self._handle_mining_stop(),
+        '/peer/connect': lambda self, data: self._handle_peer_connect(data),
+        '/backup': lambda self, data: self._handle_backup(),
+    }
+
 
 # =============================================================================
 # Main Server Class
@@ -474,8 +771,10 @@ class CoinControlServer:
         self.coin_store = CoinStore(str(self.data_dir / 'coins'))
         self.tx_pool = TransactionPool()
         self.stats = ServerStats()
+        self.response_cache = ResponseCache()
 
-        # Load existing state
+        # Load existing state (may save again to repair the journal)
+        self._save_lock = threading.Lock()
         self._load_state()
 
         # Initialize P2P node
@@ -498,13 +797,17 @@ class CoinControlServer:
         self._mining_thread: Optional[threading.Thread] = None
 
         # API server
-        self.api_server: Optional[HTTPServer] = None
+        self.api_server: Optional[PooledHTTPServer] = None
         self._api_thread: Optional[threading.Thread] = None
 
         # Background threads
         self._threads: List[threading.Thread] = []
         self._lock = threading.Lock()
 
+        # Result of the health monitor's last full chain validation; the
+        # /health endpoint reports it instead of validating per request
+        self._last_validation_ok = True
+
         self.logger.info(f"Data directory: {self.data_dir}")
         self.logger.info(f"Blockchain height: {self.blockchain.height}")
 
@@ -515,25 +818,46 @@ class CoinControlServer:
             try:
                 self.blockchain = Blockchain.load(str(blockchain_file))
                 self.logger.info(f"Loaded blockchain with {len(self.blockchain.chain)} blocks")
+                if self.blockchain.journal_torn:
+                    # Fold the surviving journal records into a fresh
+                    # snapshot before anything is appended again
+                    self.logger.warning("Blockchain journal had a torn record; rewriting snapshot")
+                    self.save_state(full=True)
             except Exception as e:
                 self.logger.error(f"Failed to load blockchain: {e}")
                 self.blockchain = Blockchain()
 
-    def save_state(self):
-        """Save current state to disk."""
+    def save_state(self, full: bool = False):
+        """
+        Save current state to disk.
+
+        By default only the blocks added since the last save are appended
+        to the blockchain journal (see Blockchain.save_incremental()), so
+        saving after every block does not rewrite the whole chain.
+
+        Args:
+            full: Rewrite the complete snapshot and fold the journal into it
+                (used for periodic backups and on shutdown)
+        """
         try:
-            blockchain_file = self.data_dir / 'blockchain.json'
-            self.blockchain.save(str(blockchain_file))
+            blockchain_file = str(self.data_dir / 'blockchain.json')
+            # Blocks arrive from the P2P and mining threads at once; one
+            # writer at a time keeps journal entries whole and in order
+            with self._save_lock:
+                if full:
+                    self.blockchain.save(blockchain_file)
+                else:
+                    self.blockchain.save_incremental(blockchain_file)
             self.logger.debug("State saved successfully")
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
-            self.stats.errors += 1
+            self.stats.incr('errors')
 
     def start(self):
         """Start the server."""
         self.logger.info("Starting server...")
         self.is_running = True
-        self.stats.start_time = time.time()
+        self.stats.update(start_time=time.time())
 
         # Start P2P node
         self.node.start()
@@ -577,18 +901,22 @@ class CoinControlServer:
         # Stop API server
         if self.api_server:
             self.api_server.shutdown()
+            self.api_server.server_close()
 
         # Save state
-        self.save_state()
+        self.save_state(full=True)
 
         self.logger.info("Server stopped")
 
     def _start_api_server(self):
         """Start the REST API server."""
         APIHandler.server_instance = self
-        self.api_server = HTTPServer(
+        # Connections are served in parallel by a bounded worker pool, so
+        # one slow or idle keep-alive client does not hold up the others
+        self.api_server = PooledHTTPServer(
             (self.config.host, self.config.api_port),
-            APIHandler
+            APIHandler,
+            max_workers=self.config.api_workers
         )
         self._api_thread = threading.Thread(
             target=self.api_server.serve_forever,
@@ -631,7 +959,7 @@ class CoinControlServer:
         while self.is_running:
             time.sleep(self.config.stats_interval)
             try:
-                self.stats.peers_connected = len(self.node.peers)
+                self.stats.update(peers_connected=len(self.node.peers))
                 self.logger.debug(
                     f"Stats: height={self.blockchain.height}, "
                     f"peers={len(self.node.peers)}, "
@@ -645,7 +973,7 @@ class CoinControlServer:
         while self.is_running:
             time.sleep(self.config.backup_interval)
             try:
-                self.save_state()
+                self.save_state(full=True)
             except Exception as e:
                 self.logger.error(f"Backup error: {e}")
 
@@ -655,9 +983,12 @@ class CoinControlServer:
             time.sleep(30)
             try:
                 # Check blockchain validity
-                if not self.blockchain.validate_chain():
+                valid = self.blockchain.validate_chain()
+                with self._lock:
+                    self._last_validation_ok = valid
+                if not valid:
                     self.logger.error("Blockchain validation failed!")
-                    self.stats.errors += 1
+                    self.stats.incr('errors')
 
                 # Check for stale blocks (no new block in 10 minutes)
                 if self.stats.last_block_time > 0:
@@ -670,6 +1001,30 @@ class CoinControlServer:
             except Exception as e:
                 self.logger.error(f"Health check error: {e}")
 
+    def health_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the server health as reported by /health.
+
+        Only reads flags and cached results; the chain itself is
+        validated by the health monitor thread, never here.
+
+        Returns:
+            Dict with the overall 'healthy' flag and individual 'checks'
+        """
+        with self._lock:
+            chain_valid = self._last_validation_ok
+        checks = {
+            'server_running': self.is_running,
+            'blockchain_valid': chain_valid and self.blockchain.height >= 0,
+            'node_active': self.node.is_running
+        }
+        healthy = (
+            checks['server_running'] and
+            checks['blockchain_valid'] and
+            (time.time() - self.stats.start_time) > 10
+        )
+        return {'healthy': healthy, 'checks': checks}
+
     def _load_wallet(self):
         """Load the configured wallet."""
         if not self.config.wallet_name:
@@ -718,41 +1073,61 @@ class CoinControlServer:
 
     def _mining_loop(self):
         """Mining loop."""
+        # Each mine_share() call runs the batched nonce kernel
+        # (crypto_utils.scan_nonces) on the miner's worker pool, so this
+        # loop only wakes up once per share found
         self.miner = MultiThreadedMiner(
-            blockchain=self.blockchain,
             wallet=self.wallet,
-            coin_store=self.coin_store,
+            blockchain=self.blockchain,
+            coin_dir=self.coin_store.coin_dir,
             num_threads=self.config.mining_threads
         )
 
-        while self.mining_active and self.is_running:
-            try:
-                result = self.miner.mine_block()
-                if result and result.block:
-                    self.stats.blocks_mined += 1
-                    self.stats.last_block_time = time.time()
-                    self.stats.hash_rate = result.hash_rate
+        try:
+            while self.mining_active and self.is_running:
+                try:
+                    result = self.miner.mine_share(verbose=False)
+                    if not result.success:
+                        continue
+                    self.stats.update(hash_rate=result.hash_rate)
+                    if not result.is_block_find:
+                        continue
+
+                    block = self.blockchain.get_block_by_hash(result.hash_value)
+                    if block is None:
+                        self.logger.warning(
+                            f"Found block hash {result.hash_value[:16]}... "
+                            f"but the block was not added to the chain"
+                        )
+                        continue
+
+                    self.stats.incr('blocks_mined')
+                    self.stats.update(last_block_time=time.time())
+                    self.response_cache.invalidate()
 
                     self.logger.info(
-                        f"Mined block #{result.block.index} "
+                        f"Mined block #{block.index} "
                         f"({result.hash_rate:.2f} H/s)"
                     )
 
                     # Broadcast to network
-                    self.node.broadcast_block(result.block)
+                    self.node.broadcast_block(block)
 
                     # Save state
                     self.save_state()
 
-            except Exception as e:
-                self.logger.error(f"Mining error: {e}")
-                self.stats.errors += 1
-                time.sleep(5)
+                except Exception as e:
+                    self.logger.error(f"Mining error: {e}")
+                    self.stats.incr('errors')
+                    time.sleep(5)
+        finally:
+            self.miner.close()
 
     def _on_block_received(self, block: Block):
         """Handle received block."""
-        self.stats.blocks_received += 1
-        self.stats.last_block_time = time.time()
+        self.stats.incr('blocks_received')
+        self.stats.update(last_block_time=time.time())
+        self.response_cache.invalidate()
         self.logger.info(f"Received block #{block.index} from network")
 
         # Relay to other peers
@@ -763,16 +1138,18 @@ class CoinControlServer:
 
     def _on_tx_received(self, tx: Transaction):
         """Handle received transaction."""
-        self.stats.transactions_received += 1
+        self.stats.incr('transactions_received')
+        self.response_cache.invalidate()
         self.logger.debug(f"Received transaction {tx.txid[:16]}...")
 
         # Relay to other peers
         self.node.broadcast_transaction(tx)
-        self.stats.transactions_relayed += 1
+        self.stats.incr('transactions_relayed')
 
     def _on_peer_connected(self, peer: Peer):
         """Handle new peer connection."""
-        self.stats.total_connections += 1
+        self.stats.incr('total_connections')
+        self.response_cache.invalidate()
         self.logger.info(f"Peer connected: {peer.address} (height={peer.height})")
 
     def run_forever(self):
@@ -855,6 +1232,8 @@ API Endpoints:
                         help='Log file path')
     parser.add_argument('--no-api', action='store_true',
                         help='Disable REST API')
+    parser.add_argument('--api-workers', type=int, default=16,
+                        help='REST API worker threads (default: 16)')
     parser.add_argument('--seed', action='append', dest='seeds',
                         help='Seed node (host:port), can be specified multiple times')
 
@@ -870,6 +1249,7 @@ API Endpoints:
         enable_mining=args.mine,
         mining_threads=args.threads,
         enable_api=not args.no_api,
+        api_workers=args.api_workers,
         log_file=args.log_file,
         seed_nodes=args.seeds or []
     )
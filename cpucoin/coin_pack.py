@@ -0,0 +1,217 @@
+"""
+CPUCoin coin packs
+
+A coin pack bundles many coins into one file, for backing up or handing
+over a batch of coins without creating (or copying) a file per coin.
+
+Layout:
+- Header: magic b"CPCK" + format version (1 byte)
+- Records, back to back: payload length (uint32 LE), coin ID length
+  (uint8), coin ID (ASCII), then the coin data (payload): binary (see
+  coin_binary) in version 2 packs, or JSON for coins the binary format
+  cannot hold exactly and in version 1 packs
+
+The coin ID sits in front of each record so the pack can be indexed by
+reading only the record headers. Packs are read through a read-only
+memory map: payloads are parsed straight out of the mapping (orjson
+accepts a memoryview) instead of being copied into bytes first.
+"""
+
+import mmap
+import struct
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from . import coin_binary, json_utils
+from .coin import Coin, CoinData
+
+PACK_MAGIC = b"CPCK"
+PACK_VERSION = 2
+
+# Versions this module can read (payload formats are told apart per record)
+_READABLE_VERSIONS = (1, 2)
+
+_HEADER = struct.Struct("<4sB")
+_RECORD = struct.Struct("<IB")
+
+# madvise() hints are not available on every platform
+_MADV_RANDOM = getattr(mmap, 'MADV_RANDOM', None)
+_MADV_SEQUENTIAL = getattr(mmap, 'MADV_SEQUENTIAL', None)
+
+
+def _encode_payload(data: CoinData) -> bytes:
+    """Encode coin data for a pack record, in binary where it is exact."""
+    try:
+        return coin_binary.encode(data)
+    except ValueError:
+        return json_utils.dumps(data.to_dict())
+
+
+def _decode_payload(payload: memoryview) -> CoinData:
+    """Decode a pack record payload of either format."""
+    if coin_binary.is_binary(payload):
+        return coin_binary.decode(payload)
+    return CoinData.from_dict(json_utils.loads(payload))
+
+
+def _encode_records(coins: Iterable[Coin]) -> Tuple[bytes, int]:
+    """Serialize coins to pack records; returns (bytes, number of coins)."""
+    parts = []
+    count = 0
+    for coin in coins:
+        coin_id = coin.coin_id.encode('ascii')
+        payload = _encode_payload(coin.data)
+        parts.append(_RECORD.pack(len(payload), len(coin_id)))
+        parts.append(coin_id)
+        parts.append(payload)
+        count += 1
+    return b"".join(parts), count
+
+
+class CoinPack:
+    """
+    A file holding many coins.
+
+    Usage:
+        CoinPack.write("backup.coinpack", store.list_coins())
+        pack = CoinPack("backup.coinpack")
+        coin = pack.load(coin_id)
+    """
+
+    EXTENSION = ".coinpack"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+        self._map: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> 'CoinPack':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the pack file (it is mapped again on next use)."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _mapped(self, advice: Optional[int] = None) -> mmap.mmap:
+        """
+        Get the read-only mapping of the pack file.
+
+        Args:
+            advice: madvise() hint for the coming access pattern, where
+                the platform supports it (e.g. mmap.MADV_RANDOM)
+        """
+        if self._map is None:
+            with open(self.path, 'rb') as f:
+                try:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raise ValueError(f"Not a coin pack: {self.path}") from None
+        if advice is not None:
+            self._map.madvise(advice)
+        return self._map
+
+    @classmethod
+    def write(cls, path: str, coins: Iterable[Coin]) -> int:
+        """
+        Create (or replace) a pack holding the given coins.
+
+        Args:
+            path: Pack file path
+            coins: Coins to store
+
+        Returns:
+            Number of coins written
+        """
+        records, count = _encode_records(coins)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION) + records)
+        return count
+
+    def append(self, coins: Iterable[Coin]) -> int:
+        """
+        Add coins to the end of the pack, creating it if needed.
+
+        Args:
+            coins: Coins to store
+
+        Returns:
+            Number of coins written
+        """
+        records, count = _encode_records(coins)
+        self.close()
+        with open(self.path, 'ab') as f:
+            if f.tell() == 0:
+                records = _HEADER.pack(PACK_MAGIC, PACK_VERSION) + records
+            f.write(records)
+        self._index = None
+        return count
+
+    def _records(self, mapped: mmap.mmap) -> Iterator[Tuple[str, int, int]]:
+        """
+        Walk the record headers of the mapped pack.
+
+        Yields (coin_id, payload offset, payload length). A record cut
+        short (e.g. by a crash mid-append) ends the walk.
+        """
+        size = len(mapped)
+        if size < _HEADER.size:
+            raise ValueError(f"Not a coin pack: {self.path}")
+        magic, version = _HEADER.unpack_from(mapped)
+        if magic != PACK_MAGIC or version not in _READABLE_VERSIONS:
+            raise ValueError(f"Not a coin pack: {self.path}")
+
+        pos = _HEADER.size
+        while pos + _RECORD.size <= size:
+            length, id_length = _RECORD.unpack_from(mapped, pos)
+            pos += _RECORD.size
+            coin_id = mapped[pos:pos + id_length].decode('ascii')
+            pos += id_length
+            if pos + length > size:
+                return
+            yield coin_id, pos, length
+            pos += length
+
+    def index(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Get the position of every coin in the pack.
+
+        Returns:
+            Dict mapping coin ID to (payload offset, payload length)
+        """
+        if self._index is None:
+            self._index = {coin_id: (offset, length)
+                           for coin_id, offset, length in self._records(self._mapped())}
+        return self._index
+
+    def load(self, coin_id: str) -> Optional[Coin]:
+        """
+        Load a single coin from the pack.
+
+        Args:
+            coin_id: ID of the coin
+
+        Returns:
+            The Coin (with no filepath), or None if it is not in the pack
+        """
+        entry = self.index().get(coin_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        with memoryview(self._mapped(_MADV_RANDOM)) as view:
+            data = _decode_payload(view[offset:offset + length])
+        return Coin(data)
+
+    def __iter__(self) -> Iterator[Coin]:
+        """Iterate over the coins in pack order."""
+        mapped = self._mapped(_MADV_SEQUENTIAL)
+        for _, offset, length in self._records(mapped):
+            with memoryview(mapped) as view:
+                data = _decode_payload(view[offset:offset + length])
+            yield Coin(data)
+
+    def __len__(self) -> int:
+        return len(self.index())
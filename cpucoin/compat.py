@@ -0,0 +1,9 @@
+"""
+Compatibility helpers for the range of Python versions CPUCoin supports
+"""
+
+import sys
+
+# Keyword arguments for @dataclass that give the class __slots__ where the
+# running Python supports it (3.10+); older versions fall back to __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -47,6 +47,10 @@ ARGON2_MEMORY_COST = 65536  # Memory usage in KB (64MB) - makes GPU mining ineff
 ARGON2_PARALLELISM = 4  # Number of parallel threads
 ARGON2_HASH_LEN = 32  # Output hash length
 
+# Nonces scanned per call to the mining kernel before the caller regains
+# control (progress output, stop requests)
+MINING_BATCH_SIZE = 100
+
 # =============================================================================
 # BLOCK CONFIGURATION
 # =============================================================================
@@ -3,12 +3,17 @@ Cryptographic utilities for CPUCoin
 Uses Argon2 for CPU-friendly proof-of-work (with fallback to scrypt)
 """
 
+import os
 import hashlib
-from typing import Union
+import binascii
+import functools
+import threading
+from typing import Iterable, List, Optional, Tuple, Union
 
 # Try to import argon2, fallback to scrypt if not available
 try:
     import argon2
+    from argon2.low_level import hash_secret_raw
     ARGON2_AVAILABLE = True
 except ImportError:
     ARGON2_AVAILABLE = False
@@ -23,6 +28,17 @@ def sha256(data: Union[str, bytes]) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+@functools.lru_cache(maxsize=4096)
+def sha256_cached(data: str) -> str:
+    """
+    Memoized sha256() for strings that are hashed over and over.
+
+    Meant for derived IDs of immutable data (genesis txid, canonical
+    transaction JSON), e.g. when blocks are reconstructed from disk.
+    """
+    return sha256(data)
+
+
 def double_sha256(data: Union[str, bytes]) -> str:
     """Compute double SHA-256 hash (like Bitcoin)."""
     if isinstance(data, str):
@@ -31,6 +47,123 @@ def double_sha256(data: Union[str, bytes]) -> str:
     return hashlib.sha256(first_hash).hexdigest()
 
 
+def batch_double_sha256(items: Iterable[Union[str, bytes]]) -> List[str]:
+    """
+    Compute double_sha256() over many inputs.
+
+    Equivalent to [double_sha256(x) for x in items], with the hashlib
+    lookups hoisted out of the loop.
+
+    Args:
+        items: Strings (UTF-8 encoded) or bytes to hash
+
+    Returns:
+        Hex digests, in input order
+    """
+    sha = hashlib.sha256
+    return [
+        sha(sha(item.encode('utf-8') if isinstance(item, str) else item).digest()).hexdigest()
+        for item in items
+    ]
+
+
+def mining_salt(salt: str) -> bytes:
+    """
+    Derive the fixed-size salt bytes used by the memory-hard hash.
+
+    Args:
+        salt: Salt string (previous block hash, or "genesis")
+
+    Returns:
+        16-byte salt, truncated or zero-padded as required
+    """
+    return salt.encode('utf-8')[:16].ljust(16, b'\x00')
+
+
+# The memory-hard parameters never change at runtime, so bind them once;
+# the mining loop then only passes the per-attempt data and salt
+_scrypt = functools.partial(
+    hashlib.scrypt,
+    n=16384,  # CPU/memory cost parameter
+    r=8,      # Block size parameter
+    p=1,      # Parallelization parameter
+    dklen=32  # Output length
+)
+
+if ARGON2_AVAILABLE:
+    _argon2id = functools.partial(
+        hash_secret_raw,
+        time_cost=config.ARGON2_TIME_COST,
+        memory_cost=config.ARGON2_MEMORY_COST,
+        parallelism=config.ARGON2_PARALLELISM,
+        hash_len=config.ARGON2_HASH_LEN,
+        type=argon2.Type.ID  # Argon2id - hybrid of Argon2i and Argon2d
+    )
+
+
+def _scrypt_raw(data: bytes, salt_bytes: bytes) -> bytes:
+    """
+    Run the scrypt fallback over raw bytes.
+
+    Args:
+        data: The data to hash
+        salt_bytes: 16-byte salt from mining_salt()
+
+    Returns:
+        Raw hash bytes
+    """
+    # scrypt is also CPU-friendly and memory-hard, good alternative to Argon2
+    # n=2^14 (16384), r=8, p=1 - uses ~16MB memory
+    return _scrypt(data, salt=salt_bytes)
+
+
+def _argon2_raw(data: bytes, salt_bytes: bytes) -> bytes:
+    """
+    Run Argon2id over raw bytes, falling back to scrypt on failure.
+
+    Args:
+        data: The data to hash
+        salt_bytes: 16-byte salt from mining_salt()
+
+    Returns:
+        Raw hash bytes
+    """
+    # Call the raw Argon2id primitive directly: the PasswordHasher API
+    # would encode the result as a PHC string only for us to decode it
+    try:
+        return _argon2id(data, salt_bytes)
+    except Exception:
+        return _scrypt_raw(data, salt_bytes)
+
+
+# Pick the memory-hard backend once at import time rather than testing
+# ARGON2_AVAILABLE on every hash; _memory_hard_raw(data, salt_bytes) is
+# what the mining kernel calls
+if ARGON2_AVAILABLE:
+    _memory_hard_raw = _argon2_raw
+    MEMORY_HARD_BACKEND = "argon2id"
+else:
+    _memory_hard_raw = _scrypt_raw
+    MEMORY_HARD_BACKEND = "scrypt"
+
+
+def default_mining_workers() -> int:
+    """
+    Get the default number of concurrent mining workers for this machine.
+
+    Argon2id already spreads each hash over ARGON2_PARALLELISM lanes, so
+    running one worker per core would oversubscribe the CPU; scrypt
+    (p=1) is single-threaded per hash.
+
+    Returns:
+        Number of workers (at least 1)
+    """
+    cpus = os.cpu_count() or 1
+    if MEMORY_HARD_BACKEND == "argon2id":
+        return max(1, cpus // config.ARGON2_PARALLELISM)
+    return cpus
+
+
 def argon2_hash(data: str, salt: str) -> str:
     """
     Compute Argon2id hash - CPU-friendly, memory-hard hash function.
@@ -49,54 +182,7 @@ def argon2_hash(data: str, salt: str) -> str:
     Returns:
         Hexadecimal hash string
     """
-    if ARGON2_AVAILABLE:
-        try:
-            hasher = argon2.PasswordHasher(
-                time_cost=config.ARGON2_TIME_COST,
-                memory_cost=config.ARGON2_MEMORY_COST,
-                parallelism=config.ARGON2_PARALLELISM,
-                hash_len=config.ARGON2_HASH_LEN,
-                type=argon2.Type.ID  # Argon2id - hybrid of Argon2i and Argon2d
-            )
-
-            # Argon2 returns a formatted string, we extract just the hash
-            salt_bytes = salt.encode('utf-8')[:16].ljust(16, b'\x00')
-            full_hash = hasher.hash(data, salt=salt_bytes)
-            # Extract the base64-encoded hash from the Argon2 format
-            hash_part = full_hash.split('$')[-1]
-            # Convert to hex for consistency
-            import base64
-            hash_bytes = base64.b64decode(hash_part + '==')
-            return hash_bytes.hex()
-        except Exception:
-            # Fallback to raw Argon2
-            try:
-                raw_hash = argon2.low_level.hash_secret_raw(
-                    data.encode('utf-8'),
-                    salt.encode('utf-8')[:16].ljust(16, b'\x00'),
-                    time_cost=config.ARGON2_TIME_COST,
-                    memory_cost=config.ARGON2_MEMORY_COST,
-                    parallelism=config.ARGON2_PARALLELISM,
-                    hash_len=config.ARGON2_HASH_LEN,
-                    type=argon2.Type.ID
-                )
-                return raw_hash.hex()
-            except Exception:
-                pass
-
-    # Fallback: Use scrypt (memory-hard, available in Python stdlib)
-    # scrypt is also CPU-friendly and memory-hard, good alternative to Argon2
-    salt_bytes = salt.encode('utf-8')[:16].ljust(16, b'\x00')
-    # n=2^14 (16384), r=8, p=1 - uses ~16MB memory
-    scrypt_hash = hashlib.scrypt(
-        data.encode('utf-8'),
-        salt=salt_bytes,
-        n=16384,  # CPU/memory cost parameter
-        r=8,      # Block size parameter
-        p=1,      # Parallelization parameter
-        dklen=32  # Output length
-    )
-    return scrypt_hash.hex()
+    return _memory_hard_raw(data.encode('utf-8'), mining_salt(salt)).hex()
 
 
 def mining_hash(block_header: str, nonce: int, prev_hash: str) -> str:
@@ -124,6 +210,106 @@ def mining_hash(block_header: str, nonce: int, prev_hash: str) -> str:
     return sha256(memory_hard_result)
 
 
+def mining_digest(header: bytes, nonce: int, salt: bytes) -> bytes:
+    """
+    Compute the raw mining hash digest from a pre-encoded header template.
+
+    Args:
+        header: Encoded block header (from Block.compute_header())
+        nonce: Mining nonce to try
+        salt: Salt bytes from mining_salt(prev_hash or "genesis")
+
+    Returns:
+        32-byte digest; its hex form is the mining hash
+    """
+    memory_hard_result = _memory_hard_raw(header + b"%d" % nonce, salt)
+    return hashlib.sha256(binascii.hexlify(memory_hard_result)).digest()
+
+
+def mining_hash_fast(header: bytes, nonce: int, salt: bytes) -> str:
+    """
+    Compute the mining hash from a pre-encoded header template.
+
+    Produces exactly the same result as mining_hash(), but skips the
+    per-attempt string formatting and UTF-8 encoding so it can be called
+    in a tight nonce loop.
+
+    Args:
+        header: Encoded block header (from Block.compute_header())
+        nonce: Mining nonce to try
+        salt: Salt bytes from mining_salt(prev_hash or "genesis")
+
+    Returns:
+        Final hash for difficulty comparison
+    """
+    return mining_digest(header, nonce, salt).hex()
+
+
+def scan_nonces(header: bytes, salt: bytes, start: int, count: int,
+                difficulty: int, stride: int = 1,
+                stop_event: Optional[threading.Event] = None) -> Optional[Tuple[int, str]]:
+    """
+    Scan a range of nonces for one meeting the difficulty.
+
+    This is the mining kernel: the whole nonce loop runs here with every
+    lookup bound to a local, so callers only pay for Python-level
+    bookkeeping once per batch rather than once per hash. Digests are
+    compared as integers; only a hit is converted to hex.
+
+    Args:
+        header: Encoded block header
+        salt: Salt bytes from mining_salt()
+        start: First nonce to try
+        count: Number of nonces to try
+        difficulty: Required number of leading zero bits
+        stride: Step between nonces (for interleaving workers)
+        stop_event: Checked before every hash; once set, the scan gives
+            up. Lets a worker that found a hit stop its siblings within
+            one memory-hard hash instead of one batch.
+
+    Returns:
+        Tuple of (nonce, hash) for the first hit, or None if none found
+        (or the scan was stopped)
+    """
+    memory_hard = _memory_hard_raw
+    sha = hashlib.sha256
+    hexlify = binascii.hexlify
+    from_bytes = int.from_bytes
+    limit = difficulty_limit(difficulty)
+    stopped = stop_event.is_set if stop_event is not None else None
+
+    nonce = start
+    for _ in range(count):
+        if stopped is not None and stopped():
+            return None
+        # The final SHA-256 runs over the hex text of the memory-hard
+        # result; hexlify() yields those ASCII bytes in one step
+        digest = sha(hexlify(memory_hard(header + b"%d" % nonce, salt))).digest()
+        if from_bytes(digest, 'big') < limit:
+            return nonce, digest.hex()
+        nonce += stride
+
+    return None
+
+
+def difficulty_limit(difficulty: int) -> int:
+    """
+    Get the exclusive upper bound a 256-bit hash must be below.
+
+    A hash has at least `difficulty` leading zero bits exactly when its
+    integer value is below 2^(256 - difficulty).
+
+    Args:
+        difficulty: Required number of leading zero bits
+
+    Returns:
+        Integer limit (0 if the difficulty can never be met)
+    """
+    if difficulty > 256:
+        return 0
+    return 1 << (256 - difficulty)
+
+
 def check_difficulty(hash_hex: str, difficulty: int) -> bool:
     """
     Check if a hash meets the difficulty requirement.
@@ -137,17 +323,37 @@ def check_difficulty(hash_hex: str, difficulty: int) -> bool:
     Returns:
         True if hash meets difficulty, False otherwise
     """
-    # Convert hex to binary and check leading zeros
-    hash_int = int(hash_hex, 16)
-    hash_bits = 256  # SHA-256 produces 256-bit hash
+    return int(hash_hex, 16) < difficulty_limit(difficulty)
+
+
+def check_difficulty_digest(digest: bytes, difficulty: int) -> bool:
+    """
+    Check if a raw digest meets the difficulty requirement.
+
+    Args:
+        digest: 32-byte hash digest
+        difficulty: Required number of leading zero bits
+
+    Returns:
+        True if digest meets difficulty, False otherwise
+    """
+    return int.from_bytes(digest, 'big') < difficulty_limit(difficulty)
 
-    # Count leading zeros
-    if hash_int == 0:
-        leading_zeros = hash_bits
-    else:
-        leading_zeros = hash_bits - hash_int.bit_length()
 
-    return leading_zeros >= difficulty
+def leading_zero_bits(digest: bytes) -> int:
+    """
+    Count the leading zero bits of a 32-byte digest.
+
+    A digest meets difficulty d exactly when this is >= d, so one count
+    answers both the share and the block difficulty check.
+
+    Args:
+        digest: 32-byte hash digest
+
+    Returns:
+        Number of leading zero bits (0-256)
+    """
+    return 256 - int.from_bytes(digest, 'big').bit_length()
 
 
 def calculate_target(difficulty: int) -> int:
@@ -164,6 +370,11 @@ def merkle_root(hashes: list) -> str:
     """
     Compute the Merkle root of a list of hashes.
 
+    Each parent is the double SHA-256 of its two children's hex strings
+    concatenated; an odd node is paired with itself. Each level is hashed
+    as one batch of sibling pairs, keeping the hex digests as ASCII bytes
+    so nothing is re-encoded between levels.
+
     Args:
         hashes: List of transaction hashes
 
@@ -176,14 +387,17 @@ def merkle_root(hashes: list) -> str:
     if len(hashes) == 1:
         return hashes[0]
 
-    # Ensure even number of hashes
-    if len(hashes) % 2 == 1:
-        hashes = hashes + [hashes[-1]]
+    sha = hashlib.sha256
+    level = [h.encode('utf-8') if isinstance(h, str) else h for h in hashes]
 
-    # Build tree
-    new_level = []
-    for i in range(0, len(hashes), 2):
-        combined = hashes[i] + hashes[i + 1]
-        new_level.append(double_sha256(combined))
+    # Levels are hashed on the calling thread on purpose: hashlib only
+    # releases the GIL for inputs of 2 KiB or more, and each pair here is
+    # 128 bytes, so worker threads would just take turns
+    while len(level) > 1:
+        if len(level) & 1:
+            level.append(level[-1])
+        pairs = iter(level)
+        level = [sha(sha(left + right).digest()).hexdigest().encode('ascii')
+                 for left, right in zip(pairs, pairs)]
 
-    return merkle_root(new_level)
+    return level[0].decode('ascii')
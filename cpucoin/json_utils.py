@@ -0,0 +1,61 @@
+"""
+JSON helpers for CPUCoin storage
+Uses orjson when it is installed (with fallback to the stdlib json module)
+
+These are for files and messages only. Anything that is hashed (block
+headers, transaction IDs, coin hashes) must keep using
+json.dumps(..., sort_keys=True) so the bytes stay the same everywhere.
+"""
+
+import json
+from typing import Any, Union
+
+# Try to import orjson, fallback to stdlib json if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON.
+
+    Args:
+        obj: JSON-compatible object
+        indent: Pretty-print with two-space indentation (for files meant
+            to be human-readable); compact otherwise
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib handles those
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Union[bytes, memoryview, str]) -> Any:
+    """
+    Parse JSON produced by dumps() or by the stdlib json module.
+
+    Args:
+        data: JSON document; orjson parses a memoryview in place, the
+            stdlib fallback copies it to bytes first
+
+    Returns:
+        Decoded object
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by the stdlib encoder
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -19,14 +19,15 @@ import time
 import json
 import threading
 import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from typing import Optional, Dict, Any, Callable, List
 from dataclasses import dataclass, field
 
 from . import config
-from .blockchain import Block, Blockchain
+from .blockchain import Block, Blockchain, DEFAULT_BLOCKCHAIN_PATH
 from .coin import Coin, CoinStore, DEFAULT_COIN_DIR
 from .wallet import Wallet
-from .crypto_utils import mining_hash, check_difficulty
+from .crypto_utils import scan_nonces, check_difficulty
 
 
 @dataclass
@@ -128,96 +129,101 @@ class ShareMiner:
             print(f"   Shares remaining: {block.shares_remaining()}/{config.SHARES_PER_BLOCK}")
             print()
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         attempts = 0
         nonce = block.nonce
 
+        header, salt = block.mining_template()
+        target = min(block.share_difficulty, block.block_difficulty)
+        batch = config.MINING_BATCH_SIZE
+
         while True:
-            # Compute hash
-            header = block.compute_header()
-            hash_value = mining_hash(header, nonce, block.previous_hash)
-            attempts += 1
+            hit = scan_nonces(header, salt, nonce, batch, target)
+
+            if hit is None:
+                nonce += batch
+                attempts += batch
+
+                if verbose:
+                    elapsed = time.perf_counter() - start_time
+                    hash_rate = attempts / elapsed if elapsed > 0 else 0
+                    print(f"\r   Mining... {attempts:,} hashes, {hash_rate:.2f} H/s", end="", flush=True)
+                continue
+
+            attempts += hit[0] - nonce + 1
+            nonce, hash_value = hit
 
             # Check if we found a BLOCK (much harder)
             is_block_find = check_difficulty(hash_value, block.block_difficulty)
 
-            # Check if we found a SHARE (easier)
-            if check_difficulty(hash_value, block.share_difficulty) or is_block_find:
-                elapsed = time.time() - start_time
-                hash_rate = attempts / elapsed if elapsed > 0 else 0
-
-                # Claim the share
-                block.claim_share(share_index, self.wallet.public_key, nonce, hash_value)
-
-                # Create mining proof
-                mining_proof = {
-                    'nonce': nonce,
-                    'hash': hash_value,
-                    'share_difficulty': block.share_difficulty,
-                    'block_difficulty': block.block_difficulty,
-                    'timestamp': time.time(),
-                    'attempts': attempts,
-                    'hash_rate': hash_rate,
-                    'is_block_find': is_block_find
-                }
-
-                # Mint the coin for this share
-                coin = Coin.mint(
-                    owner_pubkey=self.wallet.public_key,
-                    value=share_value,
-                    block_height=block.index,
-                    mining_proof=mining_proof,
-                    coin_dir=self.coin_dir,
-                    share_index=share_index,
-                    block_hash=hash_value,
-                    is_block_finder=is_block_find
-                )
-
-                self.coins_minted.append(coin)
-                self.shares_found += 1
+            elapsed = time.perf_counter() - start_time
+            hash_rate = attempts / elapsed if elapsed > 0 else 0
 
-                if verbose:
-                    if is_block_find:
-                        print(f"\n🎉 BLOCK FOUND! Block #{block.index}")
-                        print(f"   Hash: {hash_value}")
-                        print(f"   Meets block difficulty: {block.block_difficulty}")
-                    else:
-                        print(f"\n✅ Share #{share_index} mined!")
-                        print(f"   Hash: {hash_value}")
-
-                    print(f"   Nonce: {nonce}")
-                    print(f"   Attempts: {attempts:,}")
-                    print(f"   Time: {elapsed:.2f}s")
-                    print(f"   Hash rate: {hash_rate:.2f} H/s")
-                    print(f"\n💰 Coin minted: {coin.coin_id}")
-                    print(f"   Value: {coin.value:.8f} CPU")
-                    print(f"   File: {coin.filepath}")
-
-                # If we found the block, handle bonus shares
-                bonus_coins = []
-                if is_block_find:
-                    bonus_coins = self._handle_block_find(block, nonce, hash_value, mining_proof, verbose)
+            # Claim the share
+            block.claim_share(share_index, self.wallet.public_key, nonce, hash_value)
+
+            # Create mining proof
+            mining_proof = {
+                'nonce': nonce,
+                'hash': hash_value,
+                'share_difficulty': block.share_difficulty,
+                'block_difficulty': block.block_difficulty,
+                'timestamp': time.time(),
+                'attempts': attempts,
+                'hash_rate': hash_rate,
+                'is_block_find': is_block_find
+            }
+
+            # Mint the coin for this share
+            coin = Coin.mint(
+                owner_pubkey=self.wallet.public_key,
+                value=share_value,
+                block_height=block.index,
+                mining_proof=mining_proof,
+                coin_dir=self.coin_dir,
+                share_index=share_index,
+                block_hash=hash_value,
+                is_block_finder=is_block_find
+            )
+
+            self.coins_minted.append(coin)
+            self.shares_found += 1
 
-                result = ShareResult(
-                    success=True,
-                    share_index=share_index,
-                    nonce=nonce,
-                    hash_value=hash_value,
-                    is_block_find=is_block_find,
-                    coin=coin,
-                    hash_rate=hash_rate,
-                    attempts=attempts,
-                    elapsed_time=elapsed
-                )
+            if verbose:
+                if is_block_find:
+                    print(f"\n🎉 BLOCK FOUND! Block #{block.index}")
+                    print(f"   Hash: {hash_value}")
+                    print(f"   Meets block difficulty: {block.block_difficulty}")
+                else:
+                    print(f"\n✅ Share #{share_index} mined!")
+                    print(f"   Hash: {hash_value}")
 
-                return result
+                print(f"   Nonce: {nonce}")
+                print(f"   Attempts: {attempts:,}")
+                print(f"   Time: {elapsed:.2f}s")
+                print(f"   Hash rate: {hash_rate:.2f} H/s")
+                print(f"\n💰 Coin minted: {coin.coin_id}")
+                print(f"   Value: {coin.value:.8f} CPU")
+                print(f"   File: {coin.filepath}")
 
-            nonce += 1
+            # If we found the block, handle bonus shares
+            bonus_coins = []
+            if is_block_find:
+                bonus_coins = self._handle_block_find(block, nonce, hash_value, mining_proof, verbose)
+
+            result = ShareResult(
+                success=True,
+                share_index=share_index,
+                nonce=nonce,
+                hash_value=hash_value,
+                is_block_find=is_block_find,
+                coin=coin,
+                hash_rate=hash_rate,
+                attempts=attempts,
+                elapsed_time=elapsed
+            )
 
-            if verbose and attempts % 50 == 0:
-                elapsed = time.time() - start_time
-                hash_rate = attempts / elapsed if elapsed > 0 else 0
-                print(f"\r   Mining... {attempts:,} hashes, {hash_rate:.2f} H/s", end="", flush=True)
+            return result
 
     def _handle_block_find(self, block: Block, nonce: int, hash_value: str,
                            mining_proof: Dict, verbose: bool = True) -> List[Coin]:
@@ -244,10 +250,11 @@ class ShareMiner:
         if verbose and unclaimed:
             print(f"\n🎁 BONUS! Claiming {len(unclaimed)} remaining shares...")
 
-        for bonus_index in unclaimed:
-            # Claim the bonus share
-            block.claim_share(bonus_index, self.wallet.public_key, nonce, hash_value)
+        # Claim all the bonus shares in one go
+        miner_key = self.wallet.public_key
+        block.claim_shares_bulk((i, miner_key, nonce, hash_value) for i in unclaimed)
 
+        for bonus_index in unclaimed:
             # Mint bonus coin
             bonus_coin = Coin.mint(
                 owner_pubkey=self.wallet.public_key,
@@ -258,7 +265,8 @@ class ShareMiner:
                 share_index=bonus_index,
                 block_hash=hash_value,
                 is_block_finder=True,
-                is_bonus_share=True
+                is_bonus_share=True,
+                save=False
             )
 
             bonus_coins.append(bonus_coin)
@@ -268,6 +276,8 @@ class ShareMiner:
             if verbose:
                 print(f"   Bonus share #{bonus_index}: {bonus_coin.coin_id[:24]}...")
 
+        Coin.save_batch(bonus_coins, self.coin_dir)
+
         # Close the block
         block.close_block(self.wallet.public_key, nonce, hash_value)
 
@@ -283,7 +293,8 @@ class ShareMiner:
         return bonus_coins
 
     def mine_continuous(self, num_shares: int = 0, verbose: bool = True,
-                        callback: Optional[Callable[[ShareResult], bool]] = None) -> List[ShareResult]:
+                        callback: Optional[Callable[[ShareResult], bool]] = None,
+                        out: Optional[List[ShareResult]] = None) -> List[ShareResult]:
         """
         Mine shares continuously.
 
@@ -291,13 +302,15 @@ class ShareMiner:
             num_shares: Number of shares to mine (0 = infinite)
             verbose: Print progress
             callback: Called after each share, return False to stop
+            out: List to append results to as they are found, so the
+                caller keeps them even if mining is interrupted
 
         Returns:
-            List of ShareResults
+            List of ShareResults (out, if given)
         """
         self.is_mining = True
         self.start_time = time.time()
-        results = []
+        results = out if out is not None else []
 
         if verbose:
             print("=" * 60)
@@ -349,6 +362,10 @@ class ShareMiner:
         self.is_mining = False
         self._stop_event.set()
 
+    def close(self):
+        """Release mining resources (worker threads). Safe to call twice."""
+        self.stop()
+
     def get_stats(self) -> Dict[str, Any]:
         """Get mining statistics."""
         elapsed = time.time() - self.start_time if self.start_time else 0
@@ -370,7 +387,9 @@ class MultiThreadedShareMiner(ShareMiner):
     Multi-threaded share miner for multi-core CPUs.
 
     Each thread works on different nonce ranges to maximize CPU utilization.
-    First thread to find a valid share/block wins.
+    First thread to find a valid share/block wins. The worker threads are a
+    pool kept for the miner's lifetime, so mining many shares does not
+    start and tear down threads for each one; call close() when done.
     """
 
     def __init__(self, wallet: Wallet, blockchain: Blockchain,
@@ -378,42 +397,70 @@ class MultiThreadedShareMiner(ShareMiner):
         if num_threads <= 0:
             num_threads = multiprocessing.cpu_count()
         super().__init__(wallet, blockchain, coin_dir, num_threads)
-        self._threads: List[threading.Thread] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
 
     def _mine_thread(self, thread_id: int, block: Block, share_index: int,
-                     start_nonce: int, step: int):
+                     start_nonce: int, step: int, stop_event: threading.Event):
         """Mining thread worker."""
-        header = block.compute_header()
+        # Encode the header and salt once; the kernel scans a whole batch
+        # per call, so counters are touched once per batch. The kernel
+        # checks the stop flag before every hash, so a sibling's hit ends
+        # this worker's batch within one memory-hard hash
+        header, salt = block.mining_template()
+        target = min(block.share_difficulty, block.block_difficulty)
+        batch = config.MINING_BATCH_SIZE
         nonce = start_nonce
 
-        while not self._stop_event.is_set():
-            hash_value = mining_hash(header, nonce, block.previous_hash)
+        while not stop_event.is_set():
+            hit = scan_nonces(header, salt, nonce, batch, target, stride=step,
+                              stop_event=stop_event)
 
-            with self._lock:
-                self.total_hashes += 1
+            if hit is None:
+                with self._lock:
+                    if stop_event.is_set():
+                        return  # Round is over; don't count into the next one
+                    self.total_hashes += batch
+                nonce += batch * step
+                continue
 
-            # Check if we found a BLOCK (much harder)
+            found_nonce, hash_value = hit
+
+            # Check if we also found a BLOCK (much harder)
             is_block_find = check_difficulty(hash_value, block.block_difficulty)
 
-            # Check if we found a SHARE (easier)
-            if check_difficulty(hash_value, block.share_difficulty) or is_block_find:
-                with self._lock:
-                    if self._found_result is None:
-                        self._found_result = ShareResult(
-                            success=True,
-                            share_index=share_index,
-                            nonce=nonce,
-                            hash_value=hash_value,
-                            is_block_find=is_block_find
-                        )
-                        self._stop_event.set()
-                return
-
-            nonce += step
+            with self._lock:
+                self.total_hashes += (found_nonce - nonce) // step + 1
+                # A stopped round's late hit must not leak into the next one
+                if not stop_event.is_set():
+                    self._found_result = ShareResult(
+                        success=True,
+                        share_index=share_index,
+                        nonce=found_nonce,
+                        hash_value=hash_value,
+                        is_block_find=is_block_find
+                    )
+                    stop_event.set()
+            return
+
+    def close(self):
+        """Stop mining and shut down the worker pool."""
+        super().close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def mine_share(self, verbose: bool = True) -> ShareResult:
         """Mine a share using multiple threads."""
-        self._stop_event.clear()
+        # Drain the previous round first (its workers stop within one hash
+        # of its event being set) so the new tasks don't queue behind them
+        self._stop_event.set()
+        wait(self._futures)
+
+        # Fresh event per round: a worker of an earlier round that is
+        # somehow still running keeps watching that round's (set) event
+        stop_event = threading.Event()
+        self._stop_event = stop_event
         self._found_result = None
         self.total_hashes = 0
 
@@ -436,33 +483,30 @@ class MultiThreadedShareMiner(ShareMiner):
             print(f"   Share value: {share_value:.8f} CPU")
             print(f"   Shares remaining: {block.shares_remaining()}/{config.SHARES_PER_BLOCK}")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        # Start mining threads
-        self._threads = []
-        for i in range(self.num_threads):
-            t = threading.Thread(
-                target=self._mine_thread,
-                args=(i, block, share_index, i, self.num_threads)
-            )
-            t.daemon = True
-            t.start()
-            self._threads.append(t)
+        # Hand the round to the persistent worker pool
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.num_threads, thread_name_prefix="cpucoin-miner")
+        self._futures = [
+            self._executor.submit(self._mine_thread, i, block, share_index,
+                                  i, self.num_threads, stop_event)
+            for i in range(self.num_threads)
+        ]
 
         # Monitor progress
-        while not self._stop_event.is_set():
-            time.sleep(0.5)
-            elapsed = time.time() - start_time
+        while not stop_event.wait(0.5):
+            elapsed = time.perf_counter() - start_time
             hash_rate = self.total_hashes / elapsed if elapsed > 0 else 0
             if verbose:
                 print(f"\r   Mining... {self.total_hashes:,} hashes, {hash_rate:.2f} H/s", end="", flush=True)
 
-        # Wait for threads
-        for t in self._threads:
-            t.join(timeout=1.0)
+        # Wait for the workers to notice the stop (at most one hash each)
+        wait(self._futures)
 
         if self._found_result:
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             hash_rate = self.total_hashes / elapsed if elapsed > 0 else 0
 
             result = self._found_result
@@ -587,6 +631,6 @@ def quick_mine(num_shares: int = 1, wallet_name: str = "miner",
     results = miner.mine_continuous(num_shares=num_shares, verbose=verbose)
 
     # Save blockchain
-    blockchain.save(os.path.expanduser("~/.cpucoin/blockchain.json"))
+    blockchain.save(DEFAULT_BLOCKCHAIN_PATH)
 
     return results
@@ -10,14 +10,16 @@ Handles:
 
 import json
 import time
-import urllib.request
-import urllib.error
+import threading
+import http.client
+from urllib.parse import urlsplit
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from . import config
 from .coin import Coin
-from .crypto_utils import mining_hash, check_difficulty
+from .crypto_utils import mining_hash, mining_salt, scan_nonces, check_difficulty
 
 
 @dataclass
@@ -34,6 +36,14 @@ class BlockTemplate:
     is_closed: bool
     header: str
 
+    # Encoded forms of header and previous_hash, fed straight to the kernel
+    header_bytes: bytes = field(init=False, repr=False, compare=False)
+    salt_bytes: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.header_bytes = self.header.encode('utf-8')
+        self.salt_bytes = mining_salt(self.previous_hash or "genesis")
+
 
 @dataclass
 class SubmitResult:
@@ -78,37 +88,73 @@ class MiningClient:
         self.server_url = server_url.rstrip('/')
         self.timeout = timeout
         self._last_error: Optional[str] = None
+        self._last_status: Optional[int] = None
 
-    def _request(self, method: str, path: str, data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
-        """Make an HTTP request to the server."""
-        url = f"{self.server_url}{path}"
-
-        try:
-            if method == 'GET':
-                req = urllib.request.Request(url)
-            else:
-                body = json.dumps(data).encode() if data else b''
-                req = urllib.request.Request(url, data=body, method=method)
-                req.add_header('Content-Type', 'application/json')
+        # One keep-alive connection is reused for every request, so a
+        # mining session pays for the TCP (and TLS) handshake only once
+        url = urlsplit(self.server_url)
+        conn_class = (http.client.HTTPSConnection if url.scheme == 'https'
+                      else http.client.HTTPConnection)
+        self._conn = conn_class(url.netloc, timeout=timeout)
+        self._base_path = url.path
 
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                return json.loads(response.read().decode())
+    def close(self):
+        """Close the connection to the server."""
+        self._conn.close()
 
-        except urllib.error.HTTPError as e:
+    def _request(self, method: str, path: str, data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Make an HTTP request to the server."""
+        url = f"{self._base_path}{path}"
+        headers = {}
+        body = None
+        if method != 'GET':
+            body = json.dumps(data).encode() if data else b''
+            headers['Content-Type'] = 'application/json'
+
+        self._last_status = None
+        for attempt in range(2):
+            # The server may drop an idle keep-alive connection; that only
+            # shows up when the next request on it fails, so retry once.
+            # Only GETs: a POST may have been handled before the drop, and
+            # resending a share would submit it twice
+            reused = self._conn.sock is not None
             try:
-                error_body = json.loads(e.read().decode())
-                self._last_error = error_body.get('message', str(e))
-            except Exception:
+                self._conn.request(method, url, body=body, headers=headers)
+                response = self._conn.getresponse()
+                payload = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError) as e:
+                self._conn.close()
+                if reused and attempt == 0 and method == 'GET':
+                    continue
+                self._last_error = f"Connection failed: {e}"
+                return None
+            except OSError as e:
+                self._conn.close()
+                self._last_error = f"Connection failed: {e}"
+                return None
+            except Exception as e:
+                self._conn.close()
                 self._last_error = str(e)
-            return None
+                return None
+
+            self._last_status = response.status
+            if response.status >= 400:
+                try:
+                    error_body = json.loads(payload.decode())
+                    self._last_error = error_body.get(
+                        'message', f"HTTP Error {response.status}: {response.reason}")
+                except Exception:
+                    self._last_error = f"HTTP Error {response.status}: {response.reason}"
+                return None
 
-        except urllib.error.URLError as e:
-            self._last_error = f"Connection failed: {e.reason}"
-            return None
+            try:
+                return json.loads(payload.decode())
+            except Exception as e:
+                self._last_error = str(e)
+                return None
 
-        except Exception as e:
-            self._last_error = str(e)
-            return None
+        return None
 
     def get_server_info(self) -> Optional[Dict[str, Any]]:
         """Get server information."""
@@ -120,6 +166,45 @@ class MiningClient:
         if not data:
             return None
 
+        return self._parse_template(data)
+
+    def get_bootstrap(self) -> Optional[Dict[str, Any]]:
+        """
+        Get everything needed to start a mining session in one request.
+
+        Servers without the /state endpoint are asked for the server info
+        and current block separately instead.
+
+        Returns:
+            Dict with 'server_info', 'blockchain_info' (None from servers
+            without /state) and 'initial_job' (a BlockTemplate), or None
+            on error
+        """
+        data = self._request('GET', '/state')
+        if not data:
+            if self._last_status != 404:
+                return None
+            server_info = self.get_server_info()
+            if not server_info:
+                return None
+            initial_job = self.get_current_block()
+            if not initial_job:
+                return None
+            return {
+                'server_info': server_info,
+                'blockchain_info': None,
+                'initial_job': initial_job
+            }
+
+        return {
+            'server_info': data['server_info'],
+            'blockchain_info': data['blockchain_info'],
+            'initial_job': self._parse_template(data['current_block'])
+        }
+
+    @staticmethod
+    def _parse_template(data: Dict[str, Any]) -> BlockTemplate:
+        """Build a BlockTemplate from a /block/current response."""
         return BlockTemplate(
             block_index=data['block_index'],
             previous_hash=data['previous_hash'],
@@ -206,7 +291,7 @@ class MiningClient:
 
         # If block find, also create bonus share coins
         if result.is_block_find and result.bonus_shares > 0:
-            for i in range(result.bonus_shares):
+            bonus_coins = [
                 Coin.mint(
                     owner_pubkey=miner_pubkey,
                     value=coin_data['value'],
@@ -215,8 +300,12 @@ class MiningClient:
                     share_index=coin_data['share_index'] + 1 + i,  # Bonus shares get subsequent indices
                     block_hash=coin_data['block_hash'],
                     is_block_finder=False,
-                    is_bonus_share=True
+                    is_bonus_share=True,
+                    save=False
                 )
+                for i in range(result.bonus_shares)
+            ]
+            Coin.save_batch(bonus_coins)
 
         return coin
 
@@ -242,22 +331,35 @@ class ServerShareMiner:
     4. Creates local coin files for accepted shares
     """
 
-    def __init__(self, wallet, server_url: str):
+    def __init__(self, wallet, server_url: str, num_lanes: int = 1,
+                 initial_job: Optional[BlockTemplate] = None,
+                 client: Optional[MiningClient] = None):
         """
         Initialize the server-connected miner.
 
         Args:
             wallet: Wallet with miner's keys
             server_url: URL of the mining server
+            num_lanes: Number of nonce streams hashed concurrently
+            initial_job: Block template already fetched (e.g. from
+                MiningClient.get_bootstrap()); used instead of fetching
+                one for the first share
+            client: Existing MiningClient to reuse (and its connection)
         """
         self.wallet = wallet
-        self.client = MiningClient(server_url)
+        self.client = client or MiningClient(server_url)
+        self.num_lanes = max(1, num_lanes)
+        self._initial_job = initial_job
         self.is_running = False
         self._stop_requested = False
+        # Set on stop() or when a lane finds a hit; checked by the nonce
+        # kernel before every hash
+        self._stop_event = threading.Event()
 
     def stop(self):
         """Request mining to stop."""
         self._stop_requested = True
+        self._stop_event.set()
 
     def mine_share(self, verbose: bool = True) -> Optional[SubmitResult]:
         """
@@ -266,8 +368,10 @@ class ServerShareMiner:
         Returns:
             SubmitResult if share found and submitted, None if stopped/error
         """
-        # Get current block from server
-        template = self.client.get_current_block()
+        # Get current block from server, unless one was handed to us
+        template, self._initial_job = self._initial_job, None
+        if template is None:
+            template = self.client.get_current_block()
         if not template:
             if verbose:
                 print(f"Failed to get block: {self.client.last_error}")
@@ -284,17 +388,47 @@ class ServerShareMiner:
                   f"difficulty: {template.share_difficulty}/{template.block_difficulty})")
 
         # Mine until we find a valid hash
-        start_time = time.time()
+        start_time = time.perf_counter()
         nonce = 0
         attempts = 0
 
-        while not self._stop_requested:
-            hash_value = mining_hash(template.header, nonce, template.previous_hash)
-            attempts += 1
+        header, salt = template.header_bytes, template.salt_bytes
+        target = min(template.share_difficulty, template.block_difficulty)
+        lanes = self.num_lanes
+        batch = config.MINING_BATCH_SIZE
+        executor = ThreadPoolExecutor(max_workers=lanes) if lanes > 1 else None
 
-            # Check share difficulty
-            if check_difficulty(hash_value, template.share_difficulty):
-                elapsed = time.time() - start_time
+        # One event per share: a hit ends the share, so lanes still
+        # scanning can be stopped without affecting the next one
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+        if self._stop_requested:
+            stop_event.set()
+
+        try:
+            while not self._stop_requested:
+                if executor is None:
+                    hit = scan_nonces(header, salt, nonce, batch, target,
+                                      stop_event=stop_event)
+                else:
+                    hit = self._scan_lanes(executor, header, salt, nonce, batch, target,
+                                           stop_event)
+
+                if hit is None:
+                    nonce += batch * lanes
+                    attempts += batch * lanes
+
+                    # Progress update after every batch
+                    if verbose:
+                        elapsed = time.perf_counter() - start_time
+                        print(f"\rMining... Attempts: {attempts}, "
+                              f"Rate: {attempts/elapsed:.2f} H/s, "
+                              f"Nonce: {nonce}", end="", flush=True)
+                    continue
+
+                attempts += hit[0] - nonce + 1
+                nonce, hash_value = hit
+                elapsed = time.perf_counter() - start_time
 
                 # Check if also meets block difficulty
                 is_block = check_difficulty(hash_value, template.block_difficulty)
@@ -333,32 +467,54 @@ class ServerShareMiner:
                         print(f"  ❌ Share rejected: {result.message}")
 
                 return result
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
-            nonce += 1
+        return None
 
-            # Progress update every 100 hashes
-            if verbose and attempts % 100 == 0:
-                elapsed = time.time() - start_time
-                print(f"\rMining... Attempts: {attempts}, "
-                      f"Rate: {attempts/elapsed:.2f} H/s, "
-                      f"Nonce: {nonce}", end="", flush=True)
+    def _scan_lanes(self, executor: ThreadPoolExecutor, header: bytes, salt: bytes,
+                    nonce: int, batch: int, target: int, stop_event: threading.Event):
+        """
+        Scan batch * num_lanes nonces from nonce, one interleaved lane per thread.
 
+        Lane k tries nonce + k, nonce + k + num_lanes, ... in lockstep with
+        the others; the memory-hard hash releases the GIL, so the lanes'
+        hashes overlap. As soon as a lane finds a hit, stop_event is set
+        so the other lanes give up within one hash, and the lowest nonce
+        among the lanes that have finished is returned.
+        """
+        lanes = self.num_lanes
+        pending = {
+            executor.submit(scan_nonces, header, salt, nonce + k, batch, target, lanes,
+                            stop_event)
+            for k in range(lanes)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            hits = [hit for hit in (f.result() for f in done) if hit is not None]
+            if hits:
+                stop_event.set()
+                return min(hits)
         return None
 
-    def mine_continuous(self, num_shares: int = 0, verbose: bool = True) -> list:
+    def mine_continuous(self, num_shares: int = 0, verbose: bool = True,
+                        out: Optional[list] = None) -> list:
         """
         Mine shares continuously.
 
         Args:
             num_shares: Number of shares to mine (0 = infinite)
             verbose: Print progress
+            out: List to append results to as they are found, so the
+                caller keeps them even if mining is interrupted
 
         Returns:
-            List of SubmitResult for successful shares
+            List of SubmitResult for successful shares (out, if given)
         """
         self.is_running = True
         self._stop_requested = False
-        results = []
+        results = out if out is not None else []
         shares_mined = 0
 
         while not self._stop_requested:
@@ -18,12 +18,13 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from . import config
+from .compat import DATACLASS_SLOTS
 from .blockchain import Block, Blockchain
 from .coin import Coin, CoinStore
 from .transaction import Transaction, TransactionPool
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Peer:
     """Information about a network peer."""
     host: str
@@ -36,6 +37,17 @@ class Peer:
     def address(self) -> str:
         return f"{self.host}:{self.port}"
 
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Describe the peer for API listings."""
+        return {
+            'address': self.address,
+            'host': self.host,
+            'port': self.port,
+            'version': self.version,
+            'height': self.height,
+            'last_seen': self.last_seen
+        }
+
 
 class Message:
     """Network message types."""
@@ -219,7 +231,7 @@ class Node:
         elif msg_type == Message.GET_BLOCKS:
             # Send blocks from specified height
             start = message.get('start', 0)
-            blocks = [b.to_dict() for b in self.blockchain.chain[start:start + 100]]
+            blocks = list(self.blockchain.iter_block_dicts(start, start + 100))
             return {'type': Message.BLOCKS, 'blocks': blocks}
 
         elif msg_type == Message.NEW_BLOCK:
@@ -17,15 +17,14 @@ Server storage:
 """
 
 import os
-import json
 import time
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
-from . import config
+from . import config, json_utils
 from .blockchain import Block, Blockchain
 from .crypto_utils import check_difficulty, mining_hash
 
@@ -56,7 +55,7 @@ def get_blockchain() -> Blockchain:
 def save_blockchain():
     """Save the blockchain to disk."""
     blockchain_path = os.path.join(_server_data_dir, "blockchain.json")
-    get_blockchain().save(blockchain_path)
+    get_blockchain().save_incremental(blockchain_path)
 
 
 @dataclass
@@ -79,28 +78,50 @@ class ShareResult:
     bonus_shares: int = 0
     coin_data: Optional[Dict[str, Any]] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for the JSON response.
+
+        Built shallowly (coin_data is shared, not deep-copied as asdict()
+        would), since the result is serialized straight away.
+        """
+        return {
+            'success': self.success,
+            'message': self.message,
+            'share_index': self.share_index,
+            'is_block_find': self.is_block_find,
+            'bonus_shares': self.bonus_shares,
+            'coin_data': self.coin_data
+        }
+
 
 class MiningServerHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the mining server."""
 
+    # HTTP/1.1 keeps client connections open between requests; every
+    # response must therefore carry a Content-Length
+    protocol_version = 'HTTP/1.1'
+
     def log_message(self, format, *args):
         """Custom logging."""
         print(f"[{time.strftime('%H:%M:%S')}] {args[0]}")
 
     def _send_json(self, data: Dict[str, Any], status: int = 200):
         """Send a JSON response."""
+        body = json_utils.dumps(data)
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
     def _read_json(self) -> Optional[Dict[str, Any]]:
         """Read JSON from request body."""
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             body = self.rfile.read(content_length)
-            return json.loads(body.decode())
+            return json_utils.loads(body)
         except Exception:
             return None
 
@@ -110,6 +131,7 @@ class MiningServerHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def do_GET(self):
@@ -124,6 +146,8 @@ class MiningServerHandler(BaseHTTPRequestHandler):
             self._handle_blockchain_info()
         elif path == '/blockchain/height':
             self._handle_blockchain_height()
+        elif path == '/state':
+            self._handle_state()
         else:
             self._send_json({'error': 'Not found'}, 404)
 
@@ -140,8 +164,36 @@ class MiningServerHandler(BaseHTTPRequestHandler):
 
     def _handle_info(self):
         """Server info endpoint."""
-        blockchain = get_blockchain()
+        self._send_json(self._server_info())
+
+    def _handle_get_current_block(self):
+        """Get the current open block for mining."""
+        with _lock:
+            self._send_json(self._current_block())
+
+    def _handle_blockchain_info(self):
+        """Get blockchain information."""
+        self._send_json(self._blockchain_info())
+
+    def _handle_state(self):
+        """
+        Everything a miner needs to start, in one response.
+
+        Combines the server info, blockchain info and current block
+        template so a client session starts with a single round trip.
+        """
+        with _lock:
+            current_block = self._current_block()
         self._send_json({
+            'server_info': self._server_info(),
+            'blockchain_info': self._blockchain_info(),
+            'current_block': current_block
+        })
+
+    def _server_info(self) -> Dict[str, Any]:
+        """Build the server info response."""
+        blockchain = get_blockchain()
+        return {
             'name': 'CPUCoin Mining Server',
             'version': '2.0.0',
             'blockchain_height': blockchain.height,
@@ -150,30 +202,29 @@ class MiningServerHandler(BaseHTTPRequestHandler):
             'shares_per_block': config.SHARES_PER_BLOCK,
             'share_value': config.SHARE_VALUE,
             'timestamp': time.time()
-        })
+        }
 
-    def _handle_get_current_block(self):
-        """Get the current open block for mining."""
-        with _lock:
-            blockchain = get_blockchain()
-            block = blockchain.get_or_create_open_block()
-
-            # Return block info needed for mining
-            self._send_json({
-                'block_index': block.index,
-                'previous_hash': block.previous_hash,
-                'merkle_root': block.merkle_root,
-                'timestamp': block.timestamp,
-                'share_difficulty': block.share_difficulty,
-                'block_difficulty': block.block_difficulty,
-                'shares_claimed': len(block.claimed_shares),
-                'shares_remaining': block.shares_remaining(),
-                'is_closed': block.is_closed,
-                'header': block.compute_header()
-            })
+    def _current_block(self) -> Dict[str, Any]:
+        """Build the current block template (caller holds _lock)."""
+        blockchain = get_blockchain()
+        block = blockchain.get_or_create_open_block()
 
-    def _handle_blockchain_info(self):
-        """Get blockchain information."""
+        # Return block info needed for mining
+        return {
+            'block_index': block.index,
+            'previous_hash': block.previous_hash,
+            'merkle_root': block.merkle_root,
+            'timestamp': block.timestamp,
+            'share_difficulty': block.share_difficulty,
+            'block_difficulty': block.block_difficulty,
+            'shares_claimed': len(block.claimed_shares),
+            'shares_remaining': block.shares_remaining(),
+            'is_closed': block.is_closed,
+            'header': block.compute_header()
+        }
+
+    def _blockchain_info(self) -> Dict[str, Any]:
+        """Build the blockchain info response."""
         blockchain = get_blockchain()
 
         open_block_info = None
@@ -186,7 +237,7 @@ class MiningServerHandler(BaseHTTPRequestHandler):
                 'opened_at': ob.opened_at
             }
 
-        self._send_json({
+        return {
             'height': blockchain.height,
             'share_difficulty': blockchain.share_difficulty,
             'block_difficulty': blockchain.block_difficulty,
@@ -204,7 +255,7 @@ class MiningServerHandler(BaseHTTPRequestHandler):
                 }
                 for b in blockchain.chain[-5:]
             ]
-        })
+        }
 
     def _handle_blockchain_height(self):
         """Get just the blockchain height."""
@@ -235,9 +286,9 @@ class MiningServerHandler(BaseHTTPRequestHandler):
             )
 
         if result.success:
-            self._send_json(asdict(result))
+            self._send_json(result.to_dict())
         else:
-            self._send_json(asdict(result), 400)
+            self._send_json(result.to_dict(), 400)
 
     def _process_share_submission(
         self, miner_pubkey: str, nonce: int, hash_value: str, block_index: int
@@ -354,7 +405,9 @@ def run_server(host: str = "0.0.0.0", port: int = 8333):
     # Initialize blockchain
     get_blockchain()
 
-    server = HTTPServer((host, port), MiningServerHandler)
+    # One thread per connection: with keep-alive a miner holds its
+    # connection open, which would otherwise block every other miner
+    server = ThreadingHTTPServer((host, port), MiningServerHandler)
     print(f"""
 ╔═══════════════════════════════════════════════════════════╗
 ║                 CPUCoin Mining Server                     ║
@@ -365,6 +418,7 @@ def run_server(host: str = "0.0.0.0", port: int = 8333):
 ║    GET  /                    - Server info                ║
 ║    GET  /block/current       - Get current block to mine  ║
 ║    GET  /blockchain/info     - Blockchain information     ║
+║    GET  /state               - All of the above, batched  ║
 ║    POST /share/submit        - Submit a found share       ║
 ║                                                           ║
 ║  Miners connect with: --server http://{host}:{port:<5}       ║
@@ -10,6 +10,7 @@ import time
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field, asdict
 
+from .compat import DATACLASS_SLOTS
 from .crypto_utils import sha256, double_sha256
 from .wallet import verify_signature
 
@@ -30,7 +31,7 @@ class TransactionOutput:
     coin_id: str = ""         # ID of the resulting coin (set after creation)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Transaction:
     """
     A CPUCoin transaction.
@@ -108,6 +109,15 @@ class Transaction:
         total_output = sum(out.get('amount', 0) for out in self.outputs)
         return total_output >= 0
 
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Summarize the transaction for API listings."""
+        return {
+            'txid': self.txid,
+            'type': self.tx_type,
+            'fee': self.fee,
+            'timestamp': self.timestamp
+        }
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
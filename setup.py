@@ -37,6 +37,9 @@ setup(
         "argon2-cffi>=21.3.0",
         "ecdsa>=0.18.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.6"],
+    },
     entry_points={
         "console_scripts": [
             "cpucoin=cpucoin.cli:main",
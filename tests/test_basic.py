@@ -3,19 +3,40 @@ Basic tests for CPUCoin
 """
 
 import os
+import json
+import hashlib
 import sys
 import tempfile
 import shutil
+import socket
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from cpucoin.crypto_utils import sha256, double_sha256, check_difficulty, merkle_root
+from cpucoin.crypto_utils import (
+    sha256, double_sha256, batch_double_sha256, check_difficulty, merkle_root,
+    mining_hash, mining_hash_fast, mining_salt, leading_zero_bits, scan_nonces
+)
 from cpucoin.blockchain import Block, Blockchain
 from cpucoin.coin import Coin, CoinData, CoinStore
+from cpucoin.coin_pack import CoinPack
 from cpucoin.wallet import Wallet, generate_keypair, sign_message, verify_signature
 from cpucoin.transaction import Transaction, TransactionBuilder
+from cpucoin import mining_client
+from cpucoin.mining_client import MiningClient, ServerShareMiner
+from cpucoin.miner import MultiThreadedShareMiner
+from cpucoin import coin_control_server
+from cpucoin.coin_control_server import (
+    APIHandler, CoinControlServer, PooledHTTPServer, ResponseCache, ServerConfig, ServerStats
+)
+from cpucoin import coin_binary, json_utils, server
 
 
 class TestCryptoUtils(unittest.TestCase):
@@ -38,6 +59,10 @@ class TestCryptoUtils(unittest.TestCase):
         # Should be different from single sha256
         self.assertNotEqual(result, sha256("test"))
 
+        # Batch form agrees for str and bytes inputs
+        self.assertEqual(batch_double_sha256(["test", b"test", "x"]),
+                         [result, result, double_sha256("x")])
+
     def test_check_difficulty(self):
         """Test difficulty checking."""
         # Hash with 4 leading zero bits (first hex char is 0)
@@ -46,6 +71,15 @@ class TestCryptoUtils(unittest.TestCase):
         # Hash with 8 leading zero bits (first 2 hex chars are 0)
         self.assertTrue(check_difficulty("00" + "f" * 62, 8))
 
+    def test_leading_zero_bits(self):
+        """Test leading zero bit counts agree with check_difficulty."""
+        for digest in (bytes(32), b'\x00\x0f' + b'\xff' * 30, b'\x80' + bytes(31)):
+            zeros = leading_zero_bits(digest)
+            self.assertTrue(check_difficulty(digest.hex(), zeros))
+            if zeros < 256:
+                self.assertFalse(check_difficulty(digest.hex(), zeros + 1))
+        self.assertEqual(leading_zero_bits(b'\x00\x0f' + b'\xff' * 30), 12)
+
     def test_merkle_root_empty(self):
         """Test merkle root with empty list."""
         result = merkle_root([])
@@ -63,6 +97,26 @@ class TestCryptoUtils(unittest.TestCase):
         result = merkle_root(hashes)
         self.assertEqual(len(result), 64)
 
+    def test_mining_hash_fast_matches(self):
+        """Test the pre-encoded mining hash matches mining_hash."""
+        header = '{"index": 1, "miner": "test"}'
+        prev_hash = "ab" * 32
+        self.assertEqual(
+            mining_hash_fast(header.encode(), 42, mining_salt(prev_hash)),
+            mining_hash(header, 42, prev_hash)
+        )
+
+    def test_scan_nonces_stop_event(self):
+        """Test that a set stop event ends a scan before the next hash."""
+        header, salt = b'{"index": 1}', mining_salt("genesis")
+        stop = threading.Event()
+        self.assertEqual(scan_nonces(header, salt, 7, 5, 0, stop_event=stop)[0], 7)
+
+        stop.set()
+        with mock.patch('cpucoin.crypto_utils._memory_hard_raw') as memory_hard:
+            self.assertIsNone(scan_nonces(header, salt, 7, 5, 0, stop_event=stop))
+        memory_hard.assert_not_called()
+
 
 class TestBlockchain(unittest.TestCase):
     """Test blockchain functionality."""
@@ -98,11 +152,427 @@ class TestBlockchain(unittest.TestCase):
         hash2 = block.compute_hash()
         self.assertNotEqual(hash1, hash2)
 
+    def test_header_cache_invalidation(self):
+        """Test the cached header is rebuilt when a header field changes."""
+        block = Block(index=1, timestamp=1000.0, transactions=[],
+                      previous_hash="0" * 64, miner="a")
+        header1 = block.compute_header()
+        block.nonce = 5  # Not part of the header
+        self.assertIs(block.compute_header(), header1)
+
+        block.miner = "b"
+        header2 = block.compute_header()
+        self.assertNotEqual(header1, header2)
+        self.assertIn('"miner": "b"', header2)
+
+    def test_header_matches_json(self):
+        """Test the hand-built header is byte-identical to json.dumps."""
+        import json
+        for timestamp, miner in ((1000.0, "test"), (1703548800, ""),
+                                 (1700000000.123456, 'caf\u00e9 "q"\n')):
+            block = Block(index=3, timestamp=timestamp, transactions=[],
+                          previous_hash="ab" * 32, miner=miner)
+            expected = json.dumps({
+                'index': block.index,
+                'timestamp': block.timestamp,
+                'merkle_root': block.merkle_root,
+                'previous_hash': block.previous_hash,
+                'share_difficulty': block.share_difficulty,
+                'block_difficulty': block.block_difficulty,
+                'miner': block.miner
+            }, sort_keys=True)
+            self.assertEqual(block.compute_header(), expected)
+
+    def test_header_wire_format(self):
+        """Test the header bytes are pinned (they are hashed and sent to miners)."""
+        block = Block(index=1, timestamp=1000.0, transactions=[],
+                      previous_hash="0" * 64, share_difficulty=10,
+                      block_difficulty=17, miner="m")
+        self.assertEqual(
+            block.compute_header(),
+            '{"block_difficulty": 17, "index": 1, "merkle_root": "", '
+            '"miner": "m", "previous_hash": "' + "0" * 64 + '", '
+            '"share_difficulty": 10, "timestamp": 1000.0}'
+        )
+
+    def test_claim_shares(self):
+        """Test claiming shares tracks the next free index."""
+        block = Block(index=1, timestamp=1000.0, transactions=[],
+                      previous_hash="0" * 64)
+        self.assertEqual(block.get_next_share_index(), 0)
+        self.assertTrue(block.claim_share(1, "m", 0, "h"))
+        self.assertFalse(block.claim_share(1, "m", 0, "h"))
+        self.assertFalse(block.claim_share(-1, "m", 0, "h"))
+        self.assertEqual(block.get_next_share_index(), 0)
+        self.assertTrue(block.claim_share(0, "m", 0, "h"))
+        self.assertEqual(block.get_next_share_index(), 2)
+        self.assertEqual(block.get_unclaimed_shares()[:2], [2, 3])
+
+        claims = block.to_dict()['share_claims']
+        self.assertEqual([c['share_index'] for c in claims], [1, 0])
+        self.assertEqual(claims[0]['miner'], "m")
+
+        restored = Block.from_dict(block.to_dict())
+        self.assertEqual(restored, block)
+        self.assertEqual(restored.share_claims, block.share_claims)
+        self.assertEqual(restored.get_next_share_index(), 2)
+        self.assertEqual(restored.shares_remaining(), block.shares_remaining())
+
+        restored.claimed_shares = [0, 1, 2]
+        self.assertEqual(restored.get_next_share_index(), 3)
+        self.assertFalse(restored.claim_share(2, "m", 0, "h"))
+
+        claimed = restored.claim_shares_bulk(
+            [(2, "m", 0, "h"), (3, "m", 0, "h"), (3, "m", 0, "h"), (4, "m", 0, "h")])
+        self.assertEqual(claimed, [3, 4])
+        self.assertEqual(restored.get_next_share_index(), 5)
+        self.assertEqual(restored.share_claims[-1]['share_index'], 4)
+
+    def test_balance_and_utxos(self):
+        """Test balances follow spent and unspent outputs."""
+        data = Blockchain().to_dict()
+        data['chain'].append(Block(
+            index=1, timestamp=1000.0, previous_hash="0" * 64,
+            transactions=[
+                {'txid': 'a', 'inputs': [], 'outputs': [
+                    {'address': 'alice', 'amount': 5.0},
+                    {'address': 'alice', 'amount': 2.0}]},
+                {'txid': 'b', 'inputs': [{'txid': 'a', 'vout': 0}], 'outputs': [
+                    {'address': 'bob', 'amount': 5.0}]}
+            ]).to_dict())
+        bc = Blockchain.from_dict(data)
+
+        self.assertEqual(bc.get_balance('alice'), 2.0)
+        self.assertEqual(bc.get_balance('bob'), 5.0)
+        self.assertEqual(bc.get_balance('nobody'), 0.0)
+        self.assertEqual(
+            bc.get_utxos('alice'),
+            [{'txid': 'a', 'vout': 1, 'amount': 2.0, 'address': 'alice'}]
+        )
+
+        # A later block spending bob's only output empties his balance
+        data['chain'].append(Block(
+            index=2, timestamp=1001.0, previous_hash="0" * 64,
+            transactions=[
+                {'txid': 'c', 'inputs': [{'txid': 'b', 'vout': 0}], 'outputs': [
+                    {'address': 'carol', 'amount': 5.0}]}
+            ]).to_dict())
+        bc = Blockchain.from_dict(data)
+
+        self.assertEqual(bc.get_balance('bob'), 0.0)
+        self.assertEqual(bc.get_utxos('bob'), [])
+        self.assertEqual(bc.get_balance('carol'), 5.0)
+        self.assertEqual(bc.get_balance('alice'), 2.0)
+
+        # Cached balances are dropped when a new block touches the address
+        bc.get_balance('carol')
+        bc._index_block(Block(
+            index=3, timestamp=1002.0, previous_hash="0" * 64,
+            transactions=[
+                {'txid': 'd', 'inputs': [], 'outputs': [
+                    {'address': 'carol', 'amount': 1.5}]}
+            ]))
+        self.assertEqual(bc.get_balance('carol'), 6.5)
+        self.assertEqual(bc.get_balance('alice'), 2.0)
+
+        # A balance summed while a block is being indexed waits for it
+        results = []
+        with bc._utxo_lock:
+            reader = threading.Thread(target=lambda: results.append(bc.get_balance('dave')))
+            reader.start()
+            reader.join(0.1)
+            self.assertTrue(reader.is_alive())
+            bc._index_block(Block(
+                index=4, timestamp=1003.0, previous_hash="0" * 64,
+                transactions=[
+                    {'txid': 'e', 'inputs': [], 'outputs': [
+                        {'address': 'dave', 'amount': 3.0}]}
+                ]))
+        reader.join()
+        self.assertEqual(results, [3.0])
+        self.assertEqual(bc.get_balance('dave'), 3.0)
+
+    def test_pending_transactions(self):
+        """Test duplicate pending transactions are rejected until mined."""
+        bc = Blockchain()
+        tx_a = {'txid': 'a', 'inputs': [], 'outputs': []}
+        tx_b = {'txid': 'b', 'inputs': [], 'outputs': []}
+        self.assertTrue(bc.add_transaction(tx_a))
+        self.assertTrue(bc.add_transaction(tx_b))
+        self.assertFalse(bc.add_transaction(dict(tx_a)))
+        self.assertFalse(bc.add_transaction({'inputs': []}))
+
+        restored = Blockchain.from_dict(bc.to_dict())
+        self.assertFalse(restored.add_transaction(dict(tx_b)))
+
+        block = Block(index=1, timestamp=1000.0, transactions=[tx_a],
+                      previous_hash=bc.last_block.hash,
+                      share_difficulty=2, block_difficulty=9)
+        block.mine()
+        self.assertTrue(bc.add_block(block))
+        self.assertEqual(bc.pending_transactions, [tx_b])
+        self.assertTrue(bc.add_transaction(dict(tx_a)))
+
+    def test_save_load_round_trip(self):
+        """Test a saved blockchain loads back identically."""
+        bc = Blockchain()
+        bc.add_transaction({'txid': 'p', 'inputs': [], 'outputs': []})
+        block = Block(index=1, timestamp=1000.0, previous_hash=bc.last_block.hash,
+                      transactions=[{'txid': 't', 'inputs': [], 'outputs': [
+                          {'address': 'alice', 'amount': 1.5}]}],
+                      share_difficulty=2, block_difficulty=9)
+        block.mine()
+        block.claim_share(0, "m", block.nonce, block.hash)
+        self.assertTrue(bc.add_block(block))
+        bc.current_open_block = bc.create_block()
+
+        # to_dict() shares the transaction list rather than copying it
+        self.assertIs(block.to_dict()['transactions'], block.transactions)
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'chain.json')
+            bc.save(path)
+            loaded = Blockchain.load(path)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(loaded.to_dict(), bc.to_dict())
+        self.assertEqual(loaded.chain[1], block)
+        self.assertEqual(loaded.get_balance('alice'), 1.5)
+
+    def test_incremental_save(self):
+        """Test journaled saves replay to the same chain."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'chain.json')
+            bc = Blockchain()
+            bc.save(path)
+
+            block = Block(index=1, timestamp=1000.0, transactions=[],
+                          previous_hash=bc.last_block.hash,
+                          share_difficulty=2, block_difficulty=9)
+            block.mine()
+            self.assertTrue(bc.add_block(block))
+            bc.add_transaction({'txid': 'p', 'inputs': [], 'outputs': []})
+            bc.save_incremental(path)
+            self.assertTrue(os.path.exists(path + '.journal'))
+
+            loaded = Blockchain.load(path)
+            self.assertEqual(loaded.to_dict(), bc.to_dict())
+
+            # A full save folds the journal back into the snapshot
+            loaded.save(path)
+            self.assertFalse(os.path.exists(path + '.journal'))
+            self.assertEqual(Blockchain.load(path).to_dict(), bc.to_dict())
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_torn_journal(self):
+        """Test that saves after a torn journal record are not lost."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'chain.json')
+            bc = Blockchain()
+            bc.save(path)
+            bc.add_transaction({'txid': 'a', 'inputs': [], 'outputs': []})
+            bc.save_incremental(path)
+            with open(path + '.journal', 'ab') as f:
+                f.write(b'{"state": {"pending_tr')  # Crash mid-append
+
+            loaded = Blockchain.load(path)
+            self.assertTrue(loaded.journal_torn)
+            self.assertEqual(loaded.to_dict(), bc.to_dict())
+
+            loaded.add_transaction({'txid': 'b', 'inputs': [], 'outputs': []})
+            loaded.save_incremental(path)
+            reloaded = Blockchain.load(path)
+            self.assertFalse(reloaded.journal_torn)
+            self.assertEqual(reloaded.to_dict(), loaded.to_dict())
+
+            # Without the forced full save, the truncated journal still
+            # takes appends cleanly
+            reloaded.add_transaction({'txid': 'c', 'inputs': [], 'outputs': []})
+            reloaded.save_incremental(path)
+            with open(path + '.journal', 'ab') as f:
+                f.write(b'{"blo')
+            Blockchain.load(path)
+            reloaded.add_transaction({'txid': 'd', 'inputs': [], 'outputs': []})
+            reloaded.save_incremental(path)
+            self.assertEqual(Blockchain.load(path).to_dict(), reloaded.to_dict())
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_save_crash(self):
+        """Test that a save cut short by a crash leaves a loadable chain."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'chain.json')
+            bc = Blockchain()
+            bc.save(path)
+
+            block = Block(index=1, timestamp=1000.0, transactions=[],
+                          previous_hash=bc.last_block.hash,
+                          share_difficulty=2, block_difficulty=9)
+            block.mine()
+            self.assertTrue(bc.add_block(block))
+            bc.save_incremental(path)
+            with open(path + '.journal', 'rb') as f:
+                journal = f.read()
+
+            # Dies after the new snapshot is in place, before the journal goes
+            bc.add_transaction({'txid': 'a', 'inputs': [], 'outputs': []})
+            bc.save(path)
+            with open(path + '.journal', 'wb') as f:
+                f.write(journal)
+            self.assertEqual(Blockchain.load(path).to_dict(), bc.to_dict())
+
+            # Dies mid-write: the previous snapshot is left untouched
+            bc.add_transaction({'txid': 'b', 'inputs': [], 'outputs': []})
+            with mock.patch.object(os, 'replace', side_effect=OSError("crash")):
+                with self.assertRaises(OSError):
+                    bc.save(path)
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['chain.json', 'chain.json.journal'])
+            loaded = Blockchain.load(path)
+            self.assertEqual(loaded.height, 1)
+            self.assertEqual([tx['txid'] for tx in loaded.pending_transactions], ['a'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_get_block_by_hash(self):
+        """Test looking blocks up by hash, including after a reload."""
+        bc = Blockchain()
+        genesis = bc.chain[0]
+        self.assertIs(bc.get_block_by_hash(genesis.hash), genesis)
+        self.assertIsNone(bc.get_block_by_hash("00" * 32))
+
+        restored = Blockchain.from_dict(bc.to_dict())
+        self.assertEqual(restored.get_block_by_hash(genesis.hash).index, 0)
+
     def test_validate_chain(self):
         """Test chain validation."""
         bc = Blockchain()
         self.assertTrue(bc.validate_chain())
 
+    def test_validate_mined_chain(self):
+        """Test validating a chain of mined blocks and detecting tampering."""
+        bc = Blockchain()
+        for _ in range(3):
+            block = Block(index=bc.height + 1, timestamp=1000.0 + bc.height,
+                          transactions=[], previous_hash=bc.last_block.hash,
+                          share_difficulty=2, block_difficulty=9)
+            block.mine()
+            self.assertTrue(bc.add_block(block))
+
+        # Blocks verified by add_block() are not hashed again
+        with mock.patch('cpucoin.blockchain.mining_digest') as digest:
+            self.assertTrue(bc.validate_chain())
+            digest.assert_not_called()
+
+        bc.chain[2].nonce += 1
+        self.assertFalse(bc.validate_chain())
+        bc.chain[2].nonce -= 1
+        self.assertTrue(bc.validate_chain())
+
+        bc.chain[3].timestamp += 1
+        self.assertFalse(bc.validate_chain())
+
+
+class TestMiner(unittest.TestCase):
+    """Test the share miners."""
+
+    def setUp(self):
+        """Swap the memory-hard hash for SHA-256 so shares come quickly."""
+        self.coin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.coin_dir)
+        patch = mock.patch('cpucoin.crypto_utils._memory_hard_raw',
+                           lambda data, salt: hashlib.sha256(salt + data).digest())
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_threaded_rounds_drain(self):
+        """Test that no worker of a finished round is still hashing."""
+        miner = MultiThreadedShareMiner(mock.Mock(public_key="pk"), Blockchain(),
+                                        coin_dir=self.coin_dir, num_threads=2)
+        self.addCleanup(miner.close)
+        for _ in range(2):
+            result = miner.mine_share(verbose=False)
+            self.assertTrue(result.success)
+            self.assertTrue(all(f.done() for f in miner._futures))
+
+    def test_mine_parallel_worker_error(self):
+        """Test that a failing mine_parallel worker stops the round and raises."""
+        def scan(header, salt, start, count, target, stride, stop_event):
+            if start == 0:
+                raise ValueError("boom")
+            # The other worker only finishes once it is told to stop
+            self.assertTrue(stop_event.wait(5))
+            return None
+
+        block = Blockchain().create_block()
+        with mock.patch('cpucoin.blockchain.scan_nonces', scan):
+            with self.assertRaises(ValueError):
+                block.mine_parallel(num_workers=2)
+
+    def test_control_server_block_find(self):
+        """Test that a block found by the control server's loop joins the chain."""
+        with mock.patch.object(coin_control_server, 'setup_logging',
+                               return_value=mock.Mock()):
+            control = CoinControlServer(ServerConfig(
+                data_dir=self.coin_dir, p2p_port=0, mining_threads=1))
+        control.wallet = mock.Mock(public_key="pk")
+        control.is_running = control.mining_active = True
+
+        def stop(*args):
+            control.mining_active = False
+
+        # A block that fails to join the chain is logged as a warning
+        control.logger.warning.side_effect = stop
+
+        # Every share is also a block find
+        with mock.patch.object(Blockchain, 'calculate_difficulty', return_value=(1, 1)), \
+                mock.patch.object(control.node, 'broadcast_block', side_effect=stop), \
+                mock.patch.object(control, 'save_state'):
+            control._mining_loop()
+
+        self.assertEqual(control.stats.to_dict()['blocks_mined'], 1)
+        self.assertEqual(control.blockchain.height, 1)
+        self.assertTrue(control.blockchain.validate_chain())
+
+    def test_control_server_repairs_torn_journal(self):
+        """Test that the control server rewrites its snapshot after a torn journal."""
+        bc = Blockchain()
+        path = os.path.join(self.coin_dir, 'blockchain.json')
+        bc.save(path)
+        bc.add_transaction({'txid': 'a', 'inputs': [], 'outputs': []})
+        bc.save_incremental(path)
+        with open(path + '.journal', 'ab') as f:
+            f.write(b'{"blo')
+
+        with mock.patch.object(coin_control_server, 'setup_logging',
+                               return_value=mock.Mock()):
+            control = CoinControlServer(ServerConfig(data_dir=self.coin_dir, p2p_port=0))
+        self.assertFalse(os.path.exists(path + '.journal'))
+        self.assertEqual(Blockchain.load(path).to_dict(), control.blockchain.to_dict())
+        self.assertEqual(control.blockchain.to_dict()['pending_transactions'][0]['txid'], 'a')
+
+    def test_lanes_return_first_hit(self):
+        """Test that a lane's hit is returned without waiting for the others."""
+        def scan(header, salt, start, count, target, stride, stop_event):
+            if start == 0:
+                return (0, "00" * 32)
+            # The slow lane only finishes once it is told to stop
+            self.assertTrue(stop_event.wait(5))
+            return None
+
+        miner = ServerShareMiner(mock.Mock(), "http://127.0.0.1:1", num_lanes=2)
+        stop = threading.Event()
+        with mock.patch.object(mining_client, 'scan_nonces', scan), \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            hit = miner._scan_lanes(executor, b"", b"", 0, 100, 1, stop)
+        self.assertEqual(hit, (0, "00" * 32))
+        self.assertTrue(stop.is_set())
+
 
 class TestCoin(unittest.TestCase):
     """Test coin file functionality."""
@@ -166,6 +636,47 @@ class TestCoin(unittest.TestCase):
         self.assertEqual(new_coin.value, 10.0)
         self.assertFalse(new_coin.is_spent)
 
+        # Saves go through temporary files that are renamed into place
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         sorted(os.path.basename(c.filepath) for c in (coin, new_coin)))
+
+    def test_coin_hash_after_transfers(self):
+        """Test that cached history encoding keeps the canonical hash."""
+        coin = Coin.mint("alice", 10.0, 1, {"nonce": 1}, self.temp_dir)
+        for owner in ("bob", "carol", "dave"):
+            coin.data.compute_hash()
+            coin = coin.transfer(owner, "sig", self.temp_dir)
+
+        fresh = Coin.load(coin.filepath).data
+        self.assertIsNone(fresh._history_json)
+        self.assertEqual(coin.data.canonical_json(), fresh.canonical_json())
+        self.assertEqual(coin.data.compute_hash(), fresh.compute_hash())
+
+        # The hand-ordered serializer matches plain sorted json.dumps
+        fields = dict(fresh.to_dict())
+        for key in ('signature', 'is_spent', 'version'):
+            del fields[key]
+        self.assertEqual(fresh.canonical_json(), json.dumps(fields, sort_keys=True))
+
+        # Split children reuse the parent's encoded proof and history
+        for child in coin.split([4.0, 6.0], "sig", self.temp_dir):
+            self.assertEqual(child.data.compute_hash(),
+                             Coin.load(child.filepath).data.compute_hash())
+
+    def test_coin_hash_after_history_reassigned(self):
+        """Test that replacing the history list drops its cached encoding."""
+        coin = Coin.mint("alice", 10.0, 1, {"nonce": 1}, self.temp_dir)
+        coin = coin.transfer("bob", "sig", self.temp_dir)
+        data = coin.data
+        data.compute_hash()
+
+        # Same length, different records: the cache must not be reused
+        data.history = [dict(record, to="mallory") for record in data.history]
+        expected = Coin.load(coin.filepath).data
+        expected.history = [dict(record) for record in data.history]
+        self.assertEqual(data.canonical_json(), expected.canonical_json())
+        self.assertEqual(data.compute_hash(), expected.compute_hash())
+
     def test_coin_split(self):
         """Test splitting a coin."""
         coin = Coin.mint(
@@ -183,6 +694,11 @@ class TestCoin(unittest.TestCase):
         self.assertEqual(new_coins[0].value, 60.0)
         self.assertEqual(new_coins[1].value, 40.0)
 
+        # Both halves and the spent original are on disk
+        self.assertTrue(Coin.load(coin.filepath).is_spent)
+        for new_coin in new_coins:
+            self.assertEqual(Coin.load(new_coin.filepath).value, new_coin.value)
+
     def test_coin_store(self):
         """Test coin store functionality."""
         store = CoinStore(self.temp_dir)
@@ -200,6 +716,109 @@ class TestCoin(unittest.TestCase):
         alice_balance = store.get_balance("alice")
         self.assertEqual(alice_balance, 30.0)
 
+        # Batch hashing matches hashing coins one at a time
+        hashes = store.compute_all_hashes()
+        self.assertEqual(len(hashes), 3)
+        for coin in (coin1, coin2, coin3):
+            self.assertEqual(hashes[coin.coin_id], coin.data.compute_hash())
+
+        # Stats come from the same streaming scan
+        coin1.transfer("carol", "sig", self.temp_dir)
+        stats = store.stats()
+        self.assertEqual(stats['total_files'], 4)
+        self.assertEqual(stats['spent_coins'], 1)
+        self.assertEqual(stats['total_unspent_value'], 45.0)
+        self.assertEqual(len(list(store.iter_coins(include_spent=True))), 4)
+
+
+    def test_coin_store_index(self):
+        """Test that the coin index follows changes made to the files."""
+        store = CoinStore(self.temp_dir)
+        coin1 = Coin.mint("alice", 10.0, 1, {"nonce": 1}, self.temp_dir)
+        coin2 = Coin.mint("alice", 20.0, 2, {"nonce": 2}, self.temp_dir)
+        self.assertEqual(store.get_balance("alice"), 30.0)
+
+        # Spend one, delete one by hand, drop in a corrupt file
+        coin1.transfer("bob", "sig", self.temp_dir)
+        os.remove(coin2.filepath)
+        with open(os.path.join(self.temp_dir, "broken" + Coin.EXTENSION), "w") as f:
+            f.write("{not json")
+
+        self.assertEqual(store.get_balance("alice"), 0.0)
+        self.assertEqual(store.get_balance("bob"), 10.0)
+        self.assertIsNone(store.find_coins_for_amount("alice", 1.0))
+        self.assertEqual([c.value for c in store.find_coins_for_amount("bob", 5.0)], [10.0])
+        self.assertEqual(store.stats()['total_files'], 2)
+
+        # Without the index the same answers come from the files
+        with mock.patch.object(store, '_index', None):
+            self.assertEqual(store.get_balance("bob"), 10.0)
+            self.assertEqual(store.stats()['spent_coins'], 1)
+
+    def test_coin_store_parallel_load(self):
+        """Test that large batches load through the thread pool intact."""
+        for i in range(12):
+            Coin.mint("alice" if i % 2 else "bob", float(i + 1), i, {"nonce": i}, self.temp_dir)
+        store = CoinStore(self.temp_dir)
+
+        self.assertEqual(len(store.list_coins()), 12)
+        self.assertEqual(sum(c.value for c in store.list_coins("alice")), 42.0)
+        with mock.patch.object(store, '_index', None):
+            self.assertEqual(len(store.list_coins("bob")), 6)
+            self.assertEqual(store.find_coins_for_amount("bob", 20.0)[0].value, 11.0)
+
+        # Limits are applied with and without the index
+        self.assertEqual(len(store.list_coins("alice", limit=4)), 4)
+        self.assertEqual(len(list(store.iter_coins(limit=5))), 5)
+        with mock.patch.object(store, '_index', None):
+            self.assertEqual(len(store.list_coins("alice", limit=4)), 4)
+            self.assertEqual(len(list(store.iter_coins("bob", limit=10))), 6)
+
+    def test_coin_binary(self):
+        """Test the binary coin encoding round trip."""
+        coin = Coin.mint("alice", 12.5, 7, {"nonce": 3, "hash": "ab"}, self.temp_dir,
+                         share_index=4, block_hash="ff" * 32, is_bonus_share=True)
+        coin = coin.transfer("bob", "sig", self.temp_dir)
+
+        encoded = coin_binary.encode(coin.data)
+        self.assertTrue(coin_binary.is_binary(encoded))
+        decoded = coin_binary.decode(memoryview(encoded))
+        self.assertEqual(decoded, coin.data)
+        self.assertEqual(decoded.compute_hash(), coin.data.compute_hash())
+
+        # An integer value would come back as a float (changing the hash)
+        coin.data.value = 12
+        with self.assertRaises(ValueError):
+            coin_binary.encode(coin.data)
+
+    def test_coin_pack(self):
+        """Test exporting coins to a pack and importing them elsewhere."""
+        store = CoinStore(self.temp_dir)
+        coins = [Coin.mint("alice", float(i), i, {"nonce": i}, self.temp_dir)
+                 for i in range(1, 4)]
+        pack_path = os.path.join(self.temp_dir, "alice" + CoinPack.EXTENSION)
+        self.assertEqual(store.export_pack(pack_path, owner_pubkey="alice"), 3)
+
+        pack = CoinPack(pack_path)
+        self.assertEqual(len(pack), 3)
+        self.assertEqual(pack.load(coins[1].coin_id).value, 2.0)
+        self.assertIsNone(pack.load("COIN-missing"))
+
+        extra = Coin.mint("bob", 7.0, 4, {"nonce": 4}, self.temp_dir)
+        pack.append([extra])
+        self.assertEqual([c.coin_id for c in pack],
+                         [c.coin_id for c in store.iter_coins("alice")] + [extra.coin_id])
+
+        # Payloads are parsed from the mapping with or without orjson
+        with mock.patch.object(json_utils, 'ORJSON_AVAILABLE', False):
+            self.assertEqual(pack.load(extra.coin_id).owner, "bob")
+        pack.close()
+
+        other_dir = os.path.join(self.temp_dir, "other")
+        imported = CoinStore(other_dir).import_pack(pack_path)
+        self.assertEqual(len(imported), 4)
+        self.assertEqual(CoinStore(other_dir).get_balance("alice"), 6.0)
+
 
 class TestWallet(unittest.TestCase):
     """Test wallet functionality."""
@@ -264,6 +883,9 @@ class TestTransaction(unittest.TestCase):
         self.assertEqual(len(tx.inputs), 0)
         self.assertEqual(len(tx.outputs), 1)
         self.assertEqual(tx.outputs[0]['amount'], 50.0)
+        self.assertEqual(tx.to_api_dict(), {
+            'txid': tx.txid, 'type': 'coinbase', 'fee': 0.0, 'timestamp': tx.timestamp
+        })
 
     def test_transaction_id(self):
         """Test transaction ID generation."""
@@ -276,5 +898,263 @@ class TestTransaction(unittest.TestCase):
         self.assertEqual(len(tx.txid), 64)
 
 
+class TestServerStats(unittest.TestCase):
+    """Test control server statistics."""
+
+    def test_concurrent_incr(self):
+        """Test that counters updated from many threads lose no counts."""
+        stats = ServerStats()
+
+        def bump():
+            for _ in range(1000):
+                stats.incr('transactions_received')
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats.update(hash_rate=2.5)
+        snapshot = stats.to_dict()
+        self.assertEqual(snapshot['transactions_received'], 4000)
+        self.assertEqual(snapshot['hash_rate'], 2.5)
+
+        # The /stats body matches the dict form key for key
+        encoded = json.loads(stats.to_json())
+        self.assertEqual(list(encoded), list(snapshot))
+        self.assertEqual(encoded['transactions_received'], 4000)
+
+    def test_response_cache(self):
+        """Test TTL expiry and invalidation of cached API responses."""
+        cache = ResponseCache()
+        cache.put('/status', b'{}', cache.epoch)
+        self.assertEqual(cache.get('/status', 1.0), b'{}')
+        self.assertIsNone(cache.get('/status', 0.0))
+
+        # A body built before an invalidation is not stored
+        epoch = cache.epoch
+        cache.invalidate()
+        self.assertIsNone(cache.get('/status', 1.0))
+        cache.put('/status', b'{"old": true}', epoch)
+        self.assertIsNone(cache.get('/status', 1.0))
+
+    def test_response_cache_ignores_query(self):
+        """Test that query strings share one cache entry per path."""
+        control = mock.Mock(response_cache=ResponseCache())
+        patches = [
+            mock.patch.object(APIHandler, 'server_instance', control),
+            mock.patch.object(APIHandler, '_handle_status',
+                              lambda handler: handler._send_json({'ok': True})),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        httpd = PooledHTTPServer(('127.0.0.1', 0), APIHandler, max_workers=1)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', httpd.server_address[1], timeout=5)
+            for i in range(3):
+                conn.request('GET', f'/status?x={i}')
+                self.assertEqual(json.loads(conn.getresponse().read()), {'ok': True})
+            conn.close()
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+        self.assertEqual(list(control.response_cache._entries), ['/status'])
+
+    def test_pooled_http_server(self):
+        """Test that an idle connection does not block other clients."""
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        httpd = PooledHTTPServer(('127.0.0.1', 0), Handler, max_workers=2)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        port = httpd.server_address[1]
+        idle = socket.create_connection(('127.0.0.1', port))
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/')
+            self.assertEqual(conn.getresponse().read(), b'ok')
+            conn.close()
+        finally:
+            idle.close()
+            httpd.shutdown()
+            httpd.server_close()
+
+    def test_pooled_http_server_hands_over(self):
+        """Test that a keep-alive client is closed while others wait for a worker."""
+        patch = mock.patch.object(APIHandler, 'server_instance', mock.Mock())
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        httpd = PooledHTTPServer(('127.0.0.1', 0), APIHandler, max_workers=1)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        port = httpd.server_address[1]
+        first = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        second = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            first.request('GET', '/missing')
+            response = first.getresponse()
+            response.read()
+            self.assertIsNone(response.getheader('Connection'))
+
+            # The only worker is held by the first connection
+            second.connect()
+            for _ in range(500):
+                if httpd.has_queued():
+                    break
+                threading.Event().wait(0.01)
+            self.assertTrue(httpd.has_queued())
+
+            first.request('GET', '/missing')
+            response = first.getresponse()
+            response.read()
+            self.assertEqual(response.getheader('Connection'), 'close')
+
+            second.request('GET', '/missing')
+            self.assertEqual(second.getresponse().status, 404)
+        finally:
+            first.close()
+            second.close()
+            httpd.shutdown()
+            httpd.server_close()
+
+    def test_streamed_blockchain(self):
+        """Test that /blockchain is sent chunked and decodes as one document."""
+        control = mock.Mock(blockchain=Blockchain(), response_cache=ResponseCache())
+        patches = [
+            mock.patch.object(APIHandler, 'server_instance', control),
+            mock.patch.object(APIHandler, 'STREAM_CHUNK_SIZE', 1),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        httpd = PooledHTTPServer(('127.0.0.1', 0), APIHandler, max_workers=1)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', httpd.server_address[1], timeout=5)
+            conn.request('GET', '/blockchain?limit=5')
+            response = conn.getresponse()
+            self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+            body = json.loads(response.read())
+
+            # Same keep-alive connection; the 404 body is pre-encoded
+            conn.request('GET', '/no/such/path')
+            response = conn.getresponse()
+            self.assertEqual(response.status, 404)
+            self.assertEqual(json.loads(response.read()), {'error': 'Not found'})
+            conn.close()
+
+            # HTTP/1.0 clients get a plain body with a Content-Length
+            with socket.create_connection(httpd.server_address, timeout=5) as sock:
+                sock.sendall(b'GET /blockchain?limit=5 HTTP/1.0\r\n\r\n')
+                raw = b''
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        break
+                    raw += data
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+        head, _, plain = raw.partition(b'\r\n\r\n')
+        self.assertNotIn(b'Transfer-Encoding', head)
+        self.assertIn(b'Content-Length: %d' % len(plain), head)
+        self.assertEqual(json.loads(plain), body)
+        self.assertEqual(body['count'], 1)
+        self.assertEqual(body['total'], 1)
+        self.assertEqual(body['blocks'][0]['hash'], control.blockchain.chain[0].hash)
+
+
+class TestMiningServer(unittest.TestCase):
+    """Test the mining server API through the client."""
+
+    def setUp(self):
+        """Start a server on a free port with a fresh blockchain."""
+        self.data_dir = tempfile.mkdtemp()
+        patches = [
+            mock.patch.object(server, '_server_data_dir', self.data_dir),
+            mock.patch.object(server, '_blockchain', None),
+            mock.patch.object(server.MiningServerHandler, 'log_message'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), server.MiningServerHandler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.client = MiningClient(f"http://127.0.0.1:{self.httpd.server_address[1]}")
+
+    def tearDown(self):
+        """Stop the server."""
+        self.client.close()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.data_dir)
+
+    def test_bootstrap(self):
+        """Test that /state matches the individual endpoints."""
+        bootstrap = self.client.get_bootstrap()
+        self.assertIsNotNone(bootstrap)
+
+        self.assertEqual(bootstrap['initial_job'], self.client.get_current_block())
+        self.assertEqual(bootstrap['blockchain_info'], self.client.get_blockchain_info())
+        self.assertEqual(bootstrap['server_info']['blockchain_height'],
+                         self.client.get_server_info()['blockchain_height'])
+
+    def test_bootstrap_without_state(self):
+        """Test that servers without /state are bootstrapped endpoint by endpoint."""
+        def do_get(handler):
+            if urlparse(handler.path).path == '/state':
+                handler._send_json({'error': 'Not found'}, 404)
+            else:
+                original(handler)
+
+        original = server.MiningServerHandler.do_GET
+        with mock.patch.object(server.MiningServerHandler, 'do_GET', do_get):
+            bootstrap = self.client.get_bootstrap()
+        self.assertIsNotNone(bootstrap)
+        self.assertIsNone(bootstrap['blockchain_info'])
+        self.assertEqual(bootstrap['initial_job'], self.client.get_current_block())
+        self.assertEqual(bootstrap['server_info']['name'],
+                         self.client.get_server_info()['name'])
+
+    def test_keep_alive(self):
+        """Test that the client reuses one connection across requests."""
+        self.assertIsNotNone(self.client.get_server_info())
+        sock = self.client._conn.sock
+        self.assertIsNotNone(sock)
+        self.assertIsNotNone(self.client.get_blockchain_info())
+        self.assertIs(self.client._conn.sock, sock)
+
+        # A dropped connection is reopened transparently
+        sock.shutdown(socket.SHUT_RDWR)
+        self.assertIsNotNone(self.client.get_server_info())
+
+        # ...but a POST on a dropped connection is not resent
+        self.client._conn.sock.shutdown(socket.SHUT_RDWR)
+        with mock.patch.object(server.MiningServerHandler, 'do_POST') as do_post:
+            self.assertIsNone(self.client._request('POST', '/share/submit', {}))
+        do_post.assert_not_called()
+        self.assertTrue(self.client.last_error.startswith("Connection failed"))
+
+        # Errors leave the connection usable
+        self.assertIsNone(self.client._request('GET', '/missing'))
+        self.assertEqual(self.client.last_error, "HTTP Error 404: Not Found")
+        self.assertIsNotNone(self.client.get_server_info())
+
+
 if __name__ == '__main__':
     unittest.main()